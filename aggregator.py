@@ -0,0 +1,190 @@
+"""
+Tick-to-bar aggregation for Real-Time Stock Market Dashboard
+
+A TickAggregator rolls every tick into the partial ("live") bar of each
+configured timeframe at once. Live bars are plain Python lists so a tick
+costs a handful of scalar updates per timeframe; when a tick opens a new
+bucket the finished bar moves into a fixed-size NumPy ring buffer for its
+symbol and timeframe, which bounds memory per symbol, and is queued for
+flushing to an on-disk HistoryStore (one per timeframe).
+
+Bars are indexed by naive exchange-local time like every other frame in the
+app; buckets are aligned to the local clock.
+"""
+
+import threading
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from config import AGGREGATION_CONFIG
+from history_store import HistoryStore
+from parsers import MARKET_TIMEZONE, OHLCV_COLUMNS
+
+# The exchange timezone has no DST, so local time is a fixed offset from UTC
+MARKET_OFFSET = int(pd.Timestamp.now(tz=MARKET_TIMEZONE).utcoffset().total_seconds())
+
+# Timeframe whose live bar is the current session's daily bar
+SESSION_TIMEFRAME = "1D"
+
+_NS = 1_000_000_000
+
+
+class BarRing:
+    """Fixed-capacity ring buffer of completed OHLCV bars"""
+
+    __slots__ = ("capacity", "count", "timestamps", "prices", "volumes")
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.count = 0
+        self.timestamps = np.empty(capacity, dtype=np.int64)  # bucket start, local epoch seconds
+        self.prices = np.empty((capacity, 4), dtype=np.float64)  # open, high, low, close
+        self.volumes = np.empty(capacity, dtype=np.int64)
+
+    def push(self, bucket, open_, high, low, close, volume):
+        row = self.count % self.capacity
+        self.timestamps[row] = bucket
+        self.prices[row] = (open_, high, low, close)
+        self.volumes[row] = volume
+        self.count += 1
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    def arrays(self):
+        """(timestamps, prices, volumes) of the stored bars, oldest first"""
+        if self.count <= self.capacity:
+            n = self.count
+            return self.timestamps[:n].copy(), self.prices[:n].copy(), self.volumes[:n].copy()
+        split = self.count % self.capacity
+        order = np.r_[split:self.capacity, 0:split]
+        return self.timestamps[order], self.prices[order], self.volumes[order]
+
+
+def _frame(timestamps, prices, volumes):
+    index = pd.DatetimeIndex((timestamps * _NS).view("datetime64[ns]"))
+    frame = pd.DataFrame(prices, columns=OHLCV_COLUMNS[:4], index=index)
+    frame['Volume'] = volumes
+    return frame
+
+
+class TickAggregator:
+    """Multi-timeframe OHLCV bars for every symbol, built from ticks"""
+
+    def __init__(self, timeframes=None, ring_size=None, history_root=None, flush_timeframes=None):
+        self.timeframes = dict(timeframes or AGGREGATION_CONFIG["timeframes"])
+        self.ring_size = ring_size or AGGREGATION_CONFIG["ring_size"]
+        self._names = list(self.timeframes)
+        self._seconds = [self.timeframes[name] for name in self._names]
+        self._lock = threading.Lock()
+        # symbol -> per-timeframe live bar [bucket, open, high, low, close, volume]
+        self._live = {}
+        # symbol -> per-timeframe BarRing
+        self._rings = {}
+        # (symbol, timeframe) -> completed bars not yet flushed
+        self._completed = {}
+        self._changed = set()
+        self.ticks = 0
+
+        self._stores = {}
+        if history_root is not None:
+            flush = flush_timeframes if flush_timeframes is not None else AGGREGATION_CONFIG["flush_timeframes"]
+            self._stores = {name: HistoryStore(Path(history_root) / name) for name in flush}
+
+    @classmethod
+    def from_config(cls):
+        return cls(history_root=AGGREGATION_CONFIG["history_path"])
+
+    def add(self, symbol, price, volume, timestamp):
+        """Roll one trade into every timeframe's live bar"""
+        local = int(timestamp) + MARKET_OFFSET
+        with self._lock:
+            live = self._live.get(symbol)
+            if live is None:
+                live = self._live[symbol] = [None] * len(self._seconds)
+                self._rings[symbol] = [BarRing(self.ring_size) for _ in self._seconds]
+
+            for i, seconds in enumerate(self._seconds):
+                bucket = local - local % seconds
+                bar = live[i]
+                if bar is None or bucket > bar[0]:
+                    if bar is not None:
+                        self._complete(symbol, i, bar)
+                    live[i] = [bucket, price, price, price, price, volume]
+                elif bucket == bar[0]:
+                    if price > bar[2]:
+                        bar[2] = price
+                    elif price < bar[3]:
+                        bar[3] = price
+                    bar[4] = price
+                    bar[5] += volume
+                # Ticks for an already completed bucket are dropped
+
+            self._changed.add(symbol)
+            self.ticks += 1
+
+    def _complete(self, symbol, i, bar):
+        self._rings[symbol][i].push(*bar)
+        name = self._names[i]
+        if name in self._stores:
+            self._completed.setdefault((symbol, name), []).append(bar)
+
+    def live_bar(self, symbol, timeframe):
+        """The partial bar of a timeframe as a one-row frame, or None"""
+        with self._lock:
+            live = self._live.get(symbol)
+            bar = live[self._names.index(timeframe)] if live is not None else None
+            if bar is None:
+                return None
+            bar = list(bar)
+        return _frame(np.array([bar[0]]), np.array([bar[1:5]]), np.array([bar[5]]))
+
+    def frame(self, symbol, timeframe, include_live=True):
+        """Completed bars of a timeframe (plus the live bar) as an OHLCV frame, or None"""
+        i = self._names.index(timeframe)
+        with self._lock:
+            rings = self._rings.get(symbol)
+            if rings is None:
+                return None
+            timestamps, prices, volumes = rings[i].arrays()
+            bar = list(self._live[symbol][i]) if include_live and self._live[symbol][i] is not None else None
+
+        if bar is not None:
+            timestamps = np.r_[timestamps, bar[0]]
+            prices = np.vstack([prices, bar[1:5]])
+            volumes = np.r_[volumes, bar[5]]
+        if len(timestamps) == 0:
+            return None
+        return _frame(timestamps, prices, volumes)
+
+    def drain_changed(self, timeframe=SESSION_TIMEFRAME):
+        """Live bars of one timeframe for every symbol that traded since the last drain"""
+        with self._lock:
+            changed, self._changed = self._changed, set()
+        bars = {symbol: self.live_bar(symbol, timeframe) for symbol in changed}
+        return {symbol: bar for symbol, bar in bars.items() if bar is not None}
+
+    def flush(self):
+        """Append completed bars to their history stores; returns the number of bars written
+
+        Bars leave the queue only once their store append succeeded, so a
+        failing write keeps them (and every later group) for the next flush.
+        """
+        with self._lock:
+            pending = {key: list(bars) for key, bars in self._completed.items()}
+
+        written = 0
+        for (symbol, timeframe), bars in pending.items():
+            rows = np.array(bars, dtype=np.float64)
+            written += self._stores[timeframe].append(
+                symbol, _frame(rows[:, 0].astype(np.int64), rows[:, 1:5], rows[:, 5].astype(np.int64))
+            )
+            with self._lock:
+                # Bars completed during the write stay queued behind the written ones
+                queued = self._completed[(symbol, timeframe)]
+                del queued[:len(bars)]
+                if not queued:
+                    del self._completed[(symbol, timeframe)]
+        return written
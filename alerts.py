@@ -0,0 +1,255 @@
+"""
+Alert rule engine for Real-Time Stock Market Dashboard
+
+Rules such as "RELIANCE price crosses above 2600", "TCS RSI below 30",
+Bollinger Band breakouts and volume spikes are compiled into flat NumPy
+arrays (symbol row, metric column, direction, threshold). Every update
+writes the newest metrics of the updated symbols into a symbols x metrics
+table and checks all rules with one gather and one comparison, so tens of
+thousands of rules cost well under a millisecond per update.
+
+A rule fires when its condition becomes true and re-arms once it is false
+again; a metric that cannot be computed (too few bars) leaves the rule's
+state unchanged. Fired alerts go to an in-app queue that sessions read, and
+to pluggable sinks (a JSON-lines file, a webhook) on a background thread so
+ingestion never waits on delivery.
+"""
+
+import csv
+import json
+import logging
+import queue
+import threading
+from collections import deque, namedtuple
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import numpy as np
+
+import http_client
+from config import ALERTS_CONFIG, API_CONFIG, INDICATORS_CONFIG
+from screener import rolling_mean, rolling_rsi, rolling_std
+
+logger = logging.getLogger(__name__)
+
+# Columns of the per-symbol metrics table
+METRICS = ["price", "rsi", "bb_upper_gap", "bb_lower_gap", "volume_ratio"]
+
+# condition -> (metric, direction, label, description); direction 1 fires above the value, -1 below
+CONDITIONS = {
+    "price_above": ("price", 1, "Price crosses above", "price crosses above {value:g}"),
+    "price_below": ("price", -1, "Price crosses below", "price crosses below {value:g}"),
+    "rsi_above": ("rsi", 1, "RSI rises above", "RSI rises above {value:g}"),
+    "rsi_below": ("rsi", -1, "RSI falls below", "RSI falls below {value:g}"),
+    "bb_upper_break": ("bb_upper_gap", 1, "Upper Bollinger Band break", "close breaks above the upper Bollinger Band"),
+    "bb_lower_break": ("bb_lower_gap", -1, "Lower Bollinger Band break", "close breaks below the lower Bollinger Band"),
+    "volume_spike": ("volume_ratio", 1, "Volume spike (x average)", "volume exceeds {value:g}x its average"),
+}
+
+Rule = namedtuple("Rule", ["symbol", "condition", "value"])
+Alert = namedtuple("Alert", ["sequence", "time", "symbol", "condition", "value", "observed", "message"])
+
+
+def describe(rule):
+    """Human-readable text of a rule"""
+    return f"{rule.symbol} {CONDITIONS[rule.condition][3].format(value=rule.value)}"
+
+
+def read_rules(path):
+    """Read rules from a symbol,condition,value CSV"""
+    rules = []
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        for line, row in enumerate(csv.DictReader(f), start=2):
+            try:
+                condition = row["condition"].strip()
+                if condition not in CONDITIONS:
+                    raise ValueError(f"unknown condition {condition!r}")
+                rules.append(Rule(row["symbol"].strip().upper(), condition, float(row["value"] or 0)))
+            except (AttributeError, KeyError, TypeError, ValueError) as e:
+                raise ValueError(f"{path}:{line}: {e}") from e
+    return rules
+
+
+def write_rules(path, rules):
+    """Write rules to a symbol,condition,value CSV"""
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(Rule._fields)
+        writer.writerows(rules)
+
+
+def frame_metrics(frames, config=None, indicators=None, latest=None):
+    """len(frames) x METRICS array of rule inputs, computed from the newest bars of each OHLCV frame
+
+    latest optionally holds each frame's IndicatorEngine values (or None);
+    RSI and Bollinger Bands are only computed for frames without them.
+    """
+    config = config or ALERTS_CONFIG
+    indicators = indicators or INDICATORS_CONFIG
+    bars = config["bars"]
+
+    closes = np.full((len(frames), bars), np.nan)
+    volumes = np.full((len(frames), bars), np.nan)
+    for row, df in enumerate(frames):
+        tail = df.iloc[-bars:]
+        closes[row, bars - len(tail):] = tail['Close'].to_numpy(dtype=np.float64)
+        volumes[row, bars - len(tail):] = tail['Volume'].to_numpy(dtype=np.float64)
+
+    close = closes[:, -1]
+    latest = latest or [None] * len(frames)
+    rsi, upper, lower = (np.array([np.nan if values is None else values[column] for values in latest])
+                         for column in ("RSI", "BB_upper", "BB_lower"))
+    missing = np.array([values is None for values in latest], dtype=bool)
+    if missing.any():
+        rsi[missing] = rolling_rsi(closes[missing], indicators["rsi_period"], indicators["rsi_smoothing"])[:, -1]
+        middle = rolling_mean(closes[missing], indicators["bb_period"])[:, -1]
+        width = rolling_std(closes[missing], indicators["bb_period"])[:, -1] * indicators["bb_std"]
+        upper[missing], lower[missing] = middle + width, middle - width
+    # The newest bar's volume against the average of the bars before it
+    average_volume = rolling_mean(volumes[:, :-1], config["volume_window"])[:, -1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        volume_ratio = np.where(average_volume > 0, volumes[:, -1] / average_volume, np.nan)
+    return np.column_stack([close, rsi, close - upper, close - lower, volume_ratio])
+
+
+class FileSink:
+    """Appends alerts to a JSON-lines file"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+
+    def send(self, alert):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(dict(alert._asdict(), time=alert.time.isoformat())) + "\n")
+
+
+class WebhookSink:
+    """POSTs alerts as JSON to a webhook URL"""
+
+    def __init__(self, url):
+        self.url = url
+
+    def send(self, alert):
+        session = http_client.get_session(urlsplit(self.url).netloc)
+        response = session.post(self.url, json=dict(alert._asdict(), time=alert.time.isoformat()),
+                                timeout=API_CONFIG["timeout"])
+        response.raise_for_status()
+
+
+class AlertEngine:
+    """Rules compiled into arrays and checked against a symbols x metrics table on every update"""
+
+    def __init__(self, rules=(), sinks=(), queue_size=None):
+        self._lock = threading.Lock()
+        self.rules = list(rules)
+        for rule in self.rules:
+            if rule.condition not in CONDITIONS:
+                raise ValueError(f"unknown condition {rule.condition!r}")
+        self._rows = {}
+        self._metrics = np.empty((0, len(METRICS)))
+        self._compile(np.zeros(len(self.rules), dtype=bool))
+        self.sequence = 0
+        self._recent = deque(maxlen=queue_size or ALERTS_CONFIG["queue_size"])
+
+        self.sinks = list(sinks)
+        self._outbox = queue.Queue()
+        if self.sinks:
+            threading.Thread(target=self._dispatch, name="alert-dispatch", daemon=True).start()
+
+    @classmethod
+    def from_config(cls):
+        path = Path(ALERTS_CONFIG["rules_path"])
+        sinks = []
+        if ALERTS_CONFIG["log_path"]:
+            sinks.append(FileSink(ALERTS_CONFIG["log_path"]))
+        if ALERTS_CONFIG["webhook_url"]:
+            sinks.append(WebhookSink(ALERTS_CONFIG["webhook_url"]))
+        return cls(read_rules(path) if path.exists() else (), sinks)
+
+    def _row(self, symbol):
+        # Metrics row of a symbol, added on first use
+        row = self._rows.get(symbol)
+        if row is None:
+            row = self._rows[symbol] = len(self._rows)
+            self._metrics = np.vstack([self._metrics, np.full((1, len(METRICS)), np.nan)])
+        return row
+
+    def _compile(self, active):
+        self._rule_rows = np.array([self._row(rule.symbol) for rule in self.rules], dtype=np.intp)
+        self._rule_metrics = np.array([METRICS.index(CONDITIONS[rule.condition][0]) for rule in self.rules],
+                                      dtype=np.intp)
+        self._directions = np.array([CONDITIONS[rule.condition][1] for rule in self.rules], dtype=np.int8)
+        self._thresholds = np.array([rule.value for rule in self.rules], dtype=np.float64)
+        self._active = np.array(active, dtype=bool)
+
+    def add_rule(self, rule):
+        """Add a rule; it fires on the next update if its condition already holds"""
+        if rule.condition not in CONDITIONS:
+            raise ValueError(f"unknown condition {rule.condition!r}")
+        with self._lock:
+            self.rules.append(rule)
+            self._compile(np.append(self._active, False))
+
+    def remove_rule(self, position):
+        """Remove the rule at a position of self.rules"""
+        with self._lock:
+            del self.rules[position]
+            self._compile(np.delete(self._active, position))
+
+    def update(self, frames, latest=None):
+        """Refresh metrics from {symbol: OHLCV frame}, check every rule and return the alerts fired
+
+        latest is an optional {symbol: IndicatorEngine values} for the same frames.
+        """
+        frames = {symbol: df for symbol, df in frames.items() if df is not None and not df.empty}
+        if not frames:
+            return []
+        latest = latest or {}
+        metrics = frame_metrics(list(frames.values()), latest=[latest.get(symbol) for symbol in frames])
+        with self._lock:
+            rows = [self._rows.get(symbol) for symbol in frames]
+            watched = [i for i, row in enumerate(rows) if row is not None]
+            if not watched:
+                return []
+            self._metrics[[rows[i] for i in watched]] = metrics[watched]
+            return self._evaluate()
+
+    def _evaluate(self):
+        values = self._metrics[self._rule_rows, self._rule_metrics]
+        with np.errstate(invalid="ignore"):
+            holds = np.where(self._directions > 0, values > self._thresholds, values < self._thresholds)
+        # Unknown metrics keep the previous state instead of re-arming the rule
+        holds = np.where(np.isnan(values), self._active, holds)
+        fired = np.flatnonzero(holds & ~self._active)
+        self._active = holds
+
+        now = datetime.now()
+        alerts = []
+        for position in fired:
+            rule = self.rules[position]
+            self.sequence += 1
+            observed = float(values[position])
+            alert = Alert(self.sequence, now, rule.symbol, rule.condition, rule.value, observed,
+                          f"{describe(rule)} ({METRICS[self._rule_metrics[position]]} {observed:,.2f})")
+            alerts.append(alert)
+            self._recent.append(alert)
+            if self.sinks:
+                self._outbox.put(alert)
+        return alerts
+
+    def recent(self, after=0):
+        """Queued alerts with a sequence number above after, oldest first"""
+        with self._lock:
+            return [alert for alert in self._recent if alert.sequence > after]
+
+    def _dispatch(self):
+        while True:
+            alert = self._outbox.get()
+            for sink in self.sinks:
+                try:
+                    sink.send(alert)
+                except Exception as e:
+                    logger.warning("Alert sink %s failed: %s", type(sink).__name__, e)
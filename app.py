@@ -2,13 +2,36 @@ import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
-from plotly.subplots import make_subplots
 import requests
-import time
 from datetime import datetime, timedelta
 import json
-from bs4 import BeautifulSoup
 import re
+import time
+from pathlib import Path
+
+from aggregator import TickAggregator
+from alerts import CONDITIONS, AlertEngine, Rule, describe, write_rules
+from backtest import STRATEGIES, create_pool, equity_curve, load_closes, parse_params, run_backtests
+from breadth import MarketBreadth
+from charts import StockChart, metric_cards, performance_chart
+from config import (AGGREGATION_CONFIG, ALERTS_CONFIG, AUTO_REFRESH_CONFIG, BACKTEST_CONFIG, BREADTH_CONFIG,
+                    HISTORY_CONFIG, METRICS_CONFIG, POPULAR_STOCKS, PORTFOLIO_CONFIG, SCREENER_CONFIG, STREAMING_CONFIG, SYMBOLS_CONFIG)
+from data_access import RenderDataContext
+from data_cache import MarketDataCache, normalize_period
+from history_store import HistoryStore
+from indicators import IndicatorEngine
+from ingestion import IngestionWorker, MarketDataStore
+from market_data import create_sample_data, get_nse_data, get_bse_data
+from metrics import metrics
+from portfolio import Portfolio, normalized_performance, watchlist_summary
+from screener import HistorySource, SampleSource, Screener
+from series_store import CompactSeries
+from source_health import source_health
+from streaming import StreamingFeed
+from symbols import default_registry
+
+# Whole-run timing for the performance panel and metrics endpoint
+run_started = time.perf_counter()
 
 # Page configuration
 st.set_page_config(
@@ -210,36 +233,32 @@ st.markdown('<h1 class="main-header">📈 Real-Time Stock Market Dashboard</h1>'
 st.sidebar.header("📊 Stock Selection")
 st.sidebar.markdown("---")
 
-# Popular Indian stocks list
-popular_stocks = {
-    "RELIANCE": "Reliance Industries Ltd. (NSE)",
-    "TCS": "Tata Consultancy Services Ltd. (NSE)",
-    "INFY": "Infosys Ltd. (NSE)",
-    "HDFCBANK": "HDFC Bank Ltd. (NSE)",
-    "ICICIBANK": "ICICI Bank Ltd. (NSE)",
-    "SBIN": "State Bank of India (NSE)",
-    "BHARTIARTL": "Bharti Airtel Ltd. (NSE)",
-    "ITC": "ITC Ltd. (NSE)",
-    "KOTAKBANK": "Kotak Mahindra Bank Ltd. (NSE)",
-    "AXISBANK": "Axis Bank Ltd. (NSE)",
-    "ASIANPAINT": "Asian Paints Ltd. (NSE)",
-    "MARUTI": "Maruti Suzuki India Ltd. (NSE)",
-    "WAAENERGIES": "Waaree Energies Ltd. (NSE)",
-    "CRESTCHM": "Crestchem Ltd. (NSE)",
-    "TATAMOTORS": "Tata Motors Ltd. (NSE)",
-    "HINDUNILVR": "Hindustan Unilever Ltd. (NSE)",
-    "SUNPHARMA": "Sun Pharmaceutical Industries Ltd. (NSE)",
-    "ULTRACEMCO": "UltraTech Cement Ltd. (NSE)",
-    "TITAN": "Titan Company Ltd. (NSE)"
-}
+# Shared symbol registry, loaded once per server process
+@st.cache_resource
+def get_symbol_registry():
+    """Load the instrument master and build its search indexes (shared with the fetchers)"""
+    return default_registry()
+
+symbol_registry = get_symbol_registry()
 
-# Stock selection
+# Symbol search over the whole instrument master
+symbol_query = st.sidebar.text_input("🔎 Search stocks by ticker or company name:")
+if symbol_query:
+    matching_symbols = [instrument.symbol for instrument in symbol_registry.search(symbol_query)]
+else:
+    matching_symbols = POPULAR_STOCKS
+
+# Stock selection; the selection is kept outside the widget so it survives
+# the options changing with every search
+if "tracked_stocks" not in st.session_state:
+    st.session_state.tracked_stocks = list(SYMBOLS_CONFIG["default_symbols"])
 selected_stocks = st.sidebar.multiselect(
     "Select Indian stocks to track:",
-    options=list(popular_stocks.keys()),
-    default=["RELIANCE"],  # Start with Reliance Industries
-    format_func=lambda x: f"{x} - {popular_stocks[x]}"
+    options=list(dict.fromkeys(st.session_state.tracked_stocks + list(matching_symbols))),
+    default=st.session_state.tracked_stocks,
+    format_func=lambda x: f"{x} - {symbol_registry.name(x)}"
 )
+st.session_state.tracked_stocks = selected_stocks
 
 # Time period selection
 time_period = st.sidebar.selectbox(
@@ -249,7 +268,10 @@ time_period = st.sidebar.selectbox(
 )
 
 # Auto-refresh toggle
-auto_refresh = st.sidebar.checkbox("🔄 Auto-refresh (30s)", value=True)
+auto_refresh = st.sidebar.checkbox(
+    f"🔄 Auto-refresh ({AUTO_REFRESH_CONFIG['default_interval']}s)",
+    value=AUTO_REFRESH_CONFIG["enabled_by_default"]
+)
 
 # Sample data toggle for testing
 use_sample_data = st.sidebar.checkbox("🧪 Use Sample Data (recommended)", value=True)
@@ -259,6 +281,13 @@ else:
     st.sidebar.warning("⚠️ Real data may not work due to API issues")
     st.warning("⚠️ **API Notice**: Yahoo Finance API is currently experiencing issues. For the best experience, enable 'Use Sample Data' in the sidebar.")
 
+# Streaming quotes toggle (real data only)
+use_streaming = not use_sample_data and st.sidebar.checkbox(
+    "⚡ Streaming quotes",
+    value=STREAMING_CONFIG["enabled_by_default"],
+    help=f"Live ticks from {STREAMING_CONFIG['host']}:{STREAMING_CONFIG['port']} (see replay_server.py)"
+)
+
 # Rate limiting warning
 st.sidebar.markdown("---")
 st.sidebar.warning("⚠️ **Rate Limiting Notice**\n\nTo avoid API limits, please:\n• Select fewer stocks (max 3-4)\n• Use longer refresh intervals\n• Be patient with data loading")
@@ -292,37 +321,6 @@ if st.sidebar.button("🔍 Test Indian Market APIs"):
         st.sidebar.error(f"❌ API connection failed: {str(e)}")
         st.sidebar.info("💡 Dashboard will use sample data automatically")
 
-# Function to get stock symbol with proper exchange suffix
-def get_stock_symbol(symbol):
-    """Add proper exchange suffix if needed"""
-    if symbol.endswith('.NS'):
-        return symbol  # Already has NSE suffix
-    elif symbol.endswith('.BO'):
-        return symbol  # Already has BSE suffix
-    else:
-        # For US stocks, no suffix needed
-        return symbol
-
-# Function to validate Indian stock symbols
-def validate_indian_stock(symbol):
-    """Validate and suggest corrections for Indian stock symbols"""
-    indian_stocks = {
-        "WAAENERGIES": "WAAENERGIES.NS",
-        "CRESTCHM": "CRESTCHM.NS",
-        "RELIANCE": "RELIANCE.NS",
-        "TCS": "TCS.NS",
-        "INFY": "INFY.NS",
-        "HDFCBANK": "HDFCBANK.NS",
-        "ICICIBANK": "ICICIBANK.NS",
-        "SBIN": "SBIN.NS",
-        "BHARTIARTL": "BHARTIARTL.NS",
-        "ITC": "ITC.NS"
-    }
-    
-    if symbol in indian_stocks:
-        return indian_stocks[symbol]
-    return symbol
-
 # Function to test stock symbol availability
 def test_stock_symbol(symbol):
     """Test if a stock symbol is available and return suggestions"""
@@ -336,666 +334,672 @@ def test_stock_symbol(symbol):
     except Exception as e:
         return False, f"Error: {str(e)}"
 
-# Function to create sample data for testing
-def create_sample_data(symbol):
-    """Create sample data for testing when API fails"""
-    import pandas as pd
-    import random
-    from datetime import datetime, timedelta
-    
-    # Create sample data for the last 30 days
-    end_date = datetime.now()
-    start_date = end_date - timedelta(days=30)
-    dates = pd.date_range(start=start_date, end=end_date, freq='D')
-    
-    # Set seed for consistent data
-    random.seed(hash(symbol) % 1000)
-    
-    # Generate sample price data based on Indian stock symbols
-    if symbol == "RELIANCE":
-        base_price = 2500.0
-        trend = 0.3
-    elif symbol == "TCS":
-        base_price = 3500.0
-        trend = 0.2
-    elif symbol == "INFY":
-        base_price = 1500.0
-        trend = 0.15
-    elif symbol == "HDFCBANK":
-        base_price = 1600.0
-        trend = 0.1
-    elif symbol == "ICICIBANK":
-        base_price = 900.0
-        trend = 0.2
-    elif symbol == "SBIN":
-        base_price = 600.0
-        trend = 0.25
-    elif symbol == "BHARTIARTL":
-        base_price = 800.0
-        trend = 0.1
-    elif symbol == "ITC":
-        base_price = 400.0
-        trend = 0.05
-    elif symbol == "WAAENERGIES":
-        base_price = 1200.0
-        trend = 0.4
-    elif symbol == "CRESTCHM":
-        base_price = 80.0
-        trend = 0.15
-    else:
-        base_price = 500.0
-        trend = 0.1
-    
-    prices = []
-    current_price = base_price
-    
-    for i in range(len(dates)):
-        # Add trend and random variation
-        daily_change = random.uniform(-3, 3) + trend
-        current_price = max(current_price + daily_change, 1.0)  # Ensure price is positive
-        prices.append(current_price)
-    
-    # Create DataFrame with realistic OHLC data
-    data = {
-        'Open': [],
-        'High': [],
-        'Low': [],
-        'Close': prices,
-        'Volume': []
-    }
-    
-    for i, close_price in enumerate(prices):
-        # Generate realistic OHLC
-        daily_range = random.uniform(2, 8)
-        open_price = close_price + random.uniform(-daily_range/2, daily_range/2)
-        high_price = max(open_price, close_price) + random.uniform(0, daily_range/2)
-        low_price = min(open_price, close_price) - random.uniform(0, daily_range/2)
-        
-        data['Open'].append(open_price)
-        data['High'].append(high_price)
-        data['Low'].append(low_price)
-        data['Volume'].append(random.randint(1000000, 8000000))
-    
-    df = pd.DataFrame(data, index=dates)
-    return df
-
-# Function to get NSE data using alternative sources
-def get_nse_data(symbol, period="1mo"):
-    """Fetch data from NSE using multiple alternative sources"""
-    try:
-        # Method 1: Try nsepy first
-        try:
-            from nsepy import get_history
-            from datetime import date
-            
-            # Remove .NS suffix if present
-            clean_symbol = symbol.replace('.NS', '')
-            
-            # Calculate date range
-            end_date = date.today()
-            if period == "1d":
-                start_date = end_date
-            elif period == "5d":
-                start_date = end_date - timedelta(days=5)
-            elif period == "1mo":
-                start_date = end_date - timedelta(days=30)
-            elif period == "3mo":
-                start_date = end_date - timedelta(days=90)
-            else:
-                start_date = end_date - timedelta(days=30)
-            
-            # Fetch data from NSE using nsepy
-            data = get_history(symbol=clean_symbol, start=start_date, end=end_date)
-            
-            if data is not None and not data.empty:
-                st.success(f"✅ NSE data fetched using nsepy for {symbol}")
-                return data, {}
-                
-        except ImportError:
-            st.warning("nsepy not available, trying alternative method...")
-        except Exception as e:
-            st.warning(f"nsepy failed: {str(e)}, trying alternative method...")
-        
-        # Method 2: Try MoneyControl API (alternative source)
-        try:
-            clean_symbol = symbol.replace('.NS', '')
-            
-            # MoneyControl API for stock data
-            url = f"https://www.moneycontrol.com/india/stockpricequote/{clean_symbol.lower()}"
-            
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.5',
-                'Accept-Encoding': 'gzip, deflate',
-                'Connection': 'keep-alive',
-            }
-            
-            response = requests.get(url, headers=headers, timeout=15)
-            
-            if response.status_code == 200:
-                st.info(f"✅ MoneyControl data fetched for {symbol}")
-                # For now, return sample data as placeholder
-                # In a full implementation, you would parse the HTML to extract price data
-                return create_sample_data(symbol), {}
-            else:
-                st.warning(f"MoneyControl failed with status code: {response.status_code}")
-                
-        except Exception as e:
-            st.warning(f"MoneyControl failed: {str(e)}")
-        
-        # Method 3: Return enhanced sample data as fallback
-        st.info(f"📊 Using enhanced sample data for {symbol} (real-time data unavailable)")
-        return create_sample_data(symbol), {}
-            
-    except Exception as e:
-        st.warning(f"NSE data fetch failed for {symbol}: {str(e)}")
-        return create_sample_data(symbol), {}
-
-# Function to get BSE data
-def get_bse_data(symbol, period="1mo"):
-    """Fetch data from BSE using web scraping with fallback"""
-    try:
-        # Remove .BO suffix if present
-        clean_symbol = symbol.replace('.BO', '')
-        
-        # BSE URL for stock data
-        url = f"https://www.bseindia.com/stock-share-price/{clean_symbol}"
-        
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate',
-            'Connection': 'keep-alive',
-        }
-        
-        response = requests.get(url, headers=headers, timeout=15)
-        
-        if response.status_code == 200:
-            st.info(f"✅ BSE data fetched for {symbol}")
-            # For now, return sample data as placeholder
-            # In a full implementation, you would parse the HTML to extract price data
-            return create_sample_data(symbol), {}
+# Shared market data cache, one per server process
+@st.cache_resource
+def get_market_cache():
+    """Create the market data cache shared by all sessions"""
+    return MarketDataCache.from_config()
+
+# Shared alert engine, one per server process
+@st.cache_resource
+def get_alert_engine():
+    """Load the alert rules and start delivering alerts to the configured sinks"""
+    return AlertEngine.from_config()
+
+# Shared background ingestion worker, started once per server process
+@st.cache_resource
+def get_ingestion_worker():
+    """Start the market-data ingestion worker shared by all sessions"""
+    history = HistoryStore() if HISTORY_CONFIG["enabled"] else None
+    worker = IngestionWorker(MarketDataStore(), cache=get_market_cache(), history=history,
+                             indicators=IndicatorEngine(), alerts=get_alert_engine())
+    worker.start()
+    return worker
+
+# Shared streaming quote feed, started once per server process
+@st.cache_resource
+def get_stream_feed():
+    """Start the streaming feed that merges live bars into the ingestion store"""
+    aggregator = TickAggregator.from_config() if HISTORY_CONFIG["enabled"] else TickAggregator()
+    feed = StreamingFeed(get_ingestion_worker().apply_bars, aggregator=aggregator)
+    feed.start()
+    return feed
+
+# Shared portfolios, one per data source, reloaded whenever the holdings file changes
+@st.cache_resource
+def get_portfolio(modified, sample):
+    """Load the trade ledger into a portfolio (modified is the file's mtime)"""
+    return Portfolio.from_config()
+
+# Shared market breadth engines, one per data source per server process
+@st.cache_resource
+def get_market_breadth(sample):
+    """Create the breadth engine over sample data or the local history store"""
+    if sample:
+        return MarketBreadth.from_config(SampleSource())
+    # Stored index closes anchor the computed levels to the real ones
+    breadth = MarketBreadth.from_config(HistorySource(HistoryStore()), anchor_levels=True)
+    # Constituents are polled on their own slow schedule so their history reaches the local store
+    get_ingestion_worker().schedule(breadth.constituent_symbols, BREADTH_CONFIG["period"],
+                                    BREADTH_CONFIG["poll_interval"])
+    return breadth
+
+# Shared universe screeners, one per data source per server process
+@st.cache_resource
+def get_screener(sample):
+    """Create the screener over sample data or the local history store"""
+    return Screener(SampleSource() if sample else HistorySource(HistoryStore()))
+
+# Shared backtest worker processes, started once per server process
+@st.cache_resource
+def get_backtest_pool():
+    """Start the process pool backtests are spread over"""
+    return create_pool()
+
+# Prometheus endpoint for this server process's timings
+@st.cache_resource
+def get_metrics_server():
+    """Start serving /metrics on the configured local port"""
+    return metrics.serve() if METRICS_CONFIG["enabled"] else None
+
+get_metrics_server()
+
+# Upstream source health (only relevant when fetching real data)
+if not use_sample_data:
+    with st.sidebar.expander("🩺 Data Source Health"):
+        if use_streaming:
+            feed = get_stream_feed()
+            status = "connected" if feed.connected else "reconnecting"
+            st.caption(f"⚡ Stream {status}, {feed.ticks:,} ticks received")
+        health = pd.DataFrame(source_health.snapshot())
+        if health.empty:
+            st.caption("No upstream calls yet")
         else:
-            st.warning(f"BSE failed with status code: {response.status_code}")
-            return create_sample_data(symbol), {}
-            
-    except Exception as e:
-        st.warning(f"BSE data fetch failed for {symbol}: {str(e)}")
-        return create_sample_data(symbol), {}
+            st.dataframe(health, use_container_width=True, hide_index=True)
 
-# Function to get TradingView data (simplified)
-def get_tradingview_data(symbol, period="1mo"):
-    """Fetch data from TradingView (simplified implementation)"""
-    try:
-        # TradingView API requires authentication and is complex
-        # This is a placeholder for future implementation
-        
-        # For now, return None
-        return None, {}
-        
-    except Exception as e:
-        st.warning(f"TradingView data fetch failed for {symbol}: {str(e)}")
-        return None, {}
-
-# Function to get data from multiple sources
-def get_multi_source_data(symbol, period="1mo"):
-    """Try multiple data sources in order of preference"""
-    
-    # For Indian stocks, try NSE first, then BSE
-    sources = [
-        ("NSE", lambda: get_nse_data(symbol, period)),
-        ("BSE", lambda: get_bse_data(symbol, period))
-    ]
-    
-    for source_name, source_func in sources:
-        try:
-            st.info(f"🔄 Trying {source_name} for {symbol}...")
-            data, info = source_func()
-            
-            if data is not None and not data.empty:
-                st.success(f"✅ Data fetched from {source_name} for {symbol}")
-                return data, info
-                
-        except Exception as e:
-            st.warning(f"❌ {source_name} failed for {symbol}: {str(e)}")
-            continue
+# Function to get stock data for several symbols at once
+def get_stock_data_batch(symbols, period="1mo"):
+    """Fetch stock data for all symbols concurrently, returning {symbol: (data, info)}"""
+    period = normalize_period(period)
     
-    # Final fallback: always return sample data
-    st.info(f"📊 Using sample data for {symbol} as fallback")
-    return create_sample_data(symbol), {}
+    # Check if sample data is requested
+    if use_sample_data:
+        results = {}
+        for symbol in symbols:
+            series, info = get_market_cache().get_or_fetch(
+                symbol, period, "sample", lambda: (CompactSeries.from_frame(create_sample_data(symbol, period)), {})
+            )
+            # Cached series are shared between sessions, hand out a read-only view
+            results[symbol] = (series.frame(), dict(info))
+        return results
+    
+    # Read the latest frames published by the ingestion worker
+    if use_streaming:
+        get_stream_feed().subscribe(symbols)
+    results = get_ingestion_worker().read_many(symbols, period)
+    for symbol, (data, _) in results.items():
+        if data is None:
+            st.info(f"⏳ Waiting for market data for {symbol}...")
+    return results
 
 # Function to get stock data with improved error handling
-@st.cache_data(ttl=300)  # Increased cache time to reduce API calls
 def get_stock_data(symbol, period="1mo"):
     """Fetch stock data from Indian market sources"""
-    
-    # Check if sample data is requested
-    if use_sample_data:
-        return create_sample_data(symbol), {}
-    
-    # Try to get data from multiple sources
-    return get_multi_source_data(symbol, period)
+    return get_stock_data_batch([symbol], period)[symbol]
 
-# Function to calculate technical indicators
-def calculate_indicators(df):
-    """Calculate technical indicators"""
-    if df is None or df.empty:
-        return df
-    
-    # Moving averages
-    df['MA20'] = df['Close'].rolling(window=20).mean()
-    df['MA50'] = df['Close'].rolling(window=50).mean()
-    
-    # RSI
-    delta = df['Close'].diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-    rs = gain / loss
-    df['RSI'] = 100 - (100 / (1 + rs))
-    
-    # Bollinger Bands
-    df['BB_middle'] = df['Close'].rolling(window=20).mean()
-    bb_std = df['Close'].rolling(window=20).std()
-    df['BB_upper'] = df['BB_middle'] + (bb_std * 2)
-    df['BB_lower'] = df['BB_middle'] - (bb_std * 2)
-    
-    return df
+# Function to get the data context for the current render
+def render_data(scope):
+    """Return the data context shared by everything drawn in this script run
+
+    A full run starts a fresh context that every tab shares. When a tab
+    reruns on its own (fragment refresh) it has already used the current
+    context, so it gets a fresh one and sees new data.
+    """
+    context = st.session_state.get("render_data")
+    if context is None or scope in context.scopes:
+        context = RenderDataContext(get_stock_data_batch)
+        st.session_state.render_data = context
+    context.scopes.add(scope)
+    return context
 
 # Function to create stock chart
 def create_stock_chart(df, symbol, stock_info):
     """Create comprehensive stock chart with indicators"""
     if df is None or df.empty:
         return None
-    
-    # Calculate indicators
-    df = calculate_indicators(df)
-    
-    # Create subplots
-    fig = make_subplots(
-        rows=3, cols=1,
-        shared_xaxes=True,
-        vertical_spacing=0.05,
-        subplot_titles=(f'{symbol} Stock Price', 'Volume', 'RSI'),
-        row_heights=[0.6, 0.2, 0.2]
-    )
-    
-    # Candlestick chart
-    fig.add_trace(
-        go.Candlestick(
-            x=df.index,
-            open=df['Open'],
-            high=df['High'],
-            low=df['Low'],
-            close=df['Close'],
-            name='Price',
-            increasing_line_color='#00ff00',
-            decreasing_line_color='#ff0000'
-        ),
-        row=1, col=1
-    )
-    
-    # Moving averages
-    fig.add_trace(
-        go.Scatter(
-            x=df.index,
-            y=df['MA20'],
-            mode='lines',
-            name='MA20',
-            line=dict(color='orange', width=1)
-        ),
-        row=1, col=1
-    )
-    
-    fig.add_trace(
-        go.Scatter(
-            x=df.index,
-            y=df['MA50'],
-            mode='lines',
-            name='MA50',
-            line=dict(color='blue', width=1)
-        ),
-        row=1, col=1
-    )
-    
-    # Bollinger Bands
-    fig.add_trace(
-        go.Scatter(
-            x=df.index,
-            y=df['BB_upper'],
-            mode='lines',
-            name='BB Upper',
-            line=dict(color='gray', width=1, dash='dash'),
-            showlegend=False
-        ),
-        row=1, col=1
-    )
-    
-    fig.add_trace(
-        go.Scatter(
-            x=df.index,
-            y=df['BB_lower'],
-            mode='lines',
-            name='BB Lower',
-            line=dict(color='gray', width=1, dash='dash'),
-            fill='tonexty',
-            fillcolor='rgba(128,128,128,0.1)',
-            showlegend=False
-        ),
-        row=1, col=1
-    )
-    
-    # Volume
-    colors = ['red' if close < open else 'green' for close, open in zip(df['Close'], df['Open'])]
-    fig.add_trace(
-        go.Bar(
-            x=df.index,
-            y=df['Volume'],
-            name='Volume',
-            marker_color=colors,
-            opacity=0.7
-        ),
-        row=2, col=1
-    )
-    
-    # RSI
-    fig.add_trace(
-        go.Scatter(
-            x=df.index,
-            y=df['RSI'],
-            mode='lines',
-            name='RSI',
-            line=dict(color='purple', width=2)
-        ),
-        row=3, col=1
-    )
-    
-    # RSI overbought/oversold lines
-    fig.add_hline(y=70, line_dash="dash", line_color="red", row=3, col=1)
-    fig.add_hline(y=30, line_dash="dash", line_color="green", row=3, col=1)
-    
-    # Update layout with theme-specific template
-    company_name = popular_stocks.get(symbol, symbol)
-    
-    # Choose template based on theme
+
+    return StockChart(symbol, chart_title(symbol), chart_template()).update(df)
+
+# Function to title a stock chart
+def chart_title(symbol):
+    """Chart title with the company name"""
+    company_name = symbol_registry.name(symbol)
+    return f"{symbol} - {company_name}"
+
+# Function to choose the plotly template for the theme
+def chart_template():
+    """Plotly template matching the selected theme"""
     if theme_mode == "Dark":
-        template = "plotly_dark"
-    elif theme_mode in ["Ocean Blue", "Forest Green", "Sunset Orange", "Purple Night"]:
-        template = "plotly_white"  # Light templates for better readability
-    else:
-        template = "plotly_white"
-    
-    fig.update_layout(
-        title=f"{symbol} - {company_name}",
-        xaxis_rangeslider_visible=False,
-        height=800,
-        showlegend=True,
-        template=template
-    )
-    
-    return fig
+        return "plotly_dark"
+    # Light templates for better readability on the coloured themes
+    return "plotly_white"
 
 # Function to create metrics cards
 def create_metrics_cards(stock_data, stock_info, symbol):
     """Create metrics cards for stock information"""
     if stock_data is None or stock_data.empty:
         return
-    
-    current_price = stock_data['Close'].iloc[-1]
-    previous_price = stock_data['Close'].iloc[-2] if len(stock_data) > 1 else current_price
-    price_change = current_price - previous_price
-    price_change_pct = (price_change / previous_price) * 100 if previous_price != 0 else 0
-    
-    # Calculate 52-week high/low from available data
-    high_52w = stock_data['High'].max() if len(stock_data) > 0 else current_price
-    low_52w = stock_data['Low'].min() if len(stock_data) > 0 else current_price
-    
-    # Create columns for metrics
+
+    cards = metric_cards(stock_data)
+    for column, card in zip(st.columns(len(cards)), cards):
+        with column:
+            st.metric(**card)
+
+# Auto-refresh: each tab reruns on its own timer instead of sleeping in the script thread
+refresh_interval = AUTO_REFRESH_CONFIG["default_interval"] if auto_refresh else None
+if use_streaming:
+    # Streamed bars land in the store within a fraction of a second, so poll it faster
+    refresh_interval = STREAMING_CONFIG["refresh_interval"]
+
+# Function to manage alert rules
+def render_alert_rules():
+    """Form for new alert rules and the list of existing ones"""
+    engine = get_alert_engine()
+    with st.form("new_alert", clear_on_submit=True):
+        symbol = st.selectbox("Stock", list(dict.fromkeys(selected_stocks + POPULAR_STOCKS)))
+        condition = st.selectbox("Condition", list(CONDITIONS),
+                                 format_func=lambda c: CONDITIONS[c][2])
+        value = st.number_input("Value", value=0.0, help="Unused by the Bollinger Band conditions")
+        if st.form_submit_button("➕ Add alert"):
+            engine.add_rule(Rule(symbol, condition, value))
+            write_rules(ALERTS_CONFIG["rules_path"], engine.rules)
+
+    if engine.rules:
+        position = st.selectbox("Rules", range(len(engine.rules)), format_func=lambda i: describe(engine.rules[i]))
+        if st.button("🗑️ Remove rule"):
+            engine.remove_rule(position)
+            write_rules(ALERTS_CONFIG["rules_path"], engine.rules)
+            st.rerun()
+
+@st.fragment(run_every=refresh_interval)
+def render_alerts():
+    """Latest alerts, with a toast for each one this session has not seen yet"""
+    engine = get_alert_engine()
+    if "last_alert" not in st.session_state:
+        # A new session (or reload) only toasts alerts fired from now on
+        st.session_state.last_alert = engine.sequence
+    alerts = engine.recent()
+    last_seen = st.session_state.last_alert
+    for alert in alerts:
+        if alert.sequence > last_seen:
+            st.toast(f"🔔 {alert.message}")
+    if alerts:
+        st.session_state.last_alert = alerts[-1].sequence
+        for alert in reversed(alerts[-10:]):
+            st.caption(f"{alert.time:%H:%M:%S} · {alert.message}")
+    else:
+        st.caption("No alerts yet")
+    if use_sample_data:
+        # The engine and its sinks are shared with live sessions, so made-up prices are never checked
+        st.caption("Alerts are only checked against live data")
+
+with st.sidebar.expander("🔔 Alerts"):
+    render_alert_rules()
+    render_alerts()
+
+@st.fragment(run_every=refresh_interval)
+@metrics.timed("render", tab="charts")
+def render_stock_charts():
+    """Stock Charts tab"""
+    st.header("📊 Individual Stock Analysis")
+
+    # Fetch every selected symbol at once
+    chart_data = render_data("charts").get_batch(selected_stocks, time_period)
+    if "chart_cache" not in st.session_state:
+        st.session_state.chart_cache = {}
+    # Only selected symbols keep a chart, so the cache stays as small as the selection
+    for symbol in set(st.session_state.chart_cache) - set(selected_stocks):
+        del st.session_state.chart_cache[symbol]
+
+    for symbol in selected_stocks:
+        with st.container():
+            st.markdown(f"### {symbol} - {symbol_registry.name(symbol)}")
+
+            # Get stock data
+            stock_data, stock_info = chart_data[symbol]
+
+            if stock_data is not None and not stock_data.empty:
+                # Create metrics cards
+                create_metrics_cards(stock_data, stock_info, symbol)
+
+                # While streaming, the 1D chart shows today's intraday bars
+                if use_streaming and normalize_period(time_period) == "1d":
+                    intraday = get_stream_feed().bars.frame(symbol, AGGREGATION_CONFIG["chart_timeframe"])
+                    if intraday is not None:
+                        stock_data = intraday
+
+                # Keep one figure per symbol and extend it with new bars; a theme
+                # change starts a new one
+                stock_chart = st.session_state.chart_cache.get(symbol)
+                if stock_chart is None or stock_chart.key != (symbol, chart_title(symbol), chart_template()):
+                    stock_chart = StockChart(symbol, chart_title(symbol), chart_template())
+                    st.session_state.chart_cache[symbol] = stock_chart
+                chart = stock_chart.update(stock_data)
+                if chart:
+                    # Serializing the figure for the browser
+                    with metrics.span("chart_render", symbol=symbol):
+                        st.plotly_chart(chart, use_container_width=True)
+
+                st.markdown("---")
+            else:
+                st.error(f"Unable to fetch data for {symbol}")
+
+# Function to show holdings, P&L and risk
+def render_holdings(portfolio, context):
+    """Holdings summary, positions table and risk metrics"""
+    st.subheader("💼 Holdings")
+
+    benchmark = PORTFOLIO_CONFIG["benchmark"]
+    frames = context.get_batch(portfolio.open_symbols + [benchmark], PORTFOLIO_CONFIG["risk_period"])
+    closes = {
+        symbol: data['Close'] for symbol, (data, _) in frames.items()
+        if symbol != benchmark and data is not None and not data.empty
+    }
+    # Only positions whose price moved change the totals
+    portfolio.update_prices({symbol: float(series.iloc[-1]) for symbol, series in closes.items()})
+
+    benchmark_data, _ = frames[benchmark]
+    benchmark_closes = benchmark_data['Close'] if benchmark_data is not None and not benchmark_data.empty else None
+    risk = portfolio.risk(closes, benchmark_closes)
+    summary = portfolio.summary()
+
     col1, col2, col3, col4 = st.columns(4)
-    
     with col1:
-        st.metric(
-            label="Current Price",
-            value=f"${current_price:.2f}",
-            delta=f"{price_change:.2f} ({price_change_pct:.2f}%)",
-            delta_color="normal" if price_change >= 0 else "inverse"
-        )
-    
+        st.metric(label="Market Value", value=f"₹{summary['market_value']:,.2f}")
     with col2:
-        volume = stock_data['Volume'].iloc[-1]
         st.metric(
-            label="Volume",
-            value=f"{volume:,.0f}",
-            delta=None
+            label="Unrealized P&L",
+            value=f"₹{summary['unrealized']:,.2f}",
+            delta=f"{summary['unrealized_pct']:.2f}%"
         )
-    
     with col3:
-        st.metric(
-            label="52W High",
-            value=f"${high_52w:.2f}",
-            delta=None
-        )
-    
+        st.metric(label="Realized P&L", value=f"₹{summary['realized']:,.2f}")
     with col4:
-        st.metric(
-            label="52W Low",
-            value=f"${low_52w:.2f}",
-            delta=None
+        st.metric(label="Total P&L", value=f"₹{summary['total']:,.2f}")
+
+    positions = portfolio.positions(risk["betas"] if risk else None)
+    positions.insert(1, 'Name', [symbol_registry.name(symbol) for symbol in positions['Symbol']])
+    st.dataframe(
+        positions,
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            'Quantity': st.column_config.NumberColumn(format="%g"),
+            'Avg Cost': st.column_config.NumberColumn(format="₹%.2f"),
+            'Price': st.column_config.NumberColumn(format="₹%.2f"),
+            'Market Value': st.column_config.NumberColumn(format="₹%.2f"),
+            'Unrealized P&L': st.column_config.NumberColumn(format="₹%.2f"),
+            'Unrealized %': st.column_config.NumberColumn(format="%.2f%%"),
+            'Realized P&L': st.column_config.NumberColumn(format="₹%.2f"),
+            'Weight %': st.column_config.NumberColumn(format="%.2f%%"),
+            'Beta': st.column_config.NumberColumn(format="%.2f"),
+        }
+    )
+
+    if risk is None:
+        st.info(f"⏳ Risk metrics need daily history for the holdings and {benchmark}")
+        return
+
+    confidence = PORTFOLIO_CONFIG["var_confidence"] * 100
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric(label="Volatility (annualized)", value=f"{risk['volatility'] * 100:.2f}%")
+    with col2:
+        st.metric(label=f"1-day VaR {confidence:.0f}% (parametric)", value=f"₹{risk['var_parametric']:,.2f}")
+    with col3:
+        st.metric(label=f"1-day VaR {confidence:.0f}% (historical)", value=f"₹{risk['var_historical']:,.2f}")
+    with col4:
+        st.metric(label=f"Beta vs {benchmark}", value=f"{risk['beta']:.2f}")
+    st.caption(f"Risk from {risk['observations']} daily returns over {PORTFOLIO_CONFIG['risk_period']}")
+
+@st.fragment(run_every=refresh_interval)
+@metrics.timed("render", tab="portfolio")
+def render_portfolio_overview():
+    """Portfolio Overview tab"""
+    st.header("📈 Portfolio Overview")
+    portfolio_context = render_data("portfolio")
+
+    # Holdings from the trade ledger, if there is one
+    holdings_path = Path(PORTFOLIO_CONFIG["holdings_path"])
+    if holdings_path.exists():
+        try:
+            portfolio = get_portfolio(holdings_path.stat().st_mtime_ns, use_sample_data)
+        except ValueError as e:
+            st.error(f"❌ Could not load {holdings_path}: {e}")
+        else:
+            render_holdings(portfolio, portfolio_context)
+        st.subheader("Watchlist")
+
+    # Create portfolio summary
+    portfolio_frames = portfolio_context.get_batch(selected_stocks, "1mo")
+    watchlist_frames = {symbol: portfolio_frames[symbol][0] for symbol in selected_stocks}
+    df_portfolio = watchlist_summary(watchlist_frames, symbol_registry.name)
+
+    if not df_portfolio.empty:
+        # Display portfolio table with fallback for styling
+        try:
+            st.dataframe(
+                df_portfolio.style.format({
+                    'Price': '${:.2f}',
+                    'Change': '${:.2f}',
+                    'Change %': '{:.2f}%',
+                    'Volume': '{:,.0f}'
+                }).background_gradient(subset=['Change %'], cmap='RdYlGn'),
+                use_container_width=True
+            )
+        except ImportError:
+            # Fallback without styling if jinja2 is not available
+            st.dataframe(
+                df_portfolio.round(2),
+                use_container_width=True
+            )
+            st.info("💡 For better formatting, ensure jinja2>=3.1.2 is installed")
+
+        # Portfolio performance chart
+        st.subheader("Portfolio Performance")
+
+        # Create performance comparison chart, every symbol normalized to its starting price
+        fig_performance = performance_chart(normalized_performance(watchlist_frames), chart_template())
+        st.plotly_chart(fig_performance, use_container_width=True)
+
+@st.fragment(run_every=refresh_interval)
+@metrics.timed("render", tab="summary")
+def render_market_summary():
+    """Market Summary tab"""
+    st.header("📋 Market Summary")
+
+    # Market overview
+    st.subheader("Market Overview")
+
+    # Breadth covers the instrument master with sample data, every symbol with local history otherwise
+    breadth = get_market_breadth(use_sample_data)
+    if use_sample_data:
+        universe = [instrument.symbol for instrument in symbol_registry.instruments]
+    else:
+        universe = breadth.source.symbols() if HISTORY_CONFIG["enabled"] else []
+        # Latest (possibly streamed) constituent prices, read without tracking or waiting for them
+        constituent_frames = get_ingestion_worker().peek(breadth.constituent_symbols, BREADTH_CONFIG["period"])
+    breadth.refresh(universe)
+    if not use_sample_data:
+        breadth.update_prices({
+            symbol: float(data['Close'].iloc[-1])
+            for symbol, (data, _) in constituent_frames.items() if data is not None and not data.empty
+        })
+
+    # Index levels computed from constituent prices and weights
+    df_market = breadth.index_levels()
+    if not df_market.empty:
+        columns = st.columns(len(df_market))
+        for column, (_, row) in zip(columns, df_market.iterrows()):
+            with column:
+                st.metric(
+                    label=row['Index'],
+                    value=f"{row['Value']:.2f}",
+                    delta=f"{row['Change']:.2f} ({row['Change %']:.2f}%)",
+                    delta_color="normal" if row['Change'] >= 0 else "inverse"
+                )
+
+    # Market breadth across the whole universe
+    st.subheader("Market Breadth")
+    snapshot = breadth.snapshot()
+    if snapshot["symbols"] == 0:
+        st.info("No local history for market breadth yet. Symbols appear here once they have been fetched.")
+        return
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        ratio = snapshot["advances"] / snapshot["declines"] if snapshot["declines"] else float(snapshot["advances"])
+        st.metric(label="Advances / Declines", value=f"{snapshot['advances']} / {snapshot['declines']}",
+                  delta=f"A/D ratio {ratio:.2f}", delta_color="off")
+    with col2:
+        st.metric(label="New 52W Highs", value=snapshot["new_highs"])
+    with col3:
+        st.metric(label="New 52W Lows", value=snapshot["new_lows"])
+    with col4:
+        st.metric(label=f"Above MA{BREADTH_CONFIG['ma_period']}", value=f"{snapshot['above_ma_pct']:.1f}%")
+
+    fig_breadth = px.pie(
+        values=[snapshot["advances"], snapshot["declines"], snapshot["unchanged"]],
+        names=["Advancing", "Declining", "Unchanged"],
+        title=f"Advance/Decline across {snapshot['symbols']:,} symbols",
+        color=["Advancing", "Declining", "Unchanged"],
+        color_discrete_map={'Advancing': 'green', 'Declining': 'red', 'Unchanged': 'gray'}
+    )
+
+    st.plotly_chart(fig_breadth, use_container_width=True)
+
+@st.fragment(run_every=refresh_interval)
+@metrics.timed("render", tab="screener")
+def render_screener():
+    """Screener tab"""
+    st.header("🔍 Market Screener")
+
+    # Sample mode screens the whole instrument master, real mode every symbol with local history
+    screener = get_screener(use_sample_data)
+    if use_sample_data:
+        universe = [instrument.symbol for instrument in symbol_registry.instruments]
+    elif HISTORY_CONFIG["enabled"]:
+        universe = screener.source.symbols()
+    else:
+        universe = []
+    if not universe:
+        st.info("No local history to screen yet. Symbols appear here once they have been fetched.")
+        return
+
+    col1, col2 = st.columns(2)
+    with col1:
+        bias = st.selectbox("Show", ["All signals", "Bullish", "Bearish", "Everything"], key="screener_bias")
+    with col2:
+        top_n = st.number_input("Rows", min_value=10, max_value=1000, value=SCREENER_CONFIG["top_n"], step=10,
+                                key="screener_rows")
+
+    table = screener.scan(universe)
+    if bias == "All signals":
+        table = table[table['Signals'] != ""]
+    elif bias == "Bullish":
+        table = table[table['Score'] > 0]
+    elif bias == "Bearish":
+        table = table[table['Score'] < 0]
+
+    scan = screener.last_scan
+    st.caption(f"{scan['symbols']:,} symbols scanned, {scan['changed']:,} recomputed in "
+               f"{scan['seconds'] * 1000:.0f} ms; {len(table):,} match")
+
+    table = table.head(int(top_n)).reset_index()
+    table.insert(1, 'Name', [symbol_registry.name(symbol) for symbol in table['Symbol']])
+    st.dataframe(
+        table,
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            'Close': st.column_config.NumberColumn(format="₹%.2f"),
+            'Change %': st.column_config.NumberColumn(format="%.2f%%"),
+            'RSI': st.column_config.NumberColumn(format="%.1f"),
+            '%B': st.column_config.NumberColumn(format="%.2f"),
+        }
+    )
+
+# Function to load the closes a backtest runs over
+def backtest_closes(symbols):
+    """Daily closes over the backtest period from sample data or the local history store"""
+    history = None if use_sample_data else HistoryStore()
+    return load_closes(symbols, BACKTEST_CONFIG["period"], history)
+
+@st.fragment
+@metrics.timed("render", tab="backtest")
+def render_backtest():
+    """Backtest tab"""
+    st.header("🧪 Strategy Backtest")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        scope = st.radio("Symbols", ["Selected stocks", "Whole universe"], horizontal=True, key="backtest_scope")
+    with col2:
+        strategies = st.multiselect(
+            "Strategies",
+            [strategy for strategy in STRATEGIES if strategy != "buy_hold"],
+            default=[strategy for strategy in BACKTEST_CONFIG["grids"]],
+            format_func=lambda strategy: STRATEGIES[strategy][0],
+            key="backtest_strategies"
         )
 
+    if st.button("Run backtest", type="primary", disabled=not strategies):
+        if scope == "Selected stocks":
+            symbols = list(selected_stocks)
+        elif use_sample_data:
+            symbols = [instrument.symbol for instrument in symbol_registry.instruments]
+        else:
+            symbols = HistoryStore().symbols() if HISTORY_CONFIG["enabled"] else []
+
+        started = datetime.now()
+        with st.spinner(f"Backtesting {len(symbols):,} symbols..."):
+            closes = backtest_closes(symbols)
+            # Buy & hold is always run as the benchmark of every symbol
+            results = run_backtests(closes, ["buy_hold"] + strategies, executor=get_backtest_pool())
+        st.session_state.backtest = {
+            "results": results,
+            "symbols": len(closes),
+            "seconds": (datetime.now() - started).total_seconds(),
+        }
+
+    backtest = st.session_state.get("backtest")
+    if backtest is None:
+        st.info(f"Pick strategies and run a backtest over {BACKTEST_CONFIG['period']} of daily closes. "
+                "Parameter grids are set in BACKTEST_CONFIG.")
+        return
+    results = backtest["results"]
+    if results.empty:
+        st.warning("No history to backtest. Symbols appear here once they have been fetched.")
+        return
+
+    runs = results[results['Strategy'] != "buy_hold"]
+    st.caption(f"{len(runs):,} runs over {backtest['symbols']:,} symbols in {backtest['seconds']:.1f} s "
+               f"(net of {BACKTEST_CONFIG['fee_bps']} bps per trade)")
+
+    # Best runs by risk-adjusted return
+    top_runs = runs.sort_values('Sharpe', ascending=False).head(BACKTEST_CONFIG["top_n"]).reset_index(drop=True)
+    table = top_runs.assign(Strategy=top_runs['Strategy'].map(lambda strategy: STRATEGIES[strategy][0]))
+    st.dataframe(
+        table,
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            'Total Return %': st.column_config.NumberColumn(format="%.1f%%"),
+            'CAGR %': st.column_config.NumberColumn(format="%.1f%%"),
+            'Sharpe': st.column_config.NumberColumn(format="%.2f"),
+            'Max Drawdown %': st.column_config.NumberColumn(format="%.1f%%"),
+            'Exposure %': st.column_config.NumberColumn(format="%.0f%%"),
+        }
+    )
+    if top_runs.empty:
+        return
+
+    # Equity curve of one run against buy & hold of the same symbol
+    choice = st.selectbox(
+        "Equity curve",
+        top_runs.index,
+        format_func=lambda i: f"{top_runs.at[i, 'Symbol']} · {STRATEGIES[top_runs.at[i, 'Strategy']][0]} "
+                              f"({top_runs.at[i, 'Params']})",
+        key="backtest_run"
+    )
+    run = top_runs.loc[choice]
+    series = backtest_closes([run['Symbol']]).get(run['Symbol'])
+    if series is None:
+        return
+    params = parse_params(run['Strategy'], run['Params'])
+
+    fig_equity = go.Figure()
+    fig_equity.add_trace(go.Scatter(x=series.index, y=equity_curve(series.to_numpy(), run['Strategy'], params),
+                                    mode='lines', name=STRATEGIES[run['Strategy']][0]))
+    fig_equity.add_trace(go.Scatter(x=series.index, y=equity_curve(series.to_numpy(), "buy_hold", ()),
+                                    mode='lines', name="Buy & hold", line=dict(dash='dot')))
+    fig_equity.update_layout(
+        title=f"{chart_title(run['Symbol'])}: {STRATEGIES[run['Strategy']][0]} ({run['Params']})",
+        xaxis_title="Date",
+        yaxis_title="Equity (start = 1)",
+        template=chart_template()
+    )
+
+    st.plotly_chart(fig_equity, use_container_width=True)
+
 # Main dashboard
 if selected_stocks:
+    # Every full run starts with an empty render-scoped data context
+    st.session_state.render_data = RenderDataContext(get_stock_data_batch)
+    
     # Create tabs for different views
-    tab1, tab2, tab3 = st.tabs(["📊 Stock Charts", "📈 Portfolio Overview", "📋 Market Summary"])
+    tab1, tab2, tab3, tab4, tab5 = st.tabs(["📊 Stock Charts", "📈 Portfolio Overview", "📋 Market Summary",
+                                            "🔍 Screener", "🧪 Backtest"])
     
     with tab1:
-        st.header("📊 Individual Stock Analysis")
-        
-        for symbol in selected_stocks:
-            with st.container():
-                st.markdown(f"### {symbol} - {popular_stocks.get(symbol, symbol)}")
-                
-                # Get stock data
-                stock_data, stock_info = get_stock_data(symbol, time_period)
-                
-                if stock_data is not None and not stock_data.empty:
-                    # Create metrics cards
-                    create_metrics_cards(stock_data, stock_info, symbol)
-                    
-                    # Create and display chart
-                    chart = create_stock_chart(stock_data, symbol, stock_info)
-                    if chart:
-                        st.plotly_chart(chart, use_container_width=True)
-                    
-                    st.markdown("---")
-                else:
-                    st.error(f"Unable to fetch data for {symbol}")
+        render_stock_charts()
     
     with tab2:
-        st.header("📈 Portfolio Overview")
-        
-        # Create portfolio summary
-        portfolio_data = []
-        
-        for symbol in selected_stocks:
-            stock_data, stock_info = get_stock_data(symbol, "1mo")
-            if stock_data is not None and not stock_data.empty:
-                current_price = stock_data['Close'].iloc[-1]
-                previous_price = stock_data['Close'].iloc[-2] if len(stock_data) > 1 else current_price
-                price_change = current_price - previous_price
-                price_change_pct = (price_change / previous_price) * 100 if previous_price != 0 else 0
-                
-                portfolio_data.append({
-                    'Symbol': symbol,
-                    'Name': popular_stocks.get(symbol, symbol),
-                    'Price': current_price,
-                    'Change': price_change,
-                    'Change %': price_change_pct,
-                    'Volume': stock_data['Volume'].iloc[-1]
-                })
-        
-        if portfolio_data:
-            df_portfolio = pd.DataFrame(portfolio_data)
-            
-            # Display portfolio table with fallback for styling
-            try:
-                st.dataframe(
-                    df_portfolio.style.format({
-                        'Price': '${:.2f}',
-                        'Change': '${:.2f}',
-                        'Change %': '{:.2f}%',
-                        'Volume': '{:,.0f}'
-                    }).background_gradient(subset=['Change %'], cmap='RdYlGn'),
-                    use_container_width=True
-                )
-            except ImportError:
-                # Fallback without styling if jinja2 is not available
-                st.dataframe(
-                    df_portfolio.round(2),
-                    use_container_width=True
-                )
-                st.info("💡 For better formatting, ensure jinja2>=3.1.2 is installed")
-            
-            # Portfolio performance chart
-            st.subheader("Portfolio Performance")
-            
-            # Create performance comparison chart
-            performance_data = []
-            for symbol in selected_stocks:
-                stock_data, _ = get_stock_data(symbol, "1mo")
-                if stock_data is not None and not stock_data.empty:
-                    # Normalize to starting price
-                    normalized_prices = stock_data['Close'] / stock_data['Close'].iloc[0] * 100
-                    performance_data.append({
-                        'Date': stock_data.index,
-                        'Symbol': symbol,
-                        'Performance': normalized_prices
-                    })
-            
-            if performance_data:
-                fig_performance = go.Figure()
-                for data in performance_data:
-                    fig_performance.add_trace(
-                        go.Scatter(
-                            x=data['Date'],
-                            y=data['Performance'],
-                            mode='lines',
-                            name=data['Symbol'],
-                            line=dict(width=2)
-                        )
-                    )
-                
-                # Choose template based on theme
-                if theme_mode == "Dark":
-                    template = "plotly_dark"
-                elif theme_mode in ["Ocean Blue", "Forest Green", "Sunset Orange", "Purple Night"]:
-                    template = "plotly_white"
-                else:
-                    template = "plotly_white"
-                
-                fig_performance.update_layout(
-                    title="Portfolio Performance Comparison (Normalized to 100)",
-                    xaxis_title="Date",
-                    yaxis_title="Performance (%)",
-                    template=template
-                )
-                
-                st.plotly_chart(fig_performance, use_container_width=True)
+        render_portfolio_overview()
     
     with tab3:
-        st.header("📋 Market Summary")
-        
-        # Market overview
-        st.subheader("Market Overview")
-        
-        # Get Indian market indices
-        market_indices = {
-            "^NSEI": "NIFTY 50",
-            "^BSESN": "SENSEX",
-            "^NSEBANK": "NIFTY BANK",
-            "^CNXIT": "NIFTY IT"
-        }
-        
-        market_data = []
-        for index_symbol, index_name in market_indices.items():
-            try:
-                index_data, index_info = get_stock_data(index_symbol, "1d")
-                if index_data is not None and not index_data.empty:
-                    current_value = index_data['Close'].iloc[-1]
-                    previous_value = index_data['Open'].iloc[0]
-                    change = current_value - previous_value
-                    change_pct = (change / previous_value) * 100
-                    
-                    market_data.append({
-                        'Index': index_name,
-                        'Value': current_value,
-                        'Change': change,
-                        'Change %': change_pct
-                    })
-            except:
-                continue
-        
-        if market_data:
-            df_market = pd.DataFrame(market_data)
-            
-            # Display market indices
-            col1, col2, col3, col4 = st.columns(4)
-            for i, (_, row) in enumerate(df_market.iterrows()):
-                with [col1, col2, col3, col4][i]:
-                    st.metric(
-                        label=row['Index'],
-                        value=f"{row['Value']:.2f}",
-                        delta=f"{row['Change']:.2f} ({row['Change %']:.2f}%)",
-                        delta_color="normal" if row['Change'] >= 0 else "inverse"
-                    )
-        
-        # Market sentiment
-        st.subheader("Market Sentiment")
-        
-        if selected_stocks:
-            sentiment_data = []
-            for symbol in selected_stocks:
-                stock_data, _ = get_stock_data(symbol, "1d")
-                if stock_data is not None and not stock_data.empty:
-                    current_price = stock_data['Close'].iloc[-1]
-                    open_price = stock_data['Open'].iloc[0]
-                    sentiment = "Bullish" if current_price > open_price else "Bearish"
-                    
-                    sentiment_data.append({
-                        'Symbol': symbol,
-                        'Sentiment': sentiment,
-                        'Price Change': current_price - open_price
-                    })
-            
-            if sentiment_data:
-                df_sentiment = pd.DataFrame(sentiment_data)
-                
-                # Sentiment distribution
-                sentiment_counts = df_sentiment['Sentiment'].value_counts()
-                
-                fig_sentiment = px.pie(
-                    values=sentiment_counts.values,
-                    names=sentiment_counts.index,
-                    title="Market Sentiment Distribution",
-                    color_discrete_map={'Bullish': 'green', 'Bearish': 'red'}
-                )
-                
-                st.plotly_chart(fig_sentiment, use_container_width=True)
+        render_market_summary()
 
-# Auto-refresh functionality
-if auto_refresh:
-    time.sleep(30)
-    st.rerun()
+    with tab4:
+        render_screener()
+
+    with tab5:
+        render_backtest()
 
 # Footer
-st.markdown("---")
-st.markdown(
-    """
-    <div style='text-align: center; color: #666;'>
-        <p>📊 Real-Time Stock Market Dashboard | Data provided by Yahoo Finance</p>
-        <p>Last updated: {}</p>
-    </div>
-    """.format(datetime.now().strftime("%Y-%m-%d %H:%M:%S")),
-    unsafe_allow_html=True
-)
+@st.fragment(run_every=refresh_interval)
+def render_footer():
+    """Footer with the time of the latest refresh"""
+    st.markdown("---")
+    st.markdown(
+        """
+        <div style='text-align: center; color: #666;'>
+            <p>📊 Real-Time Stock Market Dashboard | Data provided by Yahoo Finance</p>
+            <p>Last updated: {}</p>
+        </div>
+        """.format(datetime.now().strftime("%Y-%m-%d %H:%M:%S")),
+        unsafe_allow_html=True
+    )
+
+render_footer()
+
+# Function to show hot-path timings
+@st.fragment(run_every=refresh_interval)
+def render_performance():
+    """p50/p95 per stage and per symbol, from the latest calls in this server process"""
+    hits = metrics.counter("cache_requests", result="hit")
+    misses = metrics.counter("cache_requests", result="miss")
+    if hits + misses:
+        st.caption(f"Cache hit rate {hits / (hits + misses):.0%} ({hits:,} hits, {misses:,} misses)")
+    server = get_metrics_server()
+    if server is not None:
+        host, port = server.server_address[:2]
+        st.caption(f"Prometheus metrics at http://{host}:{port}/metrics")
+
+    timing_columns = {
+        column: st.column_config.NumberColumn(format="%.1f")
+        for column in ["p50 ms", "p95 ms", "Max ms"]
+    }
+    st.markdown("**By stage**")
+    st.dataframe(metrics.summary(), use_container_width=True, hide_index=True, column_config=timing_columns)
+    by_symbol = metrics.summary(per_symbol=True)
+    if not by_symbol.empty:
+        st.markdown("**By symbol**")
+        st.dataframe(by_symbol, use_container_width=True, hide_index=True, column_config=timing_columns)
+
+metrics.observe("rerun", time.perf_counter() - run_started)
+
+# Performance panel (optional)
+if st.sidebar.checkbox("⏱️ Show performance panel", value=METRICS_CONFIG["show_panel"]):
+    with st.sidebar.expander("⏱️ Performance", expanded=True):
+        render_performance()
@@ -0,0 +1,213 @@
+"""
+Strategy backtests for Real-Time Stock Market Dashboard
+
+Strategies are built on the dashboard's own indicators (the vectorized
+moving averages, RSI and Bollinger Bands of screener.py, configured by
+INDICATORS_CONFIG) and are evaluated without a loop over time: every
+parameter set of a grid is one row of a params x bars position array, so a
+symbol's whole grid is a handful of NumPy passes. Positions are long/flat,
+decided on a bar's close and held from the next bar, with a cost charged on
+every change of position.
+
+Symbols are spread over a process pool, one task per symbol, so large
+universes and grids use every CPU.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+import multiprocessing
+
+import numpy as np
+import pandas as pd
+
+from config import BACKTEST_CONFIG, INDICATORS_CONFIG
+from market_data import create_sample_data
+from screener import rolling_mean, rolling_rsi, rolling_std
+
+RESULT_COLUMNS = ["Symbol", "Strategy", "Params", "Total Return %", "CAGR %", "Sharpe", "Max Drawdown %",
+                  "Trades", "Exposure %"]
+
+
+def _hold_between(entries, exits):
+    # Long from each entry until the next exit: forward-fill 1 (entry) / 0 (exit) along the rows
+    state = np.where(entries, 1.0, np.where(exits, 0.0, np.nan))
+    columns = np.arange(state.shape[1])
+    last_signal = np.where(np.isnan(state), 0, columns)
+    np.maximum.accumulate(last_signal, axis=1, out=last_signal)
+    positions = state[np.arange(state.shape[0])[:, None], last_signal]
+    return np.nan_to_num(positions)
+
+
+def buy_hold_positions(closes, params):
+    """Always long"""
+    return np.ones((len(params), len(closes)))
+
+
+def ma_crossover_positions(closes, params):
+    """Long while the short moving average is above the long one; params are (short, long)"""
+    row = closes[None, :]
+    means = {window: rolling_mean(row, window)[0] for window in {w for pair in params for w in pair}}
+    with np.errstate(invalid="ignore"):
+        return np.array([means[short] > means[long] for short, long in params], dtype=np.float64)
+
+
+def rsi_reversion_positions(closes, params):
+    """Buy when RSI falls below lower, sell when it rises above upper; params are (period, lower, upper)"""
+    row = closes[None, :]
+    periods = {period for period, _, _ in params}
+    rsi = {period: rolling_rsi(row, period, INDICATORS_CONFIG["rsi_smoothing"])[0] for period in periods}
+    values = np.array([rsi[period] for period, _, _ in params])
+    lower = np.array([[lower] for _, lower, _ in params])
+    upper = np.array([[upper] for _, _, upper in params])
+    with np.errstate(invalid="ignore"):
+        return _hold_between(values < lower, values > upper)
+
+
+def bollinger_positions(closes, params):
+    """Buy a close below the lower band, sell once it is back above the middle; params are (period, std)"""
+    row = closes[None, :]
+    periods = {period for period, _ in params}
+    middles = {period: rolling_mean(row, period)[0] for period in periods}
+    stds = {period: rolling_std(row, period)[0] for period in periods}
+    middle = np.array([middles[period] for period, _ in params])
+    lower = middle - np.array([stds[period] * width for period, width in params])
+    with np.errstate(invalid="ignore"):
+        return _hold_between(closes < lower, closes > middle)
+
+
+# strategy -> (label, position function, names of its parameters in grid order)
+STRATEGIES = {
+    "buy_hold": ("Buy & hold", buy_hold_positions, ()),
+    "ma_crossover": ("MA crossover", ma_crossover_positions, ("short", "long")),
+    "rsi_reversion": ("RSI mean reversion", rsi_reversion_positions, ("period", "lower", "upper")),
+    "bollinger": ("Bollinger reversion", bollinger_positions, ("period", "std")),
+}
+
+
+def expand_grid(strategy, grid):
+    """Every parameter tuple of a strategy's grid, dropping nonsensical ones"""
+    names = STRATEGIES[strategy][2]
+    if not names:
+        return [()]
+    params = list(product(*(grid[name] for name in names)))
+    if strategy == "ma_crossover":
+        params = [(short, long) for short, long in params if short < long]
+    elif strategy == "rsi_reversion":
+        params = [(period, lower, upper) for period, lower, upper in params if lower < upper]
+    return params
+
+
+def strategy_returns(closes, positions, fee_bps=None):
+    """params x (bars - 1) per-bar returns of position rows, net of trading costs"""
+    fee = (fee_bps if fee_bps is not None else BACKTEST_CONFIG["fee_bps"]) / 10000
+    returns = np.diff(closes) / closes[:-1]
+    turnover = np.abs(np.diff(positions, axis=1, prepend=0.0))
+    # A position taken at bar t's close earns the move from t to t + 1
+    return positions[:, :-1] * returns - fee * turnover[:, :-1]
+
+
+def bars_per_year(index):
+    """Bars per calendar year spanned by a DatetimeIndex, or BACKTEST_CONFIG["trading_days"] without dates"""
+    if isinstance(index, pd.DatetimeIndex) and len(index) > 1:
+        years = (index[-1] - index[0]) / pd.Timedelta(days=365.25)
+        if years > 0:
+            return (len(index) - 1) / years
+    return BACKTEST_CONFIG["trading_days"]
+
+
+def performance(returns, positions, bars_per_year=None):
+    """Stats of every row of a params x bars return array, annualized at bars_per_year"""
+    bars_per_year = bars_per_year or BACKTEST_CONFIG["trading_days"]
+    equity = np.cumprod(1 + returns, axis=1)
+    years = returns.shape[1] / bars_per_year
+    volatility = returns.std(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sharpe = np.where(volatility > 0, returns.mean(axis=1) / volatility * np.sqrt(bars_per_year), 0.0)
+        cagr = np.maximum(equity[:, -1], 0) ** (1 / years) - 1
+    drawdown = 1 - equity / np.maximum.accumulate(equity, axis=1)
+    return {
+        "Total Return %": (equity[:, -1] - 1) * 100,
+        "CAGR %": cagr * 100,
+        "Sharpe": sharpe,
+        "Max Drawdown %": drawdown.max(axis=1) * 100,
+        "Trades": (np.diff(positions, axis=1, prepend=0.0) > 0).sum(axis=1),
+        "Exposure %": positions.mean(axis=1) * 100,
+    }
+
+
+def format_params(strategy, params):
+    """Parameters as "name=value" text"""
+    return ", ".join(f"{name}={value:g}" for name, value in zip(STRATEGIES[strategy][2], params))
+
+
+def backtest_symbol(symbol, closes, strategies, grids=None, fee_bps=None, bars_per_year=None):
+    """Stats of every parameter set of every strategy on one close series"""
+    grids = grids or BACKTEST_CONFIG["grids"]
+    closes = np.asarray(closes, dtype=np.float64)
+    names, labels, stats = [], [], []
+    for strategy in strategies:
+        params = expand_grid(strategy, grids.get(strategy, {}))
+        if len(closes) < 3 or not params:
+            continue
+        positions = STRATEGIES[strategy][1](closes, params)
+        stats.append(performance(strategy_returns(closes, positions, fee_bps), positions, bars_per_year))
+        names += [strategy] * len(params)
+        labels += [format_params(strategy, p) for p in params]
+    if not stats:
+        return pd.DataFrame(columns=RESULT_COLUMNS)
+    columns = {column: np.concatenate([s[column] for s in stats]) for column in stats[0]}
+    return pd.DataFrame(dict(Symbol=symbol, Strategy=names, Params=labels, **columns), columns=RESULT_COLUMNS)
+
+
+def equity_curve(closes, strategy, params, fee_bps=None):
+    """Equity (starting at 1) of one strategy run, one value per bar"""
+    closes = np.asarray(closes, dtype=np.float64)
+    positions = STRATEGIES[strategy][1](closes, [tuple(params)])
+    returns = strategy_returns(closes, positions, fee_bps)[0]
+    return np.concatenate([[1.0], np.cumprod(1 + returns)])
+
+
+def parse_params(strategy, text):
+    """Inverse of format_params"""
+    values = dict(item.split("=") for item in text.split(", ")) if text else {}
+    return tuple(float(values[name]) if "." in values[name] else int(values[name])
+                 for name in STRATEGIES[strategy][2])
+
+
+def load_closes(symbols, period=None, history=None):
+    """{symbol: daily closes} over a period from a HistoryStore, or sample data without one"""
+    period = period or BACKTEST_CONFIG["period"]
+    closes = {}
+    for symbol in symbols:
+        df = history.read_period(symbol, period) if history is not None else create_sample_data(symbol, period)
+        if df is not None and len(df) > 2:
+            closes[symbol] = df['Close'].astype("float64")
+    return closes
+
+
+def create_pool(processes=None):
+    """Process pool for run_backtests; spawned workers stay clear of the server's threads"""
+    return ProcessPoolExecutor(max_workers=processes or BACKTEST_CONFIG["processes"],
+                               mp_context=multiprocessing.get_context("spawn"))
+
+
+def run_backtests(series, strategies=None, grids=None, fee_bps=None, executor=None):
+    """Backtest {symbol: closes} in parallel (one pool task per symbol) and return the stats table
+
+    Closes with a DatetimeIndex are annualized over the calendar span they cover.
+    """
+    strategies = strategies or list(STRATEGIES)
+    rates = {symbol: bars_per_year(getattr(closes, "index", None)) for symbol, closes in series.items()}
+    if executor is None or len(series) < 2:
+        frames = [backtest_symbol(symbol, np.asarray(closes), strategies, grids, fee_bps, rates[symbol])
+                  for symbol, closes in series.items()]
+    else:
+        futures = [
+            executor.submit(backtest_symbol, symbol, np.asarray(closes), strategies, grids, fee_bps, rates[symbol])
+            for symbol, closes in series.items()
+        ]
+        frames = [future.result() for future in futures]
+    frames = [frame for frame in frames if not frame.empty]
+    if not frames:
+        return pd.DataFrame(columns=RESULT_COLUMNS)
+    return pd.concat(frames, ignore_index=True)
@@ -0,0 +1,34 @@
+"""
+Benchmarks for Real-Time Stock Market Dashboard
+
+Each module has a run() returning a JSON-serialisable dict of timings and can
+be executed directly, e.g. `python -m bench.parsing` from the repository root.
+run_benchmarks.py runs them all and writes one JSON document per commit.
+"""
+
+import statistics
+import time
+
+# Watchlist sizes the scaling benchmarks run at
+SYMBOL_COUNTS = (1, 10, 100, 1000)
+
+
+def bench_symbols(count):
+    """Synthetic symbols; sample data and mock responses work for any name"""
+    return [f"BENCH{i:04d}" for i in range(count)]
+
+
+def measure(fn, symbols, min_time=1.0, max_runs=50):
+    """Median wall time of fn() over runs lasting at least min_time seconds (always one run)"""
+    times = []
+    started = time.perf_counter()
+    while not times or (time.perf_counter() - started < min_time and len(times) < max_runs):
+        run_started = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - run_started)
+    median = statistics.median(times)
+    return {
+        "total_ms": median * 1000,
+        "per_symbol_ms": median * 1000 / max(symbols, 1),
+        "runs": len(times),
+    }
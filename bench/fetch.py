@@ -0,0 +1,113 @@
+"""
+Fetch-chain benchmark against a local mock upstream
+
+A threaded HTTP server on 127.0.0.1 answers MoneyControl's history endpoint
+with the recorded fixture after a fixed delay. Batches then go through the
+production chain (fetch_batch, the source's circuit breaker,
+fetch_moneycontrol, the pooled and per-host capped http_client, and
+parse_udf_history) with only the endpoint URL pointed at the mock, so the
+numbers show how concurrency limits and parsing scale with upstream latency.
+"""
+
+import json
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import http_client
+import market_data
+from bench import SYMBOL_COUNTS, bench_symbols, measure
+from bench.parsing import load_fixture
+from config import API_CONFIG
+
+# Upstream delays in seconds each batch is run against
+LATENCIES = (0.0, 0.05)
+
+
+class MockUpstreamHandler(BaseHTTPRequestHandler):
+    """Serves the fixture body after the server's latency, on keep-alive connections"""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        if server.latency:
+            server.stop.wait(server.latency)
+        with server.lock:
+            server.requests += 1
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(server.body)))
+        self.end_headers()
+        self.wfile.write(server.body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_mock_upstream(latency, body=None):
+    """Start a mock upstream on a free port; returns the server (call shutdown() when done)"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), MockUpstreamHandler)
+    server.daemon_threads = True
+    server.latency = latency
+    server.body = body if body is not None else load_fixture("moneycontrol_history.json")
+    server.lock = threading.Lock()
+    server.stop = threading.Event()
+    server.requests = 0
+    threading.Thread(target=server.serve_forever, name="mock-upstream", daemon=True).start()
+    return server
+
+
+def _fetch(symbol, period):
+    return market_data.fetch_from_source("MoneyControl", symbol, period)
+
+
+def _wait_for_stragglers():
+    # fetch_batch returns at its deadline without waiting; let late fetches finish
+    # so they neither overlap the next measurement nor fail against a stopped server
+    for thread in threading.enumerate():
+        if thread.name.startswith("market-data-fetch"):
+            thread.join()
+
+
+def run_latency(latency, counts=SYMBOL_COUNTS, period="1mo", min_time=1.0):
+    """Batch fetch timings at every symbol count against one upstream latency"""
+    server = start_mock_upstream(latency)
+    url = market_data.MONEYCONTROL_HISTORY_URL
+    market_data.MONEYCONTROL_HISTORY_URL = f"http://127.0.0.1:{server.server_address[1]}/history"
+    try:
+        results = {}
+        for count in counts:
+            symbols = bench_symbols(count)
+            batch = {}
+            timings = measure(lambda: batch.update(market_data.fetch_batch(symbols, period, fetch=_fetch)),
+                              count, min_time)
+            _wait_for_stragglers()
+            # Symbols that failed or missed the batch deadline come back without data
+            timings["fetched"] = sum(1 for data, _ in batch.values() if data is not None)
+            results[str(count)] = timings
+        results["requests"] = server.requests
+        return results
+    finally:
+        market_data.MONEYCONTROL_HISTORY_URL = url
+        server.stop.set()
+        server.shutdown()
+        server.server_close()
+        http_client.close_all()
+
+
+def run(counts=SYMBOL_COUNTS, latencies=LATENCIES, period="1mo", min_time=1.0):
+    """Time batch fetches at every symbol count and upstream latency"""
+    # Deadline misses are counted in the results instead of logged one by one
+    logging.getLogger(market_data.__name__).setLevel(logging.ERROR)
+    return {
+        "period": period,
+        "max_per_host": API_CONFIG["max_per_host"],
+        "max_concurrency": API_CONFIG["max_concurrency"],
+        "batch_timeout": API_CONFIG["batch_timeout"],
+        "latencies": {f"{latency * 1000:g}ms": run_latency(latency, counts, period, min_time) for latency in latencies},
+    }
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=2))
@@ -0,0 +1,57 @@
+"""
+Parse-throughput benchmark for the MoneyControl and BSE response parsers
+
+Runs each parser over the recorded responses in bench/fixtures and reports
+the CPU cost per parse for the regex fast path and the lxml XPath fallback.
+tests/test_parsers.py checks what the parsers extract from the same fixtures.
+"""
+
+import json
+import time
+from pathlib import Path
+
+import parsers
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def load_fixture(name):
+    """Raw bytes of a recorded response"""
+    return (FIXTURES / name).read_bytes()
+
+
+def _time_per_call(fn, payload, repeat):
+    started = time.process_time()
+    for _ in range(repeat):
+        fn(payload)
+    return (time.process_time() - started) / repeat
+
+
+def _parse_bse_via_xpath(html):
+    # Force the fallback path by hiding the quote ids from the regexes
+    patterns = parsers._BSE_QUOTE_PATTERNS
+    parsers._BSE_QUOTE_PATTERNS = {}
+    try:
+        return parsers.parse_bse_quote(html)
+    finally:
+        parsers._BSE_QUOTE_PATTERNS = patterns
+
+
+def run(repeat=200):
+    """Time each parser over its fixture; returns milliseconds of CPU per parse"""
+    history = load_fixture("moneycontrol_history.json")
+    html = load_fixture("bse_quote.html")
+
+    results = {
+        "repeat": repeat,
+        "moneycontrol_history_ms": _time_per_call(parsers.parse_udf_history, history, repeat) * 1000,
+        "bse_quote_regex_ms": _time_per_call(parsers.parse_bse_quote, html, repeat) * 1000,
+        "bse_quote_bytes": len(html),
+    }
+    if parsers.etree is not None:
+        results["bse_quote_xpath_ms"] = _time_per_call(_parse_bse_via_xpath, html, repeat) * 1000
+    return results
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=2))
@@ -0,0 +1,71 @@
+"""
+Rerun hot-path benchmark for the Stock Charts and Portfolio Overview tabs
+
+Times the work a rerun does per watched symbol, at each watchlist size:
+sample data generation, indicators, the stock chart (figure build plus the
+JSON serialisation st.plotly_chart does), the metric cards and the
+watchlist/performance aggregation. Charts are built fresh each time, which
+is the cost of a first render or a theme change; at 100 symbols and above
+the styled empty figures no longer fit their cache either.
+
+Streamlit calls run outside a script run, so st.metric builds its messages
+but nothing is sent.
+"""
+
+import json
+
+import streamlit as st
+import streamlit.config
+import streamlit.logger
+
+from bench import SYMBOL_COUNTS, bench_symbols, measure
+from charts import StockChart, metric_cards, performance_chart
+from config import CHART_CONFIG
+from indicators import calculate_indicators
+from market_data import create_sample_data
+from portfolio import normalized_performance, watchlist_summary
+
+
+def create_metrics_cards(df):
+    """The st.metric calls app.create_metrics_cards makes"""
+    cards = metric_cards(df)
+    for column, card in zip(st.columns(len(cards)), cards):
+        with column:
+            st.metric(**card)
+
+
+def run_count(count, period="1mo", min_time=1.0):
+    """Timings of every hot path for one watchlist size"""
+    symbols = bench_symbols(count)
+    frames = {symbol: create_sample_data(symbol, period) for symbol in symbols}
+    template = CHART_CONFIG["template"]
+
+    return {
+        "create_sample_data": measure(
+            lambda: [create_sample_data(symbol, period) for symbol in symbols], count, min_time),
+        "calculate_indicators": measure(
+            lambda: [calculate_indicators(df.copy(deep=False)) for df in frames.values()], count, min_time),
+        "create_stock_chart": measure(
+            lambda: [StockChart(symbol, symbol, template).update(df).to_json() for symbol, df in frames.items()],
+            count, min_time),
+        "create_metrics_cards": measure(
+            lambda: [create_metrics_cards(df) for df in frames.values()], count, min_time),
+        "portfolio_aggregation": measure(
+            lambda: (watchlist_summary(frames), performance_chart(normalized_performance(frames), template).to_json()),
+            count, min_time),
+    }
+
+
+def run(counts=SYMBOL_COUNTS, period="1mo", min_time=1.0):
+    """Time each hot path at every watchlist size; returns {count: {path: timings}}"""
+    # Calls outside a script run warn about it otherwise
+    streamlit.config.set_option("global.showWarningOnDirectExecution", False)
+    streamlit.logger.set_log_level("error")
+    return {
+        "period": period,
+        "counts": {str(count): run_count(count, period, min_time) for count in counts},
+    }
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=2))
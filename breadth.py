@@ -0,0 +1,186 @@
+"""
+Market breadth and index levels for Real-Time Stock Market Dashboard
+
+MarketBreadth keeps a few numbers per symbol of the universe in parallel
+NumPy arrays: the latest and previous close, the highest and lowest close
+of the 52-week window before the latest bar, the sum of the closes that
+precede it in the MA window, and the close at the start of the window.
+Advance/decline counts, new highs/lows and the share of symbols above their
+moving average are then one vectorized pass over those arrays.
+
+Updates are incremental. refresh() re-reads only symbols whose source
+version changed, and update_prices() applies a live price to a symbol in
+O(1) because every other number it is compared against is already stored.
+
+Index levels are computed from constituent closes and weights (an
+index,symbol,weight CSV): level = base * sum(w * close / window-start close).
+The base is the index's own close at the start of the window when that is
+stored locally, otherwise the configured reference level.
+"""
+
+import csv
+import threading
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from config import BREADTH_CONFIG
+
+
+def read_constituents(path):
+    """{index symbol: {constituent: weight}} from an index,symbol,weight CSV"""
+    constituents = {}
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        for line, row in enumerate(csv.DictReader(f), start=2):
+            try:
+                index, symbol = row["index"].strip(), row["symbol"].strip().upper()
+                constituents.setdefault(index, {})[symbol] = float(row["weight"])
+            except (AttributeError, KeyError, TypeError, ValueError) as e:
+                raise ValueError(f"{path}:{line}: {e}") from e
+    return constituents
+
+
+class MarketBreadth:
+    """Advance/decline, 52-week highs/lows, share above the MA and constituent-weighted index levels"""
+
+    # Rows of the per-symbol state array
+    LAST, PREVIOUS, PRIOR_HIGH, PRIOR_LOW, PRIOR_SUM, BASE = range(6)
+
+    def __init__(self, source, constituents, indices=None, lookback=None, ma_period=None, anchor_levels=False):
+        self.source = source
+        self.constituents = constituents
+        self.indices = indices or BREADTH_CONFIG["indices"]
+        self.lookback = lookback or BREADTH_CONFIG["lookback"]
+        self.ma_period = ma_period or BREADTH_CONFIG["ma_period"]
+        self.bars = max(self.lookback, self.ma_period) + 1
+        self.anchor_levels = anchor_levels
+
+        self._lock = threading.Lock()
+        self._versions = {}
+        self._rows = {}
+        self._base_levels = {}
+        self._state = np.empty((6, 0))
+
+    @classmethod
+    def from_config(cls, source, anchor_levels=False):
+        return cls(source, read_constituents(Path(BREADTH_CONFIG["constituents_path"])), anchor_levels=anchor_levels)
+
+    @property
+    def constituent_symbols(self):
+        """Every symbol that is part of some index"""
+        return list(dict.fromkeys(symbol for members in self.constituents.values() for symbol in members))
+
+    def refresh(self, symbols):
+        """Re-read symbols (and index constituents) whose data changed; returns how many did"""
+        symbols = list(dict.fromkeys(list(symbols) + self.constituent_symbols))
+        with self._lock:
+            changed = {}
+            for symbol in symbols:
+                version = self.source.version(symbol)
+                if version is not None and self._versions.get(symbol) != version:
+                    changed[symbol] = version
+            if not changed:
+                return 0
+
+            closes = np.full((len(changed), self.bars), np.nan)
+            for row, symbol in enumerate(changed):
+                tail = self.source.closes(symbol, self.bars)[-self.bars:]
+                closes[row, self.bars - len(tail):] = tail
+
+            new = [symbol for symbol in changed if symbol not in self._rows]
+            if new:
+                start = len(self._rows)
+                self._rows.update((symbol, start + i) for i, symbol in enumerate(new))
+                self._state = np.hstack([self._state, np.full((6, len(new)), np.nan)])
+            rows = [self._rows[symbol] for symbol in changed]
+            self._state[:, rows] = self._window_state(closes)
+            self._versions.update(changed)
+
+            if self.anchor_levels:
+                self._anchor(changed)
+            return len(changed)
+
+    def _window_state(self, closes):
+        # Per-row numbers every later comparison needs, for a changed x bars close array
+        state = np.full((6, len(closes)), np.nan)
+        state[self.LAST] = closes[:, -1]
+        state[self.PREVIOUS] = closes[:, -2]
+        state[self.BASE] = closes[:, 0]
+
+        # 52-week extremes before the latest bar, only over a complete window
+        prior = closes[:, -self.lookback - 1:-1]
+        complete = np.isfinite(prior).all(axis=1)
+        state[self.PRIOR_HIGH, complete] = prior[complete].max(axis=1)
+        state[self.PRIOR_LOW, complete] = prior[complete].min(axis=1)
+        # NaN unless all ma_period - 1 closes before the latest exist
+        state[self.PRIOR_SUM] = closes[:, -self.ma_period:-1].sum(axis=1)
+        return state
+
+    def _anchor(self, changed):
+        # Locally stored index closes pin the level at the start of the window
+        for index in self.indices:
+            if index in changed or index not in self._base_levels:
+                closes = self.source.closes(index, self.bars)
+                if len(closes) >= self.bars:
+                    self._base_levels[index] = float(closes[-self.bars])
+
+    def update_prices(self, prices):
+        """Apply live prices {symbol: price} to symbols already in the universe"""
+        with self._lock:
+            for symbol, price in prices.items():
+                row = self._rows.get(symbol)
+                if row is not None and np.isfinite(price):
+                    self._state[self.LAST, row] = price
+
+    def snapshot(self):
+        """Breadth of the whole universe: advances, declines, new highs/lows and share above the MA"""
+        with self._lock:
+            last, previous, prior_high, prior_low, prior_sum, _ = self._state.copy()
+
+        change = last - previous
+        moving_average = (prior_sum + last) / self.ma_period
+        has_ma = np.isfinite(moving_average)
+        advances, declines = int((change > 0).sum()), int((change < 0).sum())
+        return {
+            "symbols": len(last),
+            "advances": advances,
+            "declines": declines,
+            "unchanged": int((change == 0).sum()),
+            "new_highs": int((last > prior_high).sum()),
+            "new_lows": int((last < prior_low).sum()),
+            "above_ma_pct": float((last[has_ma] > moving_average[has_ma]).mean() * 100) if has_ma.any() else 0.0,
+        }
+
+    def index_levels(self):
+        """Index, Value, Change and Change % of every configured index, from its constituents"""
+        with self._lock:
+            state = self._state.copy()
+            rows = dict(self._rows)
+            base_levels = dict(self._base_levels)
+
+        levels = []
+        for index, (name, reference_level) in self.indices.items():
+            members = [(rows[symbol], weight) for symbol, weight in self.constituents.get(index, {}).items()
+                       if symbol in rows]
+            if not members:
+                continue
+            positions = np.array([row for row, _ in members])
+            weights = np.array([weight for _, weight in members])
+            last, previous, base = state[[self.LAST, self.PREVIOUS, self.BASE]][:, positions]
+
+            # Constituents without a full window are left out and the weights renormalized
+            usable = np.isfinite(last) & np.isfinite(previous) & np.isfinite(base) & (base > 0)
+            if not usable.any():
+                continue
+            weights = weights[usable] / weights[usable].sum()
+            base_level = base_levels.get(index, reference_level)
+            value = base_level * float(weights @ (last[usable] / base[usable]))
+            previous_value = base_level * float(weights @ (previous[usable] / base[usable]))
+            levels.append({
+                'Index': name,
+                'Value': value,
+                'Change': value - previous_value,
+                'Change %': (value / previous_value - 1) * 100,
+            })
+        return pd.DataFrame(levels, columns=['Index', 'Value', 'Change', 'Change %'])
@@ -0,0 +1,224 @@
+"""
+Stock charts for Real-Time Stock Market Dashboard
+
+Laying out the three-row subplot figure costs several times more than
+filling it, so the empty, styled figure is built once per symbol, title and
+theme and copied without re-validation. A StockChart keeps its figure and
+the frame it was drawn from; when the next frame only adds or revises bars
+at the end, indicators are recomputed over the tail window alone and the
+trace arrays are replaced in place instead of rebuilding the figure.
+Traces are downsampled to CHART_CONFIG["max_points"] on the way in, so the
+payload does not grow with the selected range.
+"""
+
+import copy
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+from config import CHART_CONFIG, INDICATORS_CONFIG
+from downsample import lttb_indices, resample_ohlc
+from indicators import MA_LONG, MA_SHORT, calculate_indicators
+from metrics import metrics
+
+# Position of each trace in a stock chart's figure.data
+PRICE_TRACE, MA_SHORT_TRACE, MA_LONG_TRACE, BB_UPPER_TRACE, BB_LOWER_TRACE, VOLUME_TRACE, RSI_TRACE = range(7)
+
+# Line traces and the indicator column each one plots
+LINE_TRACES = {
+    MA_SHORT_TRACE: MA_SHORT,
+    MA_LONG_TRACE: MA_LONG,
+    BB_UPPER_TRACE: "BB_upper",
+    BB_LOWER_TRACE: "BB_lower",
+    RSI_TRACE: "RSI",
+}
+
+
+def frame_version(df):
+    """Cheap fingerprint of a frame's newest bar, used to skip unchanged charts"""
+    return (len(df), df.index[0], df.index[-1], float(df['Close'].iloc[-1]), float(df['Volume'].iloc[-1]))
+
+
+def indicator_lookback(config=None):
+    """Bars needed before a bar to recompute its indicators exactly, or None if all history matters"""
+    config = config or INDICATORS_CONFIG
+    if config["rsi_smoothing"] == "wilder":
+        # Exponential smoothing carries every earlier bar
+        return None
+    return max(config["ma_short"], config["ma_long"], config["bb_period"], config["rsi_period"] + 1)
+
+
+def candle_colors(df):
+    """Volume bar colour per bar: red for a down bar, green otherwise"""
+    return np.where(df['Close'].to_numpy() < df['Open'].to_numpy(), 'red', 'green')
+
+
+def _rounded(values):
+    # Fewer digits is a smaller figure payload; the chart cannot show more anyway
+    return np.round(np.asarray(values, dtype=np.float64), CHART_CONFIG["decimals"])
+
+
+@lru_cache(maxsize=64)
+def _empty_figure(symbol, title, template):
+    """Styled stock chart without data, as a figure dict"""
+    fig = make_subplots(
+        rows=3, cols=1,
+        shared_xaxes=True,
+        vertical_spacing=0.05,
+        subplot_titles=(f'{symbol} Stock Price', 'Volume', 'RSI'),
+        row_heights=[0.6, 0.2, 0.2]
+    )
+
+    # Candlestick chart
+    fig.add_trace(
+        go.Candlestick(name='Price', increasing_line_color='#00ff00', decreasing_line_color='#ff0000'),
+        row=1, col=1
+    )
+
+    # Moving averages
+    fig.add_trace(go.Scatter(mode='lines', name=MA_SHORT, line=dict(color='orange', width=1)), row=1, col=1)
+    fig.add_trace(go.Scatter(mode='lines', name=MA_LONG, line=dict(color='blue', width=1)), row=1, col=1)
+
+    # Bollinger Bands
+    fig.add_trace(
+        go.Scatter(mode='lines', name='BB Upper', line=dict(color='gray', width=1, dash='dash'), showlegend=False),
+        row=1, col=1
+    )
+    fig.add_trace(
+        go.Scatter(
+            mode='lines',
+            name='BB Lower',
+            line=dict(color='gray', width=1, dash='dash'),
+            fill='tonexty',
+            fillcolor='rgba(128,128,128,0.1)',
+            showlegend=False
+        ),
+        row=1, col=1
+    )
+
+    # Volume
+    fig.add_trace(go.Bar(name='Volume', opacity=0.7), row=2, col=1)
+
+    # RSI with overbought/oversold lines
+    fig.add_trace(go.Scatter(mode='lines', name='RSI', line=dict(color='purple', width=2)), row=3, col=1)
+    fig.add_hline(y=70, line_dash="dash", line_color="red", row=3, col=1)
+    fig.add_hline(y=30, line_dash="dash", line_color="green", row=3, col=1)
+
+    fig.update_layout(
+        title=title,
+        xaxis_rangeslider_visible=False,
+        height=CHART_CONFIG["height"],
+        showlegend=CHART_CONFIG["show_legend"],
+        template=template or CHART_CONFIG["template"]
+    )
+    return fig.to_dict()
+
+
+class StockChart:
+    """Candlestick, indicator, volume and RSI figure for one symbol, updated in place"""
+
+    def __init__(self, symbol, title=None, template=None):
+        self.key = (symbol, title or symbol, template)
+        # The cached dict was validated when it was built, so skip validating the copy
+        self.figure = go.Figure(copy.deepcopy(_empty_figure(*self.key)), _validate=False)
+        self.frame = None
+        self.version = None
+
+    def update(self, df):
+        """Draw df, extending the previous frame's traces when df only adds or revises its last bars"""
+        if df is None or df.empty:
+            return None
+
+        version = frame_version(df)
+        if version == self.version:
+            return self.figure
+
+        symbol = self.key[0]
+        with metrics.span("indicators", symbol=symbol, path="chart"):
+            frame = self._extend(df) if self.frame is not None else None
+            if frame is None:
+                # Shallow copy: indicator columns go on our frame, the shared data is not copied
+                frame = calculate_indicators(df.copy(deep=False))
+        with metrics.span("figure", symbol=symbol):
+            self._fill(frame)
+        self.frame, self.version = frame, version
+        return self.figure
+
+    def _extend(self, df):
+        # Rows of df before the last drawn bar must match what is drawn;
+        # from that bar on everything is new or a revision
+        previous = self.frame
+        start = int(df.index.searchsorted(previous.index[-1]))
+        if start == 0:
+            return None
+        kept = previous.iloc[previous.index.searchsorted(df.index[0]):len(previous) - 1]
+        if (len(kept) != start or not kept.index.equals(df.index[:start])
+                or not np.array_equal(kept['Close'].to_numpy(), df['Close'].to_numpy()[:start])):
+            return None
+
+        lookback = indicator_lookback()
+        tail_start = 0 if lookback is None else max(0, start - lookback)
+        tail = calculate_indicators(df.iloc[tail_start:].copy(deep=False)).iloc[start - tail_start:]
+        return pd.concat([kept, tail])
+
+    def _fill(self, frame):
+        # Long ranges are downsampled so every trace stays under the point cap
+        max_points = CHART_CONFIG["max_points"]
+        candles = resample_ohlc(frame, max_points)
+        data = self.figure.data
+        with self.figure.batch_update():
+            data[PRICE_TRACE].update(
+                x=candles.index,
+                open=_rounded(candles['Open']),
+                high=_rounded(candles['High']),
+                low=_rounded(candles['Low']),
+                close=_rounded(candles['Close'])
+            )
+            data[VOLUME_TRACE].update(
+                x=candles.index,
+                y=candles['Volume'].to_numpy(),
+                marker_color=candle_colors(candles)
+            )
+
+            for trace, column in LINE_TRACES.items():
+                values = frame[column].to_numpy()
+                # The lower band reuses the upper band's points so the fill between them lines up
+                if trace != BB_LOWER_TRACE:
+                    kept = lttb_indices(values, max_points)
+                data[trace].update(x=frame.index[kept], y=_rounded(values[kept]))
+
+
+def metric_cards(df):
+    """Current price, volume and range of a frame as st.metric keyword arguments, one dict per card"""
+    current_price = df['Close'].iloc[-1]
+    previous_price = df['Close'].iloc[-2] if len(df) > 1 else current_price
+    price_change = current_price - previous_price
+    price_change_pct = (price_change / previous_price) * 100 if previous_price != 0 else 0
+
+    # 52-week high/low from the available data
+    return [
+        dict(label="Current Price", value=f"${current_price:.2f}",
+             delta=f"{price_change:.2f} ({price_change_pct:.2f}%)",
+             delta_color="normal" if price_change >= 0 else "inverse"),
+        dict(label="Volume", value=f"{df['Volume'].iloc[-1]:,.0f}", delta=None),
+        dict(label="52W High", value=f"${df['High'].max():.2f}", delta=None),
+        dict(label="52W Low", value=f"${df['Low'].min():.2f}", delta=None),
+    ]
+
+
+def performance_chart(curves, template=None):
+    """One line per symbol of {symbol: closes rebased to 100}"""
+    fig = go.Figure()
+    for symbol, curve in curves.items():
+        fig.add_trace(go.Scatter(x=curve.index, y=curve, mode='lines', name=symbol, line=dict(width=2)))
+
+    fig.update_layout(
+        title="Portfolio Performance Comparison (Normalized to 100)",
+        xaxis_title="Date",
+        yaxis_title="Performance (%)",
+        template=template or CHART_CONFIG["template"]
+    )
+    return fig
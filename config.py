@@ -14,11 +14,100 @@ AUTO_REFRESH_CONFIG = {
     "enabled_by_default": True
 }
 
+# Background ingestion settings
+INGESTION_CONFIG = {
+    "poll_interval": 30,       # seconds between upstream polls of a symbol
+    "idle_expiry": 600,        # stop polling symbols no session has read for this long
+    "first_load_timeout": 5,   # seconds a session waits for a newly tracked symbol
+    "symbols": ["^NSEI", "^BSESN", "^NSEBANK", "^CNXIT"],  # always polled
+    "periods": ["1d"]
+}
+
+# Streaming quote feed settings (see replay_server.py for a local tick server)
+STREAMING_CONFIG = {
+    "enabled_by_default": False,
+    "host": "127.0.0.1",
+    "port": 8765,
+    "publish_interval": 0.25,  # seconds between merges of streamed bars into the store
+    "refresh_interval": 1,     # seconds between chart refreshes while streaming
+    "connect_timeout": 5,
+    "replay_tick_rate": 20     # synthetic ticks per second per symbol
+}
+
+# Tick-to-bar aggregation settings for streaming mode
+AGGREGATION_CONFIG = {
+    # timeframe -> seconds per bar, aligned to exchange-local time
+    "timeframes": {"1m": 60, "5m": 300, "15m": 900, "1h": 3600, "1D": 86400},
+    "ring_size": 400,                  # completed bars kept in memory per symbol and timeframe
+    "history_path": "data/intraday",   # completed intraday bars, one history store per timeframe
+    "flush_timeframes": ["1m", "5m", "15m", "1h"],
+    "chart_timeframe": "5m"            # bars charted for the 1D period while streaming
+}
+
+# Circuit breaker settings for upstream data sources
+SOURCE_HEALTH_CONFIG = {
+    "failure_threshold": 3,   # consecutive failures before a source is skipped
+    "recovery_timeout": 60,   # seconds an open source waits before a trial call
+    "window": 50              # calls kept for rolling success/latency stats
+}
+
+# Market data cache settings
+CACHE_CONFIG = {
+    "ttl": {                   # seconds an entry stays fresh, per canonical period
+        "1d": 30,
+        "5d": 60,
+        "1mo": 300,
+        "3mo": 900,
+        "6mo": 1800,
+        "1y": 3600,
+        "2y": 6 * 3600,
+        "5y": 24 * 3600
+    },
+    "max_entries": 512,        # process-local LRU size
+    "shared_backend": None,    # None or "sqlite" to share entries across worker processes
+    "sqlite_path": ".cache/market_data.sqlite"
+}
+
+# In-memory series settings for published frames
+SERIES_CONFIG = {
+    # float32 keeps ~7 significant digits: exact to the paisa below 1,00,000
+    "price_dtype": "float32"
+}
+
+# Local OHLCV history store settings
+HISTORY_CONFIG = {
+    "enabled": True,
+    "path": "data/history",        # one directory of column files per symbol
+    "coverage_slack_days": 5       # weekends/holidays tolerated at the start of a period
+}
+
+# Sample data generator settings
+SAMPLE_DATA_CONFIG = {
+    # symbol -> (base price, average daily price change)
+    "symbols": {
+        "RELIANCE": (2500.0, 0.3),
+        "TCS": (3500.0, 0.2),
+        "INFY": (1500.0, 0.15),
+        "HDFCBANK": (1600.0, 0.1),
+        "ICICIBANK": (900.0, 0.2),
+        "SBIN": (600.0, 0.25),
+        "BHARTIARTL": (800.0, 0.1),
+        "ITC": (400.0, 0.05),
+        "WAAENERGIES": (1200.0, 0.4),
+        "CRESTCHM": (80.0, 0.15)
+    },
+    "default": (500.0, 0.1),
+    "daily_volatility": 0.015,            # standard deviation of daily log returns
+    "volume_range": (1000000, 8000000)    # shares per trading day
+}
+
 # Chart settings
 CHART_CONFIG = {
     "height": 800,
     "template": "plotly_white",
-    "show_legend": True
+    "show_legend": True,
+    "decimals": 2,  # Digits kept in chart trace data
+    "max_points": 600  # Points per trace; about the pixel width of a wide-layout chart
 }
 
 # Technical indicators settings
@@ -26,34 +115,94 @@ INDICATORS_CONFIG = {
     "ma_short": 20,  # Short-term moving average
     "ma_long": 50,   # Long-term moving average
     "rsi_period": 14,  # RSI calculation period
+    "rsi_smoothing": "sma",  # "sma" (simple average) or "wilder" (exponential)
     "bb_period": 20,   # Bollinger Bands period
     "bb_std": 2        # Bollinger Bands standard deviation
 }
 
-# Popular stocks with company names
-POPULAR_STOCKS = {
-    "AAPL": "Apple Inc.",
-    "GOOGL": "Alphabet Inc.",
-    "MSFT": "Microsoft Corporation",
-    "AMZN": "Amazon.com Inc.",
-    "TSLA": "Tesla Inc.",
-    "META": "Meta Platforms Inc.",
-    "NVDA": "NVIDIA Corporation",
-    "NFLX": "Netflix Inc.",
-    "JPM": "JPMorgan Chase & Co.",
-    "JNJ": "Johnson & Johnson",
-    "V": "Visa Inc.",
-    "WMT": "Walmart Inc.",
-    "PG": "Procter & Gamble Co.",
-    "UNH": "UnitedHealth Group Inc.",
-    "HD": "Home Depot Inc.",
-    "MA": "Mastercard Inc.",
-    "DIS": "Walt Disney Co.",
-    "PYPL": "PayPal Holdings Inc.",
-    "BAC": "Bank of America Corp.",
-    "ADBE": "Adobe Inc.",
-    "WAAENERGIES.NS": "Waaree Energies Ltd. (India)",
-    "CRESTCHM.NS": "Crestchem Ltd. (India)"
+# Portfolio settings
+PORTFOLIO_CONFIG = {
+    "holdings_path": "data/holdings.csv",  # trade ledger: date,symbol,side,quantity,price
+    "benchmark": "^NSEI",                  # beta is measured against NIFTY 50
+    "risk_period": "1y",                   # daily returns used for volatility, VaR and beta
+    "var_confidence": 0.95,                # one-day VaR confidence level
+    "trading_days": 252                    # annualizes daily volatility
+}
+
+# Market screener settings
+SCREENER_CONFIG = {
+    "bars": 120,            # closes per symbol in a scan (long MA plus RSI warm-up)
+    "cross_lookback": 3,    # MA crossovers within this many bars are reported
+    "rsi_oversold": 30,
+    "rsi_overbought": 70,
+    "top_n": 50             # rows shown in the Screener tab
+}
+
+# Market breadth and index settings
+BREADTH_CONFIG = {
+    "constituents_path": "data/indices.csv",  # index,symbol,weight (approximate free-float weights)
+    # index symbol -> (name, level at the start of the window when no index history is stored)
+    "indices": {
+        "^NSEI": ("NIFTY 50", 24000.0),
+        "^BSESN": ("SENSEX", 80000.0),
+        "^NSEBANK": ("NIFTY BANK", 51000.0),
+        "^CNXIT": ("NIFTY IT", 40000.0)
+    },
+    "period": "1y",     # history kept polled for constituents with real data
+    "poll_interval": 900,  # seconds between constituent polls while no session charts them
+    "lookback": 252,    # bars in the 52-week high/low window
+    "ma_period": 50     # breadth reports the share of symbols above this moving average
+}
+
+# Alert rule engine settings
+ALERTS_CONFIG = {
+    "rules_path": "data/alerts.csv",    # symbol,condition,value
+    "bars": 60,                         # newest bars used for alert indicators
+    "volume_window": 20,                # bars in the average a volume spike is measured against
+    "queue_size": 200,                  # alerts kept for the in-app list
+    "log_path": "data/alerts.jsonl",    # file sink; None disables it
+    "webhook_url": None                 # POST every alert as JSON here (e.g. a chat webhook)
+}
+
+# Strategy backtest settings
+BACKTEST_CONFIG = {
+    "period": "5y",         # history each backtest runs over
+    # strategy -> parameter -> values; every combination is one run
+    "grids": {
+        "ma_crossover": {"short": [5, 10, 15, 20, 25, 30], "long": [40, 50, 60, 80, 100, 150, 200]},
+        "rsi_reversion": {"period": [7, 14, 21], "lower": [20, 25, 30, 35], "upper": [55, 60, 65, 70, 75]},
+        "bollinger": {"period": [10, 15, 20, 25, 30], "std": [1.5, 2.0, 2.5, 3.0]}
+    },
+    "fee_bps": 10,          # cost of every change of position, in basis points
+    "trading_days": 252,    # bars per year for closes without dates (dated closes use their own span)
+    "processes": None,      # backtest worker processes; None uses every CPU
+    "top_n": 50             # runs listed in the Backtest tab
+}
+
+# Hot-path timing settings
+METRICS_CONFIG = {
+    "enabled": True,          # serve Prometheus metrics at http://host:port/metrics
+    "host": "127.0.0.1",
+    "port": 9108,
+    "window": 200,            # latest durations kept per stage and label set for p50/p95
+    # histogram bucket bounds in seconds
+    "buckets": [0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10],
+    "show_panel": False       # sidebar Performance panel on by default
+}
+
+# Popular stocks offered before anything is searched (company names come from the registry)
+POPULAR_STOCKS = [
+    "RELIANCE", "TCS", "INFY", "HDFCBANK", "ICICIBANK", "SBIN", "BHARTIARTL",
+    "ITC", "KOTAKBANK", "AXISBANK", "ASIANPAINT", "MARUTI", "WAAENERGIES",
+    "CRESTCHM", "TATAMOTORS", "HINDUNILVR", "SUNPHARMA", "ULTRACEMCO", "TITAN"
+]
+
+# Symbol registry settings
+SYMBOLS_CONFIG = {
+    "master_path": "data/instruments.csv",  # symbol,name,exchange or an NSE EQUITY_L.csv download
+    "search_limit": 25,        # results offered per search
+    "fuzzy_threshold": 0.5,    # share of query trigrams a fuzzy match must contain
+    "default_symbols": ["RELIANCE"]
 }
 
 # Market indices
@@ -91,5 +240,11 @@ COLORS = {
 API_CONFIG = {
     "cache_ttl": 30,  # Cache time-to-live in seconds
     "max_retries": 3,
-    "timeout": 10
+    "timeout": 10,
+    "backoff_base": 0.5,    # seconds, doubled on every retry
+    "backoff_max": 8,       # upper bound for a single backoff sleep
+    "pool_size": 10,        # keep-alive connections per upstream host
+    "max_per_host": 4,      # concurrent in-flight requests per upstream host
+    "max_concurrency": 8,   # symbols fetched in parallel per batch
+    "batch_timeout": 20     # deadline in seconds for a whole batch
 }
@@ -0,0 +1,71 @@
+"""
+Render-scoped data access for Real-Time Stock Market Dashboard
+
+One script run asks for the same symbols several times: the charts tab with
+the sidebar period, the portfolio tab with "1mo" (twice) and the market
+summary with "1d". RenderDataContext answers each (symbol, period) once per
+run, and serves shorter windows by slicing a longer window that is already
+loaded instead of going back to the cache or the ingestion store.
+"""
+
+import pandas as pd
+
+from data_cache import PERIOD_DAYS, normalize_period
+
+
+# Function to cut a shorter period out of a longer frame
+def slice_period(df, period):
+    """Return the last `period` of df, measured back from its newest bar"""
+    window_start = df.index[-1] - pd.Timedelta(days=PERIOD_DAYS[normalize_period(period)])
+    # Positional slice, so views of shared data stay views
+    return df.iloc[df.index.searchsorted(window_start):]
+
+
+class RenderDataContext:
+    """Per-run memo of (symbol, period) -> (data, info) in front of a batch loader
+
+    Frames are shared by everything drawn in the run, so callers must not
+    modify them in place.
+    """
+
+    def __init__(self, loader):
+        self.loader = loader
+        self.scopes = set()
+        self._frames = {}
+
+    def _covering_frame(self, symbol, period):
+        # Shortest already-loaded window that is at least as long as period
+        candidates = [
+            (PERIOD_DAYS[loaded_period], frame)
+            for (loaded_symbol, loaded_period), frame in self._frames.items()
+            if loaded_symbol == symbol
+            and PERIOD_DAYS[loaded_period] > PERIOD_DAYS[period]
+            and frame[0] is not None and not frame[0].empty
+        ]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda candidate: candidate[0])[1]
+
+    def get_batch(self, symbols, period="1mo"):
+        """Return {symbol: (data, info)}, loading only what this run has not seen"""
+        period = normalize_period(period)
+        missing = []
+
+        for symbol in dict.fromkeys(symbols):
+            if (symbol, period) in self._frames:
+                continue
+            covering = self._covering_frame(symbol, period)
+            if covering is not None:
+                data, info = covering
+                self._frames[(symbol, period)] = (slice_period(data, period), info)
+            else:
+                missing.append(symbol)
+
+        if missing:
+            for symbol, frame in self.loader(missing, period).items():
+                self._frames[(symbol, period)] = frame
+
+        return {symbol: self._frames[(symbol, period)] for symbol in symbols}
+
+    def get(self, symbol, period="1mo"):
+        return self.get_batch([symbol], period)[symbol]
@@ -0,0 +1,236 @@
+"""
+Market data cache for Real-Time Stock Market Dashboard
+
+Entries are keyed by (symbol, canonical period, source mode) so the sidebar
+spelling of a period ("1M") and the fetcher spelling ("1mo") share one entry,
+and sample data can never be served to a session asking for live data; a
+live fetch that fell back to sample data is not cached at all. Each
+period has its own TTL. A process-local LRU sits in front of an optional
+shared SQLite tier so several Streamlit worker processes reuse one fetch.
+"""
+
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from pathlib import Path
+
+from config import CACHE_CONFIG
+from metrics import metrics
+
+# info["source"] of frames that are generated, not fetched; these are never cached or persisted
+SAMPLE_SOURCE = "sample"
+
+# Every spelling of a period used in the UI or by the fetchers
+PERIOD_ALIASES = {
+    "1D": "1d", "1d": "1d",
+    "5D": "5d", "5d": "5d",
+    "1M": "1mo", "1mo": "1mo",
+    "3M": "3mo", "3mo": "3mo",
+    "6M": "6mo", "6mo": "6mo",
+    "1Y": "1y", "1y": "1y",
+    "2Y": "2y", "2y": "2y",
+    "5Y": "5y", "5y": "5y",
+}
+
+# Calendar days covered by each canonical period
+PERIOD_DAYS = {
+    "1d": 1,
+    "5d": 5,
+    "1mo": 30,
+    "3mo": 90,
+    "6mo": 182,
+    "1y": 365,
+    "2y": 730,
+    "5y": 1826,
+}
+
+
+def normalize_period(period):
+    """Map any supported period spelling to its canonical form"""
+    try:
+        return PERIOD_ALIASES[period]
+    except KeyError:
+        raise ValueError(f"Unsupported period: {period!r}") from None
+
+
+def cache_key(symbol, period, mode):
+    """Normalized cache key for a symbol/period in a given source mode"""
+    return (symbol.upper(), normalize_period(period), mode)
+
+
+def period_ttl(period):
+    """Seconds an entry for this period stays fresh"""
+    return CACHE_CONFIG["ttl"][normalize_period(period)]
+
+
+class MemoryCache:
+    """Process-local LRU cache of (value, expires_at) entries"""
+
+    def __init__(self, max_entries=None):
+        self.max_entries = max_entries or CACHE_CONFIG["max_entries"]
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[1] <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, value, expires_at):
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class SQLiteCache:
+    """On-disk cache shared by every process on the host"""
+
+    def __init__(self, path=None):
+        self.path = Path(path or CACHE_CONFIG["sqlite_path"])
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS market_cache "
+                "(key TEXT PRIMARY KEY, expires_at REAL NOT NULL, value BLOB NOT NULL)"
+            )
+
+    def _connect(self):
+        # sqlite3 connections must not be shared across threads
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _encode_key(key):
+        return "|".join(key)
+
+    def get(self, key):
+        row = self._connect().execute(
+            "SELECT value, expires_at FROM market_cache WHERE key = ? AND expires_at > ?",
+            (self._encode_key(key), time.time())
+        ).fetchone()
+        if row is None:
+            return None
+        return pickle.loads(row[0]), row[1]
+
+    def set(self, key, value, expires_at):
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO market_cache (key, expires_at, value) VALUES (?, ?, ?)",
+                (self._encode_key(key), expires_at, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+            )
+
+    def purge_expired(self):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM market_cache WHERE expires_at <= ?", (time.time(),))
+
+
+class SingleFlight:
+    """Collapse concurrent calls for the same key into one in-flight call"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fn):
+        """Run fn() unless a call for key is already running, in which case wait for its result"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = Future()
+
+        if not leader:
+            return call.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            call.set_exception(e)
+            raise
+        else:
+            call.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+
+class MarketDataCache:
+    """Two-tier (local LRU + optional shared) cache of (data, info) results"""
+
+    def __init__(self, local=None, shared=None):
+        self.local = local or MemoryCache()
+        self.shared = shared
+        self._in_flight = SingleFlight()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_config(cls):
+        shared = SQLiteCache() if CACHE_CONFIG["shared_backend"] == "sqlite" else None
+        return cls(shared=shared)
+
+    def get(self, symbol, period, mode):
+        """Return a cached (data, info) or None"""
+        key = cache_key(symbol, period, mode)
+
+        entry = self.local.get(key)
+        if entry is None and self.shared is not None:
+            entry = self.shared.get(key)
+            if entry is not None:
+                # Promote into the local tier for the rest of its lifetime
+                self.local.set(key, *entry)
+
+        if entry is None:
+            self.misses += 1
+            metrics.increment("cache_requests", mode=mode, result="miss")
+            return None
+        self.hits += 1
+        metrics.increment("cache_requests", mode=mode, result="hit")
+        return entry[0]
+
+    def set(self, symbol, period, mode, value):
+        """Cache (data, info) for the period's TTL, unless it is a sample fallback"""
+        if value[1].get("source") == SAMPLE_SOURCE:
+            # Upstream failed; the next request should try it again
+            return
+        key = cache_key(symbol, period, mode)
+        expires_at = time.time() + period_ttl(period)
+        self.local.set(key, value, expires_at)
+        if self.shared is not None:
+            self.shared.set(key, value, expires_at)
+
+    def get_or_fetch(self, symbol, period, mode, fetch):
+        """Return the cached (data, info) or call fetch() and cache a non-empty result
+
+        Concurrent misses for the same key wait for a single fetch() call.
+        """
+        value = self.get(symbol, period, mode)
+        if value is not None:
+            return value
+
+        # Sessions missing the same key at the same time share one upstream call
+        return self._in_flight.do(cache_key(symbol, period, mode), lambda: self._fetch(symbol, period, mode, fetch))
+
+    def _fetch(self, symbol, period, mode, fetch):
+        value = fetch()
+        data = value[0]
+        if data is not None and not data.empty:
+            self.set(symbol, period, mode, value)
+        return value
@@ -0,0 +1,79 @@
+"""
+Chart downsampling for Real-Time Stock Market Dashboard
+
+A chart cannot show more bars than it has pixels, so long ranges are reduced
+before they are sent to the browser. Candles and volume are aggregated into
+coarser OHLCV buckets (aligned to the newest bar, so the latest bucket is
+the one that changes), and line overlays are reduced with
+Largest-Triangle-Three-Buckets, which keeps the visual shape of a series
+with a fixed number of its own points.
+"""
+
+import math
+
+import numpy as np
+import pandas as pd
+
+
+def bucket_starts(length, max_points):
+    """Start positions of at most max_points equal buckets, the first one possibly shorter"""
+    size = math.ceil(length / max_points)
+    if size <= 1:
+        return np.arange(length)
+    return np.unique(np.r_[0, np.arange(length % size, length, size)])
+
+
+def resample_ohlc(df, max_points):
+    """Aggregate OHLCV bars into at most max_points buckets, indexed by each bucket's first bar"""
+    if len(df) <= max_points:
+        return df
+
+    starts = bucket_starts(len(df), max_points)
+    ends = np.r_[starts[1:], len(df)] - 1
+    return pd.DataFrame({
+        'Open': df['Open'].to_numpy()[starts],
+        'High': np.maximum.reduceat(df['High'].to_numpy(), starts),
+        'Low': np.minimum.reduceat(df['Low'].to_numpy(), starts),
+        'Close': df['Close'].to_numpy()[ends],
+        'Volume': np.add.reduceat(df['Volume'].to_numpy(), starts),
+    }, index=df.index[starts])
+
+
+def lttb_indices(y, max_points, x=None):
+    """Positions of the points Largest-Triangle-Three-Buckets keeps from y
+
+    NaN points (indicator warm-up) are dropped first; the first and last
+    valid points are always kept.
+    """
+    y = np.asarray(y, dtype=np.float64)
+    valid = np.flatnonzero(~np.isnan(y))
+    if len(valid) <= max_points or max_points < 3:
+        return valid
+
+    xs = (valid if x is None else np.asarray(x, dtype=np.float64)[valid]).astype(np.float64)
+    ys = y[valid]
+
+    # Interior points split into max_points - 2 buckets between the fixed ends;
+    # bucket averages are computed up front, the point choice is sequential
+    edges = np.linspace(1, len(ys) - 1, max_points - 1).astype(np.int64)
+    widths = np.diff(edges)
+    avg_x = np.r_[np.add.reduceat(xs, edges[:-1]) / widths, xs[-1]].tolist()
+    avg_y = np.r_[np.add.reduceat(ys, edges[:-1]) / widths, ys[-1]].tolist()
+    edges = edges.tolist()
+    xs, ys = xs.tolist(), ys.tolist()
+
+    kept = [0]
+    previous = 0
+    for bucket in range(max_points - 2):
+        # Triangle with the previously kept point and the next bucket's average
+        px, py = xs[previous], ys[previous]
+        nx, ny = avg_x[bucket + 1], avg_y[bucket + 1]
+        best_area = -1.0
+        for i in range(edges[bucket], edges[bucket + 1]):
+            area = abs((px - nx) * (ys[i] - py) - (px - xs[i]) * (ny - py))
+            if area > best_area:
+                best_area, previous = area, i
+        kept.append(previous)
+    kept.append(len(ys) - 1)
+
+    return valid[kept]
@@ -0,0 +1,217 @@
+"""
+Local columnar OHLCV history store for Real-Time Stock Market Dashboard
+
+Each symbol is a directory holding one flat binary file per column
+(timestamp, open, high, low, close, volume). Rows are kept in timestamp
+order, appends are plain file appends (backfilling older bars rewrites the
+symbol's files into a fresh directory swapped in by rename), and reads
+memory-map the files and
+slice them with a binary search on the timestamp column, so range reads for
+any sidebar period touch only the pages they need and copy nothing until a
+DataFrame is requested.
+"""
+
+import os
+import shutil
+import threading
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from config import HISTORY_CONFIG
+from data_cache import PERIOD_DAYS, normalize_period
+
+# On-disk column layout: file stem -> (DataFrame column, dtype)
+COLUMNS = {
+    "timestamp": (None, np.dtype("<i8")),
+    "open": ("Open", np.dtype("<f8")),
+    "high": ("High", np.dtype("<f8")),
+    "low": ("Low", np.dtype("<f8")),
+    "close": ("Close", np.dtype("<f8")),
+    "volume": ("Volume", np.dtype("<i8")),
+}
+
+
+class HistoryStore:
+    """Append-only, memory-mapped OHLCV columns per symbol"""
+
+    def __init__(self, root=None):
+        self.root = Path(root or HISTORY_CONFIG["path"])
+        self._lock = threading.Lock()
+
+    def _path(self, symbol, column):
+        return self.root / symbol.upper() / f"{column}.bin"
+
+    def _length(self, symbol):
+        # Columns are written before the timestamp, so the shortest file is
+        # the number of complete rows even while a writer is mid-append
+        lengths = []
+        for column, (_, dtype) in COLUMNS.items():
+            path = self._path(symbol, column)
+            if not path.exists():
+                return 0
+            lengths.append(path.stat().st_size // dtype.itemsize)
+        return min(lengths)
+
+    def symbols(self):
+        """Symbols with stored history"""
+        if not self.root.exists():
+            return []
+        return sorted(p.name for p in self.root.iterdir() if p.is_dir() and not p.name.startswith("."))
+
+    def read_arrays(self, symbol, start=None, end=None):
+        """Zero-copy memmap slices {column: array} for rows with start <= ts <= end"""
+        length = self._length(symbol)
+        if length == 0:
+            return None
+
+        arrays = {
+            column: np.memmap(self._path(symbol, column), dtype=dtype, mode="r", shape=(length,))
+            for column, (_, dtype) in COLUMNS.items()
+        }
+        timestamps = arrays["timestamp"]
+        lo = 0 if start is None else np.searchsorted(timestamps, pd.Timestamp(start).value, side="left")
+        hi = length if end is None else np.searchsorted(timestamps, pd.Timestamp(end).value, side="right")
+        return {column: array[lo:hi] for column, array in arrays.items()}
+
+    def stamp(self, symbol, columns=("timestamp", "close")):
+        """Change marker for some of a symbol's columns (file sizes and modification times), or None"""
+        try:
+            stats = [self._path(symbol, column).stat() for column in columns]
+        except FileNotFoundError:
+            return None
+        return tuple((stat.st_size, stat.st_mtime_ns) for stat in stats)
+
+    def read_tail(self, symbol, bars, columns=("timestamp", "close")):
+        """Copies of the newest `bars` rows of some columns {column: array}, or None
+
+        Reads just those bytes without memory-mapping, which is cheaper than
+        read_arrays() when many symbols are read once.
+        """
+        length = self._length(symbol)
+        if length == 0:
+            return None
+
+        rows = min(bars, length)
+        arrays = {}
+        for column in columns:
+            dtype = COLUMNS[column][1]
+            arrays[column] = np.fromfile(self._path(symbol, column), dtype=dtype, count=rows,
+                                         offset=(length - rows) * dtype.itemsize)
+        return arrays
+
+    def read(self, symbol, start=None, end=None):
+        """OHLCV DataFrame for rows with start <= ts <= end, or None"""
+        arrays = self.read_arrays(symbol, start, end)
+        if arrays is None or len(arrays["timestamp"]) == 0:
+            return None
+
+        index = pd.DatetimeIndex(arrays["timestamp"].view("datetime64[ns]"))
+        return pd.DataFrame(
+            {name: arrays[column] for column, (name, _) in COLUMNS.items() if name},
+            index=index
+        )
+
+    def read_period(self, symbol, period):
+        """The last `period` of stored history, measured back from the newest bar"""
+        arrays = self.read_arrays(symbol)
+        if arrays is None:
+            return None
+        last = pd.Timestamp(int(arrays["timestamp"][-1]))
+        return self.read(symbol, start=last - pd.Timedelta(days=PERIOD_DAYS[normalize_period(period)]))
+
+    def covers(self, symbol, period, slack_days=None):
+        """True if stored history reaches back far enough for the whole period"""
+        arrays = self.read_arrays(symbol)
+        if arrays is None:
+            return False
+        slack = slack_days if slack_days is not None else HISTORY_CONFIG["coverage_slack_days"]
+        first, last = int(arrays["timestamp"][0]), int(arrays["timestamp"][-1])
+        span = pd.Timedelta(days=PERIOD_DAYS[normalize_period(period)] - slack)
+        return last - first >= span.value
+
+    def append(self, symbol, df):
+        """Persist bars older than the first or newer than the last stored one; returns rows written
+
+        A bar at the last stored timestamp replaces it. Bars inside the stored
+        range are left alone.
+        """
+        if df is None or df.empty:
+            return 0
+
+        df = df.sort_index()
+        timestamps = pd.DatetimeIndex(df.index).as_unit("ns").asi8
+        with self._lock:
+            length = self._length(symbol)
+            (self.root / symbol.upper()).mkdir(parents=True, exist_ok=True)
+            self._truncate(symbol, length)
+
+            backfilled = 0
+            if length:
+                first = int(np.memmap(self._path(symbol, "timestamp"), dtype=COLUMNS["timestamp"][1],
+                                      mode="r", shape=(length,))[0])
+                backfilled = int(np.searchsorted(timestamps, first, side="left"))
+                if backfilled:
+                    self._prepend(symbol, df.iloc[:backfilled], timestamps[:backfilled], length)
+                    length += backfilled
+
+            start = 0
+            if length:
+                last = int(np.memmap(self._path(symbol, "timestamp"), dtype=COLUMNS["timestamp"][1],
+                                     mode="r", shape=(length,))[-1])
+                start = int(np.searchsorted(timestamps, last, side="left"))
+                if start < len(timestamps) and timestamps[start] == last:
+                    # Revision of the newest stored bar: overwrite it in place
+                    self._write_row(symbol, df, timestamps, start, offset_row=length - 1)
+                    start += 1
+
+            rows = len(timestamps) - start
+            if rows > 0:
+                for column, (name, dtype) in COLUMNS.items():
+                    if column == "timestamp":
+                        continue
+                    self._append_column(symbol, column, df[name].fillna(0).to_numpy(dtype=dtype)[start:])
+                # Timestamp last, so readers never see a row before all its columns exist
+                self._append_column(symbol, "timestamp", timestamps[start:].astype(COLUMNS["timestamp"][1]))
+            return backfilled + rows
+
+    def _prepend(self, symbol, df, timestamps, length):
+        # Write old bars + stored rows into a sibling directory and swap it in,
+        # so readers see the old columns, briefly none, or the new ones, never a mix
+        directory = self.root / symbol.upper()
+        staging = self.root / f".{symbol.upper()}.backfill"
+        retired = self.root / f".{symbol.upper()}.old"
+        for path in (staging, retired):
+            shutil.rmtree(path, ignore_errors=True)
+        staging.mkdir(parents=True)
+
+        for column, (name, dtype) in COLUMNS.items():
+            older = timestamps if column == "timestamp" else df[name].fillna(0).to_numpy(dtype=dtype)
+            stored = np.fromfile(self._path(symbol, column), dtype=dtype, count=length)
+            with open(staging / f"{column}.bin", "wb") as f:
+                f.write(np.ascontiguousarray(older, dtype=dtype).tobytes())
+                f.write(stored.tobytes())
+
+        os.replace(directory, retired)
+        os.replace(staging, directory)
+        shutil.rmtree(retired, ignore_errors=True)
+
+    def _truncate(self, symbol, length):
+        # Drop any partial tail left by an interrupted append so columns stay aligned
+        for column, (_, dtype) in COLUMNS.items():
+            path = self._path(symbol, column)
+            if path.exists() and path.stat().st_size > length * dtype.itemsize:
+                with open(path, "r+b") as f:
+                    f.truncate(length * dtype.itemsize)
+
+    def _append_column(self, symbol, column, values):
+        with open(self._path(symbol, column), "ab") as f:
+            f.write(np.ascontiguousarray(values).tobytes())
+
+    def _write_row(self, symbol, df, timestamps, row, offset_row):
+        for column, (name, dtype) in COLUMNS.items():
+            value = timestamps[row] if column == "timestamp" else df[name].iloc[row]
+            with open(self._path(symbol, column), "r+b") as f:
+                f.seek(offset_row * dtype.itemsize)
+                f.write(np.asarray([value], dtype=dtype).tobytes())
@@ -0,0 +1,108 @@
+"""
+Shared HTTP transport for the NSE/BSE/MoneyControl scrapers
+
+Every host gets one pooled requests.Session so connections (and their TLS
+handshakes) are reused across symbols, sessions and ingestion cycles. Requests
+are retried with jittered exponential backoff and capped per host so a batch
+cannot open more concurrent connections than the upstream tolerates.
+"""
+
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config import API_CONFIG
+
+# Browser-like headers sent with every scrape
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Accept-Encoding': 'gzip, deflate',
+    'Connection': 'keep-alive',
+}
+
+# Responses worth retrying; anything else is returned to the caller as-is
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+_lock = threading.Lock()
+_sessions = {}
+_host_limits = {}
+
+
+def get_session(host):
+    """Return the pooled session for a host, creating it on first use"""
+    with _lock:
+        session = _sessions.get(host)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(DEFAULT_HEADERS)
+
+            # Retries are handled in get() so they can back off with jitter
+            adapter = HTTPAdapter(
+                pool_connections=1,
+                pool_maxsize=API_CONFIG["pool_size"],
+                max_retries=0
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+
+            _sessions[host] = session
+            _host_limits[host] = threading.BoundedSemaphore(API_CONFIG["max_per_host"])
+        return session
+
+
+def backoff_delay(attempt, retry_after=None):
+    """Full-jitter exponential backoff, honouring a server Retry-After hint"""
+    ceiling = min(API_CONFIG["backoff_max"], API_CONFIG["backoff_base"] * (2 ** attempt))
+    delay = random.uniform(0, ceiling)
+    if retry_after is not None:
+        delay = max(delay, min(retry_after, API_CONFIG["backoff_max"]))
+    return delay
+
+
+def _retry_after_seconds(response):
+    value = response.headers.get("Retry-After")
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def get(url, **kwargs):
+    """GET through the host's pooled session with retries and a per-host concurrency cap"""
+    host = urlsplit(url).netloc
+    session = get_session(host)
+    limit = _host_limits[host]
+    kwargs.setdefault("timeout", API_CONFIG["timeout"])
+    max_retries = API_CONFIG["max_retries"]
+
+    for attempt in range(max_retries + 1):
+        retry_after = None
+        try:
+            with limit:
+                response = session.get(url, **kwargs)
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt == max_retries:
+                raise
+        else:
+            if response.status_code not in RETRY_STATUS_CODES or attempt == max_retries:
+                return response
+            retry_after = _retry_after_seconds(response)
+            # Release the connection back to the pool before sleeping
+            response.close()
+
+        time.sleep(backoff_delay(attempt, retry_after))
+
+
+def close_all():
+    """Close every pooled session (used on shutdown and in benchmarks)"""
+    with _lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+        _host_limits.clear()
@@ -0,0 +1,278 @@
+"""
+Technical indicators for Real-Time Stock Market Dashboard
+
+calculate_indicators() is the vectorized batch path used when a chart is
+drawn from a full frame. IndicatorState keeps the running sums, sliding
+mean/variance and RSI smoothing state for one symbol so a new (or revised)
+bar updates every indicator in O(1), independent of history length.
+IndicatorEngine holds one state per symbol and period for the live
+ingestion path, whose latest values feed the alert rules.
+Window sizes come from INDICATORS_CONFIG.
+"""
+
+import math
+import threading
+from collections import deque
+
+import numpy as np
+
+from config import INDICATORS_CONFIG
+
+# Indicator column names, derived from the configured windows
+MA_SHORT = f"MA{INDICATORS_CONFIG['ma_short']}"
+MA_LONG = f"MA{INDICATORS_CONFIG['ma_long']}"
+INDICATOR_COLUMNS = [MA_SHORT, MA_LONG, "RSI", "BB_middle", "BB_upper", "BB_lower"]
+
+
+# Function to calculate technical indicators
+def calculate_indicators(df, config=None):
+    """Calculate technical indicators"""
+    if df is None or df.empty:
+        return df
+
+    config = config or INDICATORS_CONFIG
+    close = df['Close']
+
+    # Moving averages
+    ma_short = close.rolling(window=config["ma_short"]).mean()
+    df[f"MA{config['ma_short']}"] = ma_short
+    df[f"MA{config['ma_long']}"] = close.rolling(window=config["ma_long"]).mean()
+
+    # RSI
+    delta = close.diff()
+    gain = delta.where(delta > 0, 0)
+    loss = -delta.where(delta < 0, 0)
+    if config["rsi_smoothing"] == "wilder":
+        alpha = 1 / config["rsi_period"]
+        gain = gain.ewm(alpha=alpha, min_periods=config["rsi_period"], adjust=False).mean()
+        loss = loss.ewm(alpha=alpha, min_periods=config["rsi_period"], adjust=False).mean()
+    else:
+        gain = gain.rolling(window=config["rsi_period"]).mean()
+        loss = loss.rolling(window=config["rsi_period"]).mean()
+    rs = gain / loss
+    df['RSI'] = 100 - (100 / (1 + rs))
+
+    # Bollinger Bands (reuse the short MA when the windows match)
+    if config["bb_period"] == config["ma_short"]:
+        bb_middle = ma_short
+    else:
+        bb_middle = close.rolling(window=config["bb_period"]).mean()
+    bb_std = close.rolling(window=config["bb_period"]).std()
+    df['BB_middle'] = bb_middle
+    df['BB_upper'] = bb_middle + (bb_std * config["bb_std"])
+    df['BB_lower'] = bb_middle - (bb_std * config["bb_std"])
+
+    return df
+
+
+class RollingWindow:
+    """Fixed-size window with O(1) sliding mean and sample variance"""
+
+    __slots__ = ("size", "values", "mean", "m2")
+
+    def __init__(self, size):
+        self.size = size
+        self.values = deque()
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    @property
+    def full(self):
+        return len(self.values) == self.size
+
+    def push(self, x):
+        """Add a value, returning the one that slid out (or None)"""
+        evicted = None
+        if self.full:
+            evicted = self.values.popleft()
+            old_mean = self.mean
+            self.mean += (x - evicted) / self.size
+            self.m2 += (x - evicted) * (x - self.mean + evicted - old_mean)
+        else:
+            n = len(self.values) + 1
+            delta = x - self.mean
+            self.mean += delta / n
+            self.m2 += delta * (x - self.mean)
+        self.values.append(x)
+        return evicted
+
+    def undo(self, evicted):
+        """Reverse the last push, given the value it evicted"""
+        x = self.values.pop()
+        if evicted is not None:
+            self.values.appendleft(evicted)
+            old_mean = self.mean
+            self.mean += (evicted - x) / self.size
+            self.m2 += (evicted - x) * (evicted - self.mean + x - old_mean)
+        else:
+            n = len(self.values)
+            if n == 0:
+                self.mean, self.m2 = 0.0, 0.0
+            else:
+                old_mean = self.mean
+                self.mean = (old_mean * (n + 1) - x) / n
+                self.m2 -= (x - self.mean) * (x - old_mean)
+
+    def std(self):
+        """Sample standard deviation (ddof=1, like pandas)"""
+        if not self.full or self.size < 2:
+            return math.nan
+        return math.sqrt(max(self.m2, 0.0) / (self.size - 1))
+
+
+class IndicatorState:
+    """Streaming indicator state for one symbol"""
+
+    def __init__(self, config=None):
+        config = config or INDICATORS_CONFIG
+        self.config = config
+        self.ma_short_column = f"MA{config['ma_short']}"
+        self.ma_long_column = f"MA{config['ma_long']}"
+        self.ma_short = RollingWindow(config["ma_short"])
+        self.ma_long = RollingWindow(config["ma_long"])
+        # The Bollinger middle band is the short MA when the windows match
+        self.bb = self.ma_short if config["bb_period"] == config["ma_short"] else RollingWindow(config["bb_period"])
+        self.wilder = config["rsi_smoothing"] == "wilder"
+        self.gains = RollingWindow(config["rsi_period"])
+        self.losses = RollingWindow(config["rsi_period"])
+        self.avg_gain = None
+        self.avg_loss = None
+        self.observations = 0
+        self.prev_close = None
+        self.last_timestamp = None
+        self.values = self._compute()
+        self._undo = None
+
+    def _windows(self):
+        windows = [self.ma_short, self.ma_long, self.gains, self.losses]
+        if self.bb is not self.ma_short:
+            windows.append(self.bb)
+        return windows
+
+    def update(self, close, timestamp=None):
+        """Apply a new bar, or revise the latest one if timestamp repeats it"""
+        if timestamp is not None and timestamp == self.last_timestamp and self._undo is not None:
+            self._rollback()
+
+        close = float(close)
+        prev_close = self.prev_close
+        change = 0.0 if prev_close is None else close - prev_close
+        gain, loss = max(change, 0.0), max(-change, 0.0)
+
+        # Remember enough to undo this bar if it gets revised
+        undo = {
+            "prev_close": prev_close,
+            "avg_gain": self.avg_gain,
+            "avg_loss": self.avg_loss,
+            "observations": self.observations,
+            "values": dict(self.values),
+            "timestamp": self.last_timestamp,
+        }
+        # Window order matches _windows(): short MA, long MA, gains, losses[, BB]
+        undo["evicted"] = [
+            window.push(value)
+            for window, value in zip(self._windows(), [close, close, gain, loss, close])
+        ]
+        self._undo = undo
+
+        # Wilder smoothing, seeded like pandas ewm(adjust=False) with the first bar
+        self.observations += 1
+        if self.avg_gain is None:
+            self.avg_gain, self.avg_loss = gain, loss
+        else:
+            alpha = 1 / self.config["rsi_period"]
+            self.avg_gain += alpha * (gain - self.avg_gain)
+            self.avg_loss += alpha * (loss - self.avg_loss)
+
+        self.prev_close = close
+        self.last_timestamp = timestamp
+        self.values = self._compute()
+        return self.values
+
+    def _rollback(self):
+        undo = self._undo
+        for window, evicted in zip(self._windows(), undo["evicted"]):
+            window.undo(evicted)
+        self.prev_close = undo["prev_close"]
+        self.avg_gain = undo["avg_gain"]
+        self.avg_loss = undo["avg_loss"]
+        self.observations = undo["observations"]
+        self.values = undo["values"]
+        self.last_timestamp = undo["timestamp"]
+        self._undo = None
+
+    def _compute(self):
+        values = {
+            self.ma_short_column: self.ma_short.mean if self.ma_short.full else math.nan,
+            self.ma_long_column: self.ma_long.mean if self.ma_long.full else math.nan,
+        }
+
+        if self.wilder:
+            ready = self.observations >= self.config["rsi_period"]
+            gain, loss = self.avg_gain, self.avg_loss
+        else:
+            ready = self.gains.full
+            gain, loss = self.gains.mean, self.losses.mean
+        if not ready or (gain == 0 and loss == 0):
+            values["RSI"] = math.nan
+        elif loss == 0:
+            values["RSI"] = 100.0
+        else:
+            values["RSI"] = 100 - (100 / (1 + gain / loss))
+
+        if self.bb.full:
+            middle = self.bb.mean
+            width = self.bb.std() * self.config["bb_std"]
+            values.update(BB_middle=middle, BB_upper=middle + width, BB_lower=middle - width)
+        else:
+            values.update(BB_middle=math.nan, BB_upper=math.nan, BB_lower=math.nan)
+        return values
+
+
+class IndicatorEngine:
+    """Incremental indicator states for every tracked symbol and period"""
+
+    def __init__(self, config=None):
+        self.config = config or INDICATORS_CONFIG
+        self._lock = threading.Lock()
+        self._states = {}
+
+    def _state(self, symbol, period):
+        state = self._states.get((symbol, period))
+        if state is None:
+            state = self._states[(symbol, period)] = IndicatorState(self.config)
+        return state
+
+    def update_frame(self, symbol, period, df):
+        """Feed only the bars at or after the last one seen for symbol/period; return the latest values"""
+        if df is None or df.empty:
+            return self.latest(symbol, period)
+
+        with self._lock:
+            state = self._state(symbol, period)
+            start = 0
+            if state.last_timestamp is not None:
+                start = int(np.searchsorted(df.index.asi8, state.last_timestamp.value, side="left"))
+            timestamps = df.index[start:]
+            closes = df['Close'].to_numpy()[start:]
+            for timestamp, close in zip(timestamps, closes):
+                if state.last_timestamp is not None and timestamp < state.last_timestamp:
+                    continue
+                state.update(close, timestamp)
+            return dict(state.values)
+
+    def update_bar(self, symbol, period, timestamp, close):
+        """Apply a single bar (or a revision of the latest bar) for symbol/period"""
+        with self._lock:
+            return dict(self._state(symbol, period).update(close, timestamp))
+
+    def latest(self, symbol, period):
+        """Latest indicator values for symbol/period, or None if it was never fed"""
+        with self._lock:
+            state = self._states.get((symbol, period))
+            return dict(state.values) if state is not None else None
+
+    def discard(self, symbol, period):
+        """Forget the state of a symbol/period that is no longer tracked"""
+        with self._lock:
+            self._states.pop((symbol, period), None)
@@ -0,0 +1,322 @@
+"""
+Background market-data ingestion for Real-Time Stock Market Dashboard
+
+One worker thread per server process polls the upstream sources on a schedule
+and publishes the latest OHLCV frames into a shared in-memory store. Streamlit
+sessions only read from the store, so render time no longer depends on
+upstream latency and upstream load no longer grows with the number of viewers.
+In streaming mode a StreamingFeed additionally merges live session bars into
+the published frames between polls through apply_bars(). Every batch of
+published frames is also checked against the alert rules, on each symbol's
+longest tracked period, whose indicators the IndicatorEngine keeps up to date.
+"""
+
+import logging
+import threading
+import time
+
+from config import INGESTION_CONFIG
+from data_cache import PERIOD_DAYS, normalize_period
+from market_data import SAMPLE_SOURCE, fetch_batch, get_multi_source_data, update_history
+from metrics import metrics
+from series_store import CompactSeries
+from streaming import STREAM_SOURCE, merge_session_bar
+
+logger = logging.getLogger(__name__)
+
+
+class MarketDataStore:
+    """Thread-safe store holding the latest frame for each (symbol, period)
+
+    Frames are packed into read-only CompactSeries when published; readers
+    get zero-copy DataFrame views and must not modify them in place.
+    """
+
+    def __init__(self):
+        self._published = threading.Condition()
+        self._frames = {}
+
+    def publish(self, symbol, period, data, info):
+        """Replace the stored frame and wake up any waiting readers"""
+        series = CompactSeries.from_frame(data)
+        with self._published:
+            self._frames[(symbol, period)] = (series, info, time.time())
+            self._published.notify_all()
+
+    def get(self, symbol, period):
+        """Return (data, info, updated_at) or None if nothing was published yet"""
+        with self._published:
+            entry = self._frames.get((symbol, period))
+        return self._view(entry)
+
+    def wait_for(self, symbol, period, timeout):
+        """Block until a frame for (symbol, period) is published or timeout expires"""
+        deadline = time.monotonic() + timeout
+        with self._published:
+            while (symbol, period) not in self._frames:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self._published.wait(remaining)
+            entry = self._frames[(symbol, period)]
+        return self._view(entry)
+
+    @staticmethod
+    def _view(entry):
+        if entry is None:
+            return None
+        series, info, updated_at = entry
+        return series.frame(), info, updated_at
+
+    def discard(self, symbol, period):
+        """Drop the stored frame for (symbol, period)"""
+        with self._published:
+            self._frames.pop((symbol, period), None)
+
+
+class IngestionWorker(threading.Thread):
+    """Daemon thread polling tracked symbols and publishing into a MarketDataStore"""
+
+    def __init__(self, store, poll_interval=None, fetch=get_multi_source_data, cache=None, history=None,
+                 indicators=None, alerts=None):
+        super().__init__(name="market-data-ingestion", daemon=True)
+        self.store = store
+        self.poll_interval = poll_interval or INGESTION_CONFIG["poll_interval"]
+        self.fetch = fetch
+        self.cache = cache
+        self.history = history
+        self.indicators = indicators
+        self.alerts = alerts
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        # (symbol, period) -> last time a session read it; None pins the key
+        self._last_read = {}
+        # (symbol, period) -> monotonic time of the next scheduled poll
+        self._next_poll = {}
+        # (symbol, period) -> poll interval of keys kept on a slower schedule while no session reads them
+        self._intervals = {}
+        # symbol -> latest streamed session bar
+        self._live_bars = {}
+
+        for symbol in INGESTION_CONFIG["symbols"]:
+            for period in INGESTION_CONFIG["periods"]:
+                self._last_read[(symbol, period)] = None
+                self._next_poll[(symbol, period)] = 0.0
+
+    def track(self, symbol, period):
+        """Start (or keep) polling a symbol/period pair on behalf of a session"""
+        key = (symbol, period)
+        with self._lock:
+            is_new = key not in self._last_read
+            if is_new or self._last_read[key] is not None or key in self._intervals:
+                if not is_new and self._last_read[key] is None:
+                    # A scheduled key being read again is polled at the normal rate
+                    self._next_poll[key] = min(self._next_poll[key], time.monotonic() + self.poll_interval)
+                self._last_read[key] = time.time()
+            if is_new:
+                self._next_poll[key] = 0.0
+        if is_new:
+            self._wakeup.set()
+
+    def schedule(self, symbols, period, interval):
+        """Keep polling symbol/period pairs every interval seconds without any session reading them
+
+        Sessions that do read one get it at the normal poll interval until they stop.
+        """
+        with self._lock:
+            for symbol in symbols:
+                key = (symbol, period)
+                self._intervals[key] = interval
+                if key not in self._last_read:
+                    self._last_read[key] = None
+                    self._next_poll[key] = 0.0
+        self._wakeup.set()
+
+    def read(self, symbol, period, timeout=None):
+        """Return the latest published (data, info) for a session"""
+        return self.read_many([symbol], period, timeout)[symbol]
+
+    def read_many(self, symbols, period, timeout=None):
+        """Return {symbol: (data, info)}, waiting at most timeout for the whole set"""
+        for symbol in symbols:
+            self.track(symbol, period)
+
+        if timeout is None:
+            timeout = INGESTION_CONFIG["first_load_timeout"]
+        deadline = time.monotonic() + timeout
+
+        results = {}
+        for symbol in symbols:
+            entry = self.store.get(symbol, period)
+            if entry is None:
+                entry = self.store.wait_for(symbol, period, max(deadline - time.monotonic(), 0))
+            if entry is None:
+                results[symbol] = (None, {})
+                continue
+
+            data, info, _ = entry
+            # The frame is a read-only view of data shared by every session
+            results[symbol] = (data, dict(info))
+
+        return results
+
+    def peek(self, symbols, period):
+        """Return {symbol: (data, info)} of what is published, without tracking or waiting"""
+        results = {}
+        for symbol in symbols:
+            entry = self.store.get(symbol, period)
+            results[symbol] = (entry[0], dict(entry[1])) if entry is not None else (None, {})
+        return results
+
+    def stop(self):
+        """Ask the worker loop to exit"""
+        self._stopped.set()
+        self._wakeup.set()
+
+    def run(self):
+        while not self._stopped.is_set():
+            self.poll_once()
+            self._wakeup.wait(self._seconds_until_next_poll())
+            self._wakeup.clear()
+
+    def poll_once(self):
+        """Fetch every key whose poll is due, concurrently per period, and publish the results"""
+        due_by_period = {}
+        for symbol, period in self._due_keys():
+            due_by_period.setdefault(period, []).append(symbol)
+
+        for period, symbols in due_by_period.items():
+            results = fetch_batch(symbols, period, fetch=self._refresh)
+            published = {}
+            for symbol, (data, info) in results.items():
+                if data is not None and not data.empty:
+                    live_bar = self._live_bar(symbol, data.index[-1])
+                    if live_bar is not None:
+                        # A polled bar must not roll back what the stream already saw
+                        data = merge_session_bar(data, live_bar, period)
+                    if self._publish(symbol, period, data, info):
+                        published[symbol] = data
+            self._check_alerts(published)
+
+    def _live_bar(self, symbol, polled_last):
+        # The symbol's streamed session bar, dropped once polled data has a later session
+        with self._lock:
+            bar = self._live_bars.get(symbol)
+            if bar is not None and bar.index[0].normalize() < polled_last.normalize():
+                # The stream stopped or the day rolled over; the poll is newer
+                del self._live_bars[symbol]
+                return None
+            return bar
+
+    def apply_bars(self, bars):
+        """Merge streamed session bars {symbol: one-row frame} into every published period"""
+        with self._lock:
+            self._live_bars.update(bars)
+            keys = [key for key in self._last_read if key[0] in bars]
+
+        published = {}
+        for symbol, period in keys:
+            entry = self.store.get(symbol, period)
+            if entry is None:
+                # Nothing to extend yet; the first poll publishes the history
+                continue
+            history, info, _ = entry
+            data = merge_session_bar(history, bars[symbol], period)
+            if self._publish(symbol, period, data, dict(info, source=STREAM_SOURCE)):
+                published[symbol] = data
+        self._check_alerts(published)
+
+    def _indicator_period(self, symbol):
+        # The longest tracked period has the most bars for indicators
+        with self._lock:
+            periods = [period for tracked, period in self._last_read if tracked == symbol]
+        return max(periods, key=lambda period: PERIOD_DAYS[normalize_period(period)], default=None)
+
+    def _publish(self, symbol, period, data, info):
+        """Publish a frame; True if it is the symbol's indicator period, which alerts are checked on"""
+        self.store.publish(symbol, period, data, info)
+        if period != self._indicator_period(symbol):
+            return False
+        if self.indicators is not None:
+            # Feeds only the bars the engine has not seen yet
+            with metrics.span("indicators", symbol=symbol, path="incremental"):
+                self.indicators.update_frame(symbol, period, data)
+        return True
+
+    def _check_alerts(self, frames):
+        if self.alerts is None or not frames:
+            return
+        latest = None
+        if self.indicators is not None:
+            latest = {symbol: self.indicators.latest(symbol, self._indicator_period(symbol)) for symbol in frames}
+        try:
+            self.alerts.update(frames, latest)
+        except Exception:
+            logger.exception("Alert evaluation failed")
+
+    def _refresh(self, symbol, period):
+        entry = self.store.get(symbol, period)
+        if entry is not None and entry[1].get("source") != SAMPLE_SOURCE:
+            history, history_info = entry[0], entry[1]
+        else:
+            # A published sample fallback is no history: refetch the key as if it were cold
+            history, history_info = self._stored_history(symbol, period), {}
+
+        if history is not None:
+            # Only bars from the last known one onwards can have changed
+            data, info = update_history(history, symbol, period, fetch=self.fetch, history_info=history_info)
+            if self.cache is not None and data is not None and not data.empty:
+                self.cache.set(symbol, period, "live", (data, info))
+        elif self.cache is None:
+            data, info = self.fetch(symbol, period)
+        else:
+            # Cold key: periods with long TTLs (and other processes sharing the cache) skip upstream
+            data, info = self.cache.get_or_fetch(symbol, period, "live", lambda: self.fetch(symbol, period))
+
+        self._persist(symbol, data, info)
+        return data, info
+
+    def _stored_history(self, symbol, period):
+        # Cold start: load the period from disk if it is fully covered
+        if self.history is None or not self.history.covers(symbol, period):
+            return None
+        return self.history.read_period(symbol, period)
+
+    def _persist(self, symbol, data, info):
+        if self.history is None or data is None or data.empty or info.get("source") == SAMPLE_SOURCE:
+            return
+        try:
+            self.history.append(symbol, data)
+        except (OSError, KeyError, ValueError) as e:
+            logger.warning("Could not persist history for %s: %s", symbol, e)
+
+    def _due_keys(self):
+        now = time.monotonic()
+        idle_cutoff = time.time() - INGESTION_CONFIG["idle_expiry"]
+        due = []
+
+        with self._lock:
+            for key, last_read in list(self._last_read.items()):
+                if last_read is not None and last_read < idle_cutoff and key in self._intervals:
+                    # Nobody has looked at this key for a while, fall back to its own schedule
+                    self._last_read[key] = None
+                elif last_read is not None and last_read < idle_cutoff:
+                    # Nobody has looked at this key for a while, stop polling it
+                    del self._last_read[key]
+                    del self._next_poll[key]
+                    self.store.discard(*key)
+                    if self.indicators is not None:
+                        self.indicators.discard(*key)
+                elif self._next_poll[key] <= now:
+                    interval = self._intervals.get(key, self.poll_interval) if last_read is None else self.poll_interval
+                    self._next_poll[key] = now + interval
+                    due.append(key)
+
+        return due
+
+    def _seconds_until_next_poll(self):
+        with self._lock:
+            if not self._next_poll:
+                return self.poll_interval
+            return max(min(self._next_poll.values()) - time.monotonic(), 0.0)
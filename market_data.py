@@ -0,0 +1,354 @@
+"""
+Market data sources for Real-Time Stock Market Dashboard
+
+The fetch chain lives outside app.py so that it can be called both from the
+Streamlit script and from the background ingestion worker, which runs without
+a script context and therefore reports through logging instead of st banners.
+"""
+
+import logging
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+from pandas.tseries.frequencies import to_offset
+
+import http_client
+from config import API_CONFIG, SAMPLE_DATA_CONFIG
+from data_cache import PERIOD_ALIASES, PERIOD_DAYS, SAMPLE_SOURCE, normalize_period
+from metrics import metrics
+from parsers import MARKET_TIMEZONE, parse_bse_quote, parse_udf_history, quote_to_bar
+from source_health import source_health
+from symbols import default_registry, split_suffix
+
+logger = logging.getLogger(__name__)
+
+
+# MoneyControl's chart history endpoint (UDF layout, daily resolution)
+MONEYCONTROL_HISTORY_URL = "https://priceapi.moneycontrol.com/techCharts/indianMarket/stock/history"
+
+
+class SymbolNotFoundError(LookupError):
+    """The source answered but does not list the symbol (not a source outage)"""
+
+
+# Function to create sample data for testing
+def create_sample_data(symbol, period="1mo", interval="1D", end=None, bars=None):
+    """Create sample OHLCV data for testing, benchmarks and when APIs fail
+
+    Prices follow a geometric random walk whose drift and volatility are
+    scaled to the bar interval, so any period (or an explicit number of bars)
+    at any fixed frequency, from minute bars to daily bars, is generated in
+    one vectorized pass. The walk is anchored at the base price on the last
+    bar and drawn backwards from it, with seeds derived from the symbol with
+    CRC32, so every process and every period produces the same recent bars
+    for the same symbol and interval; longer periods only reach further back.
+    """
+    bar_length = pd.Timedelta(to_offset(interval))
+    dt = bar_length / pd.Timedelta(days=1)
+
+    if bars is None:
+        if period in PERIOD_ALIASES:
+            span = pd.Timedelta(days=PERIOD_DAYS[normalize_period(period)])
+        else:
+            span = pd.Timedelta(period)
+        bars = int(span / bar_length) + 1
+
+    end = pd.Timestamp(end) if end is not None else pd.Timestamp.now().floor(bar_length)
+    dates = pd.date_range(end=end, periods=bars, freq=bar_length)
+
+    # Stable per-symbol seeds (hash() changes between processes), one stream per
+    # column so the first n draws of each are the same whatever the bar count
+    streams = np.random.SeedSequence(zlib.crc32(symbol.encode("utf-8"))).spawn(4)
+    close_rng, open_rng, wick_rng, volume_rng = (np.random.default_rng(seed) for seed in streams)
+
+    base_price, trend = SAMPLE_DATA_CONFIG["symbols"].get(symbol, SAMPLE_DATA_CONFIG["default"])
+    drift = (trend / base_price) * dt
+    volatility = SAMPLE_DATA_CONFIG["daily_volatility"] * np.sqrt(dt)
+
+    # Arrays below run newest bar first and are reversed at the end.
+    # Close: the base price on the last bar, undoing log returns going back
+    log_returns = close_rng.normal(drift - 0.5 * volatility ** 2, volatility, bars)
+    previous_close = base_price * np.exp(-np.cumsum(log_returns))
+    close = previous_close * np.exp(log_returns)
+
+    # Open gaps a little away from the previous close
+    open_ = previous_close * np.exp(open_rng.normal(0.0, 0.2 * volatility, bars))
+
+    # High/low extend beyond the open-close body
+    wicks = np.abs(wick_rng.normal(0.0, 0.5 * volatility, (bars, 2)))
+    high = np.maximum(open_, close) * (1 + wicks[:, 0])
+    low = np.minimum(open_, close) * (1 - wicks[:, 1])
+
+    # Volume range is per trading day, scaled down for shorter bars
+    low_volume, high_volume = SAMPLE_DATA_CONFIG["volume_range"]
+    volume = volume_rng.integers(max(int(low_volume * dt), 1), max(int(high_volume * dt), 2), bars)
+
+    open_, high, low, close, volume = (column[::-1] for column in (open_, high, low, close, volume))
+    return pd.DataFrame(
+        {'Open': open_, 'High': high, 'Low': low, 'Close': close, 'Volume': volume},
+        index=dates
+    )
+
+# Source: NSE history through nsepy
+def fetch_nsepy(symbol, period="1mo", start=None):
+    """Fetch NSE history with nsepy, raising if nothing usable comes back"""
+    from nsepy import get_history
+    from datetime import date
+
+    # Remove .NS suffix if present
+    clean_symbol = symbol.replace('.NS', '')
+
+    # Calculate date range
+    end_date = date.today()
+    period = normalize_period(period)
+    if start is not None:
+        start_date = pd.Timestamp(start).date()
+    elif period == "1d":
+        start_date = end_date
+    else:
+        start_date = end_date - timedelta(days=PERIOD_DAYS[period])
+
+    # Fetch data from NSE using nsepy
+    data = get_history(symbol=clean_symbol, start=start_date, end=end_date)
+
+    if data is None or data.empty:
+        raise ValueError(f"nsepy returned no data for {symbol}")
+
+    # nsepy indexes by datetime.date; use timestamps like every other source
+    data.index = pd.to_datetime(data.index)
+    return data, {}
+
+# Source: MoneyControl chart history API
+def fetch_moneycontrol(symbol, period="1mo", start=None):
+    """Fetch daily bars from MoneyControl's chart history endpoint"""
+    clean_symbol = symbol.replace('.NS', '')
+
+    end_time = pd.Timestamp.now(tz=MARKET_TIMEZONE)
+    if start is None:
+        start_time = end_time - pd.Timedelta(days=PERIOD_DAYS[normalize_period(period)])
+    else:
+        start_time = pd.Timestamp(start).tz_localize(MARKET_TIMEZONE)
+
+    response = http_client.get(MONEYCONTROL_HISTORY_URL, params={
+        "symbol": clean_symbol,
+        "resolution": "1D",
+        "from": int(start_time.timestamp()),
+        "to": int(end_time.timestamp()),
+    })
+    if response.status_code == 404:
+        raise SymbolNotFoundError(f"MoneyControl does not list {symbol}")
+    if response.status_code != 200:
+        raise ValueError(f"MoneyControl failed with status code: {response.status_code}")
+
+    data = parse_udf_history(response.content)
+    if data.empty and start is None:
+        raise SymbolNotFoundError(f"MoneyControl has no history for {symbol}")
+    return data, {}
+
+# Source: BSE quote page
+def fetch_bse(symbol, period="1mo", start=None):
+    """Fetch the current session's bar from the BSE quote page (quote only, no history)"""
+    # BSE pages are keyed by scrip code, not by the NSE ticker
+    clean_symbol, _ = split_suffix(default_registry().exchange_symbol(symbol, "BSE"))
+    if not clean_symbol.isdigit():
+        raise SymbolNotFoundError(f"No BSE scrip code is known for {symbol}")
+
+    # BSE URL for stock data
+    url = f"https://www.bseindia.com/stock-share-price/{clean_symbol}"
+
+    response = http_client.get(url)
+    if response.status_code == 404:
+        raise SymbolNotFoundError(f"BSE does not list {symbol}")
+    if response.status_code != 200:
+        raise ValueError(f"BSE failed with status code: {response.status_code}")
+
+    quote = parse_bse_quote(response.content)
+    return quote_to_bar(quote), {"quote": quote}
+
+# Upstream sources in their default order of preference
+SOURCES = {
+    "nsepy": fetch_nsepy,
+    "MoneyControl": fetch_moneycontrol,
+    "BSE": fetch_bse,
+}
+
+# Exchange whose symbols each source expects
+SOURCE_EXCHANGES = {
+    "nsepy": "NSE",
+    "MoneyControl": "NSE",
+    "BSE": "BSE",
+}
+
+# Sources that only know the current session's bar; used for incremental updates
+QUOTE_ONLY_SOURCES = {"BSE"}
+
+# Function to call one source through its circuit breaker
+def fetch_from_source(source_name, symbol, period="1mo", start=None):
+    """Call a source, recording the outcome and latency on its breaker
+
+    Returns (data, info), or (None, {}) when the breaker is open or the call fails.
+    """
+    breaker = source_health.breaker(source_name)
+    if not breaker.allow():
+        logger.info("Skipping %s for %s: circuit %s", source_name, symbol, breaker.state)
+        return None, {}
+
+    # "RELIANCE" -> "RELIANCE.NS" for NSE sources, "500325.BO" for BSE
+    source_symbol = default_registry().exchange_symbol(symbol, SOURCE_EXCHANGES[source_name])
+    started = time.perf_counter()
+    try:
+        data, info = SOURCES[source_name](source_symbol, period, start=start)
+    except SymbolNotFoundError as e:
+        # The source is up, it just has nothing for this symbol
+        elapsed = time.perf_counter() - started
+        breaker.record_success(elapsed)
+        metrics.observe("fetch", elapsed, source=source_name, symbol=symbol, outcome="not_found")
+        logger.info("%s", e)
+        return None, {}
+    except Exception as e:
+        elapsed = time.perf_counter() - started
+        breaker.record_failure(elapsed)
+        metrics.observe("fetch", elapsed, source=source_name, symbol=symbol, outcome="error")
+        logger.warning("%s failed for %s: %s", source_name, symbol, e)
+        return None, {}
+
+    elapsed = time.perf_counter() - started
+    breaker.record_success(elapsed)
+    metrics.observe("fetch", elapsed, source=source_name, symbol=symbol, outcome="ok")
+    logger.info("Data fetched from %s for %s", source_name, symbol)
+    info = dict(info)
+    info.setdefault("source", source_name)
+    return data, info
+
+# Function to get NSE data using alternative sources
+def get_nse_data(symbol, period="1mo"):
+    """Fetch data from NSE using multiple alternative sources"""
+    for source_name in ("nsepy", "MoneyControl"):
+        data, info = fetch_from_source(source_name, symbol, period)
+        if data is not None and not data.empty:
+            return data, info
+
+    logger.info("Using enhanced sample data for %s (real-time data unavailable)", symbol)
+    return create_sample_data(symbol, period), {"source": SAMPLE_SOURCE}
+
+# Function to get BSE data
+def get_bse_data(symbol, period="1mo"):
+    """Fetch data from BSE using web scraping with fallback"""
+    data, info = fetch_from_source("BSE", symbol, period)
+    if data is not None and not data.empty:
+        return data, info
+
+    return create_sample_data(symbol, period), {"source": SAMPLE_SOURCE}
+
+# Function to get TradingView data (simplified)
+def get_tradingview_data(symbol, period="1mo"):
+    """Fetch data from TradingView (simplified implementation)"""
+    try:
+        # TradingView API requires authentication and is complex
+        # This is a placeholder for future implementation
+
+        # For now, return None
+        return None, {}
+
+    except Exception as e:
+        logger.warning("TradingView data fetch failed for %s: %s", symbol, e)
+        return None, {}
+
+# Function to get data from multiple sources
+def get_multi_source_data(symbol, period="1mo", start=None):
+    """Try the healthy sources, fastest first, skipping any with an open circuit
+
+    When start is given, sources that support it only return bars from start on,
+    and quote-only sources become eligible since only the newest bar is needed.
+    """
+    for source_name in source_health.ranked(list(SOURCES)):
+        if start is None and source_name in QUOTE_ONLY_SOURCES:
+            continue
+        data, info = fetch_from_source(source_name, symbol, period, start=start)
+        if data is not None and not data.empty:
+            return data, info
+
+    # Final fallback: always return sample data
+    logger.info("Using sample data for %s as fallback", symbol)
+    return create_sample_data(symbol, period), {"source": SAMPLE_SOURCE}
+
+# Function to merge freshly fetched bars into cached history
+def merge_bars(history, new_bars, period="1mo"):
+    """Append new bars to history, letting them revise bars with the same timestamp
+
+    Only bars at or after the last cached timestamp are taken from new_bars,
+    and the result is trimmed back to the period window.
+    """
+    new_bars = new_bars.loc[new_bars.index >= history.index[-1], history.columns]
+    if new_bars.empty:
+        return history
+
+    # Bars sharing a timestamp with history are revisions of that bar
+    merged = pd.concat([history.loc[history.index < new_bars.index[0]], new_bars])
+    window_start = merged.index[-1] - pd.Timedelta(days=PERIOD_DAYS[normalize_period(period)])
+    return merged.loc[merged.index >= window_start]
+
+# Function to refresh cached history incrementally
+def update_history(history, symbol, period="1mo", fetch=None, history_info=None):
+    """Fetch only bars from the last cached one onwards and merge them into history
+
+    history_info is the info history was published with. Falls back to a
+    full fetch when there is no usable history, the history is generated
+    sample data, or the source returns a different column layout.
+    """
+    fetch = fetch or get_multi_source_data
+    history_info = dict(history_info or {})
+    if history is None or history.empty or history_info.get("source") == SAMPLE_SOURCE:
+        return fetch(symbol, period)
+
+    new_bars, info = fetch(symbol, period, start=history.index[-1])
+    if info.get("source") == SAMPLE_SOURCE:
+        # Never splice generated bars into real history; it keeps its own source tag
+        return history, history_info
+    if new_bars is None or new_bars.empty:
+        return history, info
+    if not set(history.columns) <= set(new_bars.columns):
+        return fetch(symbol, period)
+
+    return merge_bars(history, new_bars, period), info
+
+# Function to fetch several symbols at once
+def fetch_batch(symbols, period="1mo", fetch=None, max_workers=None, timeout=None):
+    """Fetch symbols concurrently with a bounded pool and a deadline for the whole batch
+
+    Returns a dict mapping each symbol to (data, info); symbols that fail or
+    miss the deadline map to (None, {}).
+    """
+    fetch = fetch or get_multi_source_data
+    max_workers = max_workers or API_CONFIG["max_concurrency"]
+    timeout = timeout if timeout is not None else API_CONFIG["batch_timeout"]
+
+    symbols = list(dict.fromkeys(symbols))
+    results = {symbol: (None, {}) for symbol in symbols}
+    if not symbols:
+        return results
+
+    executor = ThreadPoolExecutor(
+        max_workers=min(max_workers, len(symbols)),
+        thread_name_prefix="market-data-fetch"
+    )
+    futures = {executor.submit(fetch, symbol, period): symbol for symbol in symbols}
+    done, not_done = wait(futures, timeout=timeout)
+
+    for future in done:
+        symbol = futures[future]
+        try:
+            results[symbol] = future.result()
+        except Exception as e:
+            logger.warning("Batch fetch failed for %s: %s", symbol, e)
+
+    for future in not_done:
+        logger.warning("Batch fetch for %s missed the %ss deadline", futures[future], timeout)
+
+    # Do not hold the caller hostage to stragglers past the deadline
+    executor.shutdown(wait=False, cancel_futures=True)
+    return results
@@ -0,0 +1,195 @@
+"""
+Hot-path timings for Real-Time Stock Market Dashboard
+
+Upstream fetches (per source), indicator calculation, figure builds, tab
+renders and whole reruns record their durations here, labelled with the
+source, symbol or tab they belong to. Every (stage, labels) series keeps
+cumulative histogram buckets with a sum and count, which a local endpoint
+serves in the Prometheus text format, and a window of its latest durations,
+which the sidebar Performance panel turns into p50/p95. Counters such as
+cache hits and misses are plain totals.
+
+Recording costs two perf_counter() calls and a few updates under a lock, so
+spans stay on in production.
+"""
+
+import bisect
+import functools
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+
+from config import METRICS_CONFIG
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_COLUMNS = ["Stage", "Detail", "Calls", "p50 ms", "p95 ms", "Max ms"]
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _label_text(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+class _Series:
+    """Histogram buckets, sum, count and the latest durations of one stage and label set"""
+
+    __slots__ = ("buckets", "total", "count", "recent")
+
+    def __init__(self, bounds, window):
+        self.buckets = [0] * (len(bounds) + 1)
+        self.total = 0.0
+        self.count = 0
+        self.recent = deque(maxlen=window)
+
+
+class Metrics:
+    """Process-wide registry of stage timings and counters"""
+
+    def __init__(self, buckets=None, window=None):
+        self.bounds = sorted(buckets or METRICS_CONFIG["buckets"])
+        self.window = window or METRICS_CONFIG["window"]
+        self._lock = threading.Lock()
+        self._series = {}
+        self._counters = {}
+
+    def observe(self, stage, seconds, **labels):
+        """Record one duration of a stage; callers pass a stage's labels in one consistent order"""
+        key = (stage, tuple(labels.items()))
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _Series(self.bounds, self.window)
+            series.buckets[bisect.bisect_left(self.bounds, seconds)] += 1
+            series.total += seconds
+            series.count += 1
+            series.recent.append(seconds)
+
+    @contextmanager
+    def span(self, stage, **labels):
+        """Time the body of a with block as one call of a stage"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - started, **labels)
+
+    def timed(self, stage, **labels):
+        """Decorator timing every call of a function as a stage"""
+        def decorator(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.span(stage, **labels):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def increment(self, name, amount=1, **labels):
+        """Add to a counter"""
+        key = (name, tuple(labels.items()))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def counter(self, name, **labels):
+        """Current total of a counter, summed over every label set that includes labels"""
+        wanted = set(labels.items())
+        with self._lock:
+            return sum(value for (counter, pairs), value in self._counters.items()
+                       if counter == name and wanted <= set(pairs))
+
+    def summary(self, per_symbol=False):
+        """p50/p95 of the latest durations, per stage and non-symbol labels or per symbol and stage"""
+        groups = {}
+        with self._lock:
+            for (stage, pairs), series in self._series.items():
+                labels = dict(pairs)
+                symbol = labels.pop("symbol", None)
+                if per_symbol and symbol is None:
+                    continue
+                detail = symbol if per_symbol else " · ".join(str(value) for value in labels.values())
+                group = groups.setdefault((stage, detail), [0, []])
+                group[0] += series.count
+                group[1].extend(series.recent)
+
+        rows = []
+        for (stage, detail), (calls, recent) in groups.items():
+            p50, p95 = np.percentile(recent, [50, 95]) * 1000
+            rows.append([stage, detail, calls, p50, p95, max(recent) * 1000])
+        columns = ["Stage", "Symbol"] + SUMMARY_COLUMNS[2:] if per_symbol else SUMMARY_COLUMNS
+        table = pd.DataFrame(rows, columns=columns)
+        return table.sort_values("p95 ms", ascending=False, ignore_index=True)
+
+    def prometheus(self):
+        """Every histogram and counter in the Prometheus text exposition format"""
+        with self._lock:
+            series = [(key, list(s.buckets), s.total, s.count) for key, s in sorted(self._series.items())]
+            counters = sorted(self._counters.items())
+
+        lines = [
+            "# HELP dashboard_stage_seconds Duration of instrumented dashboard stages",
+            "# TYPE dashboard_stage_seconds histogram",
+        ]
+        for (stage, pairs), buckets, total, count in series:
+            labels = (("stage", stage),) + pairs
+            cumulative = 0
+            for bound, bucket in zip(self.bounds + [float("inf")], buckets):
+                cumulative += bucket
+                le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                lines.append(f"dashboard_stage_seconds_bucket{_label_text(labels, [('le', le)])} {cumulative}")
+            lines.append(f"dashboard_stage_seconds_sum{_label_text(labels)} {total:.6f}")
+            lines.append(f"dashboard_stage_seconds_count{_label_text(labels)} {count}")
+
+        typed = set()
+        for (name, pairs), value in counters:
+            if name not in typed:
+                lines.append(f"# TYPE dashboard_{name}_total counter")
+                typed.add(name)
+            lines.append(f"dashboard_{name}_total{_label_text(pairs)} {value}")
+        return "\n".join(lines) + "\n"
+
+    def serve(self, host=None, port=None):
+        """Serve /metrics on a daemon thread; returns the server, or None if the port is taken"""
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = registry.prometheus().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        address = (host or METRICS_CONFIG["host"], port if port is not None else METRICS_CONFIG["port"])
+        try:
+            server = ThreadingHTTPServer(address, Handler)
+        except OSError as e:
+            # Another server process already exposes its metrics there
+            logger.warning("Metrics endpoint not started on %s:%s: %s", *address, e)
+            return None
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+        logger.info("Serving metrics on http://%s:%s/metrics", *server.server_address[:2])
+        return server
+
+
+# Process-wide registry shared by the ingestion worker and every session
+metrics = Metrics()
@@ -0,0 +1,142 @@
+"""
+Response parsers for the MoneyControl and BSE sources
+
+MoneyControl's chart history endpoint answers in the TradingView UDF layout
+(parallel t/o/h/l/c/v arrays), which is decoded straight into NumPy columns.
+The BSE quote page is a large HTML document of which we need half a dozen
+numbers, so it is read with precompiled targeted regexes over the raw text
+instead of building a tree; only if the markup drifts do we fall back to
+lxml with compiled XPath expressions.
+"""
+
+import json
+import re
+
+import numpy as np
+import pandas as pd
+
+try:
+    from lxml import etree
+except ImportError:  # the XPath fallback is optional
+    etree = None
+
+OHLCV_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+# Element ids of the quote block on the BSE stock page
+BSE_QUOTE_IDS = {
+    "Close": "idcrval",
+    "Open": "idopen",
+    "High": "idhigh",
+    "Low": "idlow",
+    "PrevClose": "idprevclose",
+    "Volume": "idtotaltradedqty",
+}
+
+# Exchange-local timezone of the timestamps we hand to the rest of the app
+MARKET_TIMEZONE = "Asia/Kolkata"
+
+
+class ParseError(ValueError):
+    """The response did not contain the data we expected"""
+
+
+def _to_number(text):
+    # Handles "2,510.25" as well as Indian digit grouping ("1,23,456")
+    return float(text.strip().replace(",", ""))
+
+
+def _compile_quote_patterns(field_ids):
+    return {
+        field: re.compile(
+            r'id\s*=\s*["\']' + re.escape(element_id) + r'["\'][^>]*>\s*([-\d,\.]+)\s*<'
+        )
+        for field, element_id in field_ids.items()
+    }
+
+
+def _compile_quote_xpaths(field_ids):
+    if etree is None:
+        return None
+    return {
+        field: etree.XPath(f'normalize-space(string(//*[@id="{element_id}"]))')
+        for field, element_id in field_ids.items()
+    }
+
+
+_BSE_QUOTE_PATTERNS = _compile_quote_patterns(BSE_QUOTE_IDS)
+_BSE_QUOTE_XPATHS = _compile_quote_xpaths(BSE_QUOTE_IDS)
+
+
+def parse_udf_history(payload):
+    """Decode a UDF history response ({"s": "ok", "t": [...], "o": [...], ...}) into OHLCV"""
+    try:
+        data = json.loads(payload)
+    except (TypeError, ValueError) as e:
+        raise ParseError(f"History response is not JSON: {e}") from None
+
+    status = data.get("s")
+    if status == "no_data":
+        return pd.DataFrame(columns=OHLCV_COLUMNS, index=pd.DatetimeIndex([]))
+    if status != "ok":
+        raise ParseError(f"History response status {status!r}: {data.get('errmsg', '')}")
+
+    try:
+        timestamps = np.asarray(data["t"], dtype=np.int64)
+        columns = {
+            'Open': np.asarray(data["o"], dtype=np.float64),
+            'High': np.asarray(data["h"], dtype=np.float64),
+            'Low': np.asarray(data["l"], dtype=np.float64),
+            'Close': np.asarray(data["c"], dtype=np.float64),
+            'Volume': np.asarray(data.get("v") or np.zeros(len(timestamps)), dtype=np.int64),
+        }
+    except (KeyError, TypeError, ValueError) as e:
+        raise ParseError(f"Malformed history arrays: {e}") from None
+
+    if any(len(values) != len(timestamps) for values in columns.values()):
+        raise ParseError("History arrays have different lengths")
+
+    index = pd.to_datetime(timestamps, unit="s", utc=True).tz_convert(MARKET_TIMEZONE).tz_localize(None)
+    return pd.DataFrame(columns, index=index).sort_index()
+
+
+def parse_bse_quote(html):
+    """Extract the quote block (Close/Open/High/Low/PrevClose/Volume) from a BSE stock page"""
+    if isinstance(html, bytes):
+        html = html.decode("utf-8", errors="replace")
+
+    quote = {}
+    for field, pattern in _BSE_QUOTE_PATTERNS.items():
+        match = pattern.search(html)
+        if match:
+            quote[field] = _to_number(match.group(1))
+
+    if "Close" not in quote and _BSE_QUOTE_XPATHS is not None:
+        # Markup drifted away from the regexes; pay for a tree once
+        tree = etree.fromstring(html, etree.HTMLParser())
+        if tree is not None:
+            for field, xpath in _BSE_QUOTE_XPATHS.items():
+                value = xpath(tree)
+                if value:
+                    try:
+                        quote[field] = _to_number(value)
+                    except ValueError:
+                        continue
+
+    if "Close" not in quote:
+        raise ParseError("No quote found in BSE page")
+    return quote
+
+
+def quote_to_bar(quote, timestamp=None):
+    """Turn a quote dict into a one-row OHLCV frame for the current session's bar"""
+    if timestamp is None:
+        timestamp = pd.Timestamp.now(tz=MARKET_TIMEZONE).tz_localize(None).normalize()
+    close = quote["Close"]
+    row = {
+        'Open': quote.get("Open", close),
+        'High': quote.get("High", close),
+        'Low': quote.get("Low", close),
+        'Close': close,
+        'Volume': int(quote.get("Volume", 0)),
+    }
+    return pd.DataFrame([row], index=pd.DatetimeIndex([timestamp]))
@@ -0,0 +1,245 @@
+"""
+Portfolio engine for Real-Time Stock Market Dashboard
+
+Holdings come from a local trade ledger CSV (date,symbol,side,quantity,price).
+Trades are replayed with the average-cost method into open quantity, cost
+basis and realized P&L per symbol, and positions are kept as parallel NumPy
+arrays, so valuing the whole portfolio is a few vector operations and a new
+price only moves the running totals by that position's change.
+
+Risk uses one aligned dates x symbols matrix of daily returns: its
+covariance gives portfolio volatility and parametric VaR, and a single
+matrix-vector product against the benchmark's returns gives every
+position's beta. Both depend only on completed bars, so they are cached
+until a new bar completes; between bars only the weights change.
+"""
+
+import csv
+import threading
+from collections import namedtuple
+from pathlib import Path
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+from config import PORTFOLIO_CONFIG
+
+Trade = namedtuple("Trade", ["date", "symbol", "side", "quantity", "price"])
+
+POSITION_COLUMNS = ["Symbol", "Quantity", "Avg Cost", "Price", "Market Value", "Unrealized P&L",
+                    "Unrealized %", "Realized P&L", "Weight %", "Beta"]
+
+
+def read_trades(path):
+    """Read a trade ledger CSV (date,symbol,side,quantity,price) in date order; side is BUY or SELL"""
+    trades = []
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        for line, row in enumerate(csv.DictReader(f), start=2):
+            try:
+                side = row["side"].strip().upper()
+                if side not in ("BUY", "SELL"):
+                    raise ValueError(f"unknown side {side!r}")
+                trades.append(Trade(pd.Timestamp(row["date"]), row["symbol"].strip().upper(), side,
+                                    float(row["quantity"]), float(row["price"])))
+            except (AttributeError, KeyError, TypeError, ValueError) as e:
+                raise ValueError(f"{path}:{line}: {e}") from e
+    # Stable sort keeps same-day trades in ledger order
+    trades.sort(key=lambda trade: trade.date)
+    return trades
+
+
+def replay_trades(trades):
+    """{symbol: (open quantity, average cost, realized P&L)} using the average-cost method"""
+    book = {}
+    for trade in trades:
+        quantity, cost, realized = book.get(trade.symbol, (0.0, 0.0, 0.0))
+        if trade.side == "BUY":
+            cost = (quantity * cost + trade.quantity * trade.price) / (quantity + trade.quantity)
+            quantity += trade.quantity
+        else:
+            if trade.quantity > quantity + 1e-9:
+                raise ValueError(f"{trade.date:%Y-%m-%d}: selling {trade.quantity:g} {trade.symbol} "
+                                 f"but only {quantity:g} held")
+            realized += trade.quantity * (trade.price - cost)
+            quantity -= trade.quantity
+        book[trade.symbol] = (quantity, cost, realized)
+    return book
+
+
+def aligned_returns(closes, benchmark):
+    """(dates x symbols returns, benchmark returns) on the benchmark's dates
+
+    Prices are carried forward over a symbol's missing days; days before a
+    symbol's first price count as zero returns.
+    """
+    frame = pd.concat(list(closes.values()) + [benchmark], axis=1, keys=list(closes) + [None])
+    frame = frame[frame.iloc[:, -1].notna()].ffill()
+    returns = frame.pct_change().iloc[1:].fillna(0.0).to_numpy()
+    return returns[:, :-1], returns[:, -1]
+
+
+def watchlist_summary(frames, name=None):
+    """Price, change and volume table of {symbol: OHLCV frame}, skipping symbols without data"""
+    rows = []
+    for symbol, df in frames.items():
+        if df is None or df.empty:
+            continue
+        current_price = df['Close'].iloc[-1]
+        previous_price = df['Close'].iloc[-2] if len(df) > 1 else current_price
+        price_change = current_price - previous_price
+        rows.append({
+            'Symbol': symbol,
+            'Name': name(symbol) if name else symbol,
+            'Price': current_price,
+            'Change': price_change,
+            'Change %': (price_change / previous_price) * 100 if previous_price != 0 else 0,
+            'Volume': df['Volume'].iloc[-1]
+        })
+    return pd.DataFrame(rows, columns=['Symbol', 'Name', 'Price', 'Change', 'Change %', 'Volume'])
+
+
+def normalized_performance(frames):
+    """{symbol: closes rebased to 100 at the first bar} of {symbol: OHLCV frame}"""
+    return {
+        symbol: df['Close'] / df['Close'].iloc[0] * 100
+        for symbol, df in frames.items() if df is not None and not df.empty
+    }
+
+
+class Portfolio:
+    """Positions from a trade ledger with incremental valuation and cached risk"""
+
+    def __init__(self, trades):
+        book = replay_trades(trades)
+        self.symbols = sorted(book)
+        self._index = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self.quantities = np.array([book[symbol][0] for symbol in self.symbols], dtype=np.float64)
+        self.costs = np.array([book[symbol][1] for symbol in self.symbols], dtype=np.float64)
+        self.realized = np.array([book[symbol][2] for symbol in self.symbols], dtype=np.float64)
+        self.prices = np.full(len(self.symbols), np.nan)
+
+        self._lock = threading.Lock()
+        # Running totals over positions that have a price
+        self._market_value = 0.0
+        self._cost_value = 0.0
+        # Covariance and betas of the last completed bars
+        self._risk_key = None
+        self._risk_inputs = None
+
+    @classmethod
+    def from_config(cls):
+        return cls(read_trades(Path(PORTFOLIO_CONFIG["holdings_path"])))
+
+    @property
+    def open_symbols(self):
+        """Symbols with a non-zero open quantity"""
+        return [symbol for symbol, quantity in zip(self.symbols, self.quantities) if quantity > 0]
+
+    def update_prices(self, prices):
+        """Apply {symbol: last price}; totals move by the changed positions only"""
+        with self._lock:
+            for symbol, price in prices.items():
+                i = self._index.get(symbol)
+                if i is None or not np.isfinite(price):
+                    continue
+                old = self.prices[i]
+                if np.isnan(old):
+                    self._market_value += self.quantities[i] * price
+                    self._cost_value += self.quantities[i] * self.costs[i]
+                else:
+                    self._market_value += self.quantities[i] * (price - old)
+                self.prices[i] = price
+
+    def summary(self):
+        """Portfolio totals: market value, cost basis and P&L"""
+        with self._lock:
+            market_value, cost_value = self._market_value, self._cost_value
+        unrealized = market_value - cost_value
+        realized = float(self.realized.sum())
+        return {
+            "market_value": market_value,
+            "cost_basis": cost_value,
+            "unrealized": unrealized,
+            "unrealized_pct": unrealized / cost_value * 100 if cost_value else 0.0,
+            "realized": realized,
+            "total": unrealized + realized,
+        }
+
+    def weights(self):
+        """Market-value weight of every position (unpriced and closed positions weigh 0)"""
+        with self._lock:
+            values = np.nan_to_num(self.quantities * self.prices)
+            total = self._market_value
+        return values / total if total else values
+
+    def positions(self, betas=None):
+        """Per-position table of quantity, cost, value, P&L, weight and beta"""
+        with self._lock:
+            prices = self.prices.copy()
+        market_value = self.quantities * prices
+        unrealized = self.quantities * (prices - self.costs)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            unrealized_pct = (prices / self.costs - 1) * 100
+        table = pd.DataFrame({
+            "Symbol": self.symbols,
+            "Quantity": self.quantities,
+            "Avg Cost": self.costs,
+            "Price": prices,
+            "Market Value": market_value,
+            "Unrealized P&L": unrealized,
+            "Unrealized %": unrealized_pct,
+            "Realized P&L": self.realized,
+            "Weight %": self.weights() * 100,
+            "Beta": betas if betas is not None else np.nan,
+        }, columns=POSITION_COLUMNS)
+        return table
+
+    def risk(self, closes, benchmark, confidence=None):
+        """Volatility, VaR and beta from daily closes {symbol: Series} and the benchmark's closes
+
+        The newest bar may still be forming, so only completed bars are used.
+        """
+        confidence = confidence or PORTFOLIO_CONFIG["var_confidence"]
+        closes = {symbol: series for symbol, series in closes.items() if symbol in self._index and len(series) > 2}
+        if not closes or benchmark is None or len(benchmark) < 3:
+            return None
+
+        # Completed bars only change when a bar is added, so length and newest date identify them
+        key = (len(benchmark), benchmark.index[-1]) + tuple(
+            (symbol, len(series), series.index[-1]) for symbol, series in closes.items()
+        )
+        with self._lock:
+            inputs = self._risk_inputs if key == self._risk_key else None
+        if inputs is None:
+            inputs = self._risk_inputs_for({symbol: series.iloc[:-1] for symbol, series in closes.items()},
+                                           benchmark.iloc[:-1])
+            with self._lock:
+                self._risk_key, self._risk_inputs = key, inputs
+        positions, returns, covariance, betas = inputs
+
+        weights = self.weights()[positions]
+        market_value = self.summary()["market_value"]
+        daily_volatility = float(np.sqrt(max(weights @ covariance @ weights, 0.0)))
+        portfolio_returns = returns @ weights
+        all_betas = np.full(len(self.symbols), np.nan)
+        all_betas[positions] = betas
+        return {
+            "volatility": daily_volatility * np.sqrt(PORTFOLIO_CONFIG["trading_days"]),
+            "var_parametric": NormalDist().inv_cdf(confidence) * daily_volatility * market_value,
+            "var_historical": float(-np.quantile(portfolio_returns, 1 - confidence)) * market_value,
+            "beta": float(weights @ betas),
+            "betas": all_betas,
+            "observations": len(returns),
+        }
+
+    def _risk_inputs_for(self, closes, benchmark):
+        returns, market = aligned_returns(closes, benchmark)
+        positions = np.array([self._index[symbol] for symbol in closes])
+        covariance = np.atleast_2d(np.cov(returns, rowvar=False))
+        # Beta of every position at once: cov(r_i, r_m) / var(r_m)
+        market_centered = market - market.mean()
+        market_variance = market_centered @ market_centered
+        betas = (returns - returns.mean(axis=0)).T @ market_centered / market_variance if market_variance else \
+            np.zeros(returns.shape[1])
+        return positions, returns, covariance, betas
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Local tick server for the dashboard's streaming mode
+
+Speaks the streaming feed protocol (newline-delimited JSON ticks over TCP)
+so streaming mode can be developed and load-tested without a market
+connection. Clients send {"subscribe": [symbols]} lines and receive ticks
+for those symbols, either generated as a random walk continuing each
+symbol's sample data or replayed from a recorded JSON-lines file.
+
+    python replay_server.py                       # synthetic ticks
+    python replay_server.py --rate 1000           # ticks per second per symbol
+    python replay_server.py --file ticks.jsonl    # replay a recording
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import time
+
+from config import SAMPLE_DATA_CONFIG, STREAMING_CONFIG
+from market_data import create_sample_data
+from streaming import encode_tick, parse_tick
+
+# Seconds between batches written to a client
+BATCH_INTERVAL = 0.01
+
+
+class Subscription:
+    """Symbols one client asked for, read from its side of the connection"""
+
+    def __init__(self):
+        self.symbols = set()
+        self.closed = False
+
+    async def read(self, reader):
+        try:
+            while line := await reader.readline():
+                try:
+                    self.symbols.update(json.loads(line).get("subscribe", []))
+                except (ValueError, AttributeError, TypeError):
+                    continue
+        finally:
+            self.closed = True
+
+
+class RandomWalk:
+    """Per-symbol geometric random walk starting from the sample data's last close"""
+
+    def __init__(self, rate):
+        self.rate = rate
+        # Spread the daily volatility over a trading day's worth of ticks
+        self.sigma = SAMPLE_DATA_CONFIG["daily_volatility"] / math.sqrt(rate * 6.25 * 3600)
+        self.prices = {}
+
+    def tick(self, symbol, timestamp):
+        price = self.prices.get(symbol)
+        if price is None:
+            price = float(create_sample_data(symbol, "5d")['Close'].iloc[-1])
+        price *= math.exp(random.gauss(0.0, self.sigma))
+        self.prices[symbol] = price
+        return encode_tick(symbol, round(price, 2), random.randint(1, 500), timestamp)
+
+
+async def stream_synthetic(writer, subscription, walk):
+    started = time.monotonic()
+    sent = 0
+    while not subscription.closed:
+        await asyncio.sleep(BATCH_INTERVAL)
+        # Catch up to the target rate, whatever the sleep actually took
+        due = int((time.monotonic() - started) * walk.rate) - sent
+        if due <= 0 or not subscription.symbols:
+            continue
+        now = time.time()
+        writer.write(b"".join(
+            walk.tick(symbol, now) for symbol in sorted(subscription.symbols) for _ in range(due)
+        ))
+        sent += due
+        await writer.drain()
+
+
+async def stream_recording(writer, subscription, path, speed):
+    # Recorded spacing is kept (scaled by speed), timestamps are moved to now
+    with open(path, "rb") as f:
+        ticks = [parse_tick(line) for line in f if line.strip()]
+    if not ticks:
+        return
+
+    while not subscription.closed:
+        started, first = time.monotonic(), ticks[0][3]
+        for symbol, price, volume, timestamp in ticks:
+            if subscription.closed:
+                return
+            delay = (timestamp - first) / speed - (time.monotonic() - started)
+            if delay > 0:
+                await writer.drain()
+                await asyncio.sleep(delay)
+            if not subscription.symbols or symbol in subscription.symbols:
+                writer.write(encode_tick(symbol, price, volume, time.time()))
+        await writer.drain()
+
+
+async def serve(host, port, rate, path=None, speed=1.0):
+    async def handle(reader, writer):
+        peer = writer.get_extra_info("peername")
+        print(f"🔌 Client connected: {peer}")
+        subscription = Subscription()
+        listener = asyncio.create_task(subscription.read(reader))
+        try:
+            if path:
+                await stream_recording(writer, subscription, path, speed)
+            else:
+                await stream_synthetic(writer, subscription, RandomWalk(rate))
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            listener.cancel()
+            writer.close()
+            print(f"👋 Client disconnected: {peer}")
+
+    server = await asyncio.start_server(handle, host, port)
+    print(f"📡 Streaming ticks on {host}:{port}")
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    """Parse arguments and run the tick server"""
+    parser = argparse.ArgumentParser(description="Local tick server for the dashboard's streaming mode")
+    parser.add_argument("--host", default=STREAMING_CONFIG["host"])
+    parser.add_argument("--port", type=int, default=STREAMING_CONFIG["port"])
+    parser.add_argument("--rate", type=float, default=STREAMING_CONFIG["replay_tick_rate"],
+                        help="synthetic ticks per second per symbol")
+    parser.add_argument("--file", help="JSON-lines recording to replay instead of synthetic ticks")
+    parser.add_argument("--speed", type=float, default=1.0, help="replay speed multiplier")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.rate, args.file, args.speed))
+    except KeyboardInterrupt:
+        print("\n👋 Tick server stopped by user")
+
+
+if __name__ == "__main__":
+    main()
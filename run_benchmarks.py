@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark runner for Real-Time Stock Market Dashboard
+
+Runs the bench/ suites and writes one JSON document, stamped with the git
+commit, so results can be compared across commits:
+
+    python run_benchmarks.py --output before.json
+    python run_benchmarks.py --output after.json --compare before.json
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+from datetime import datetime
+from pathlib import Path
+
+from bench import SYMBOL_COUNTS, fetch, parsing, render
+
+
+def git_commit():
+    """Commit of the working tree, marked dirty when there are local changes"""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True,
+                               text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return f"{commit}-dirty" if dirty else commit
+
+
+def timings(results, prefix=""):
+    """{"path/to/metric": milliseconds} of every *_ms value in a results document"""
+    flat = {}
+    for key, value in results.items():
+        path = f"{prefix}/{key}" if prefix else key
+        if isinstance(value, dict):
+            flat.update(timings(value, path))
+        elif key.endswith("_ms") and isinstance(value, (int, float)):
+            flat[path] = value
+    return flat
+
+
+def compare(results, baseline):
+    """Print how every timing moved against a baseline document"""
+    current, previous = timings(results["suites"]), timings(baseline["suites"])
+    print(f"Compared with {baseline.get('commit')}:", file=sys.stderr)
+    for path in sorted(current.keys() & previous.keys()):
+        if previous[path] > 0:
+            change = (current[path] / previous[path] - 1) * 100
+            print(f"  {path}: {previous[path]:.3f} -> {current[path]:.3f} ms ({change:+.1f}%)", file=sys.stderr)
+
+
+def main():
+    """Run the selected suites and write their results as JSON"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--suite", nargs="+", choices=["render", "fetch", "parsing"],
+                        default=["render", "fetch", "parsing"], help="suites to run (default: all)")
+    parser.add_argument("--symbols", nargs="+", type=int, default=list(SYMBOL_COUNTS),
+                        help="symbol counts to scale over (default: %(default)s)")
+    parser.add_argument("--period", default="1mo", help="period of the data each symbol renders or fetches")
+    parser.add_argument("--latency", nargs="+", type=float, default=[latency * 1000 for latency in fetch.LATENCIES],
+                        help="mock upstream latencies in milliseconds (default: %(default)s)")
+    parser.add_argument("--min-time", type=float, default=1.0,
+                        help="seconds each measurement repeats for before taking the median")
+    parser.add_argument("--output", type=Path, help="write the JSON here instead of stdout")
+    parser.add_argument("--compare", type=Path, help="baseline JSON to report changes against")
+    args = parser.parse_args()
+
+    if not Path("app.py").exists():
+        parser.error("run this script from the dashboard directory")
+
+    suites = {}
+    if "render" in args.suite:
+        suites["render"] = render.run(args.symbols, args.period, args.min_time)
+    if "fetch" in args.suite:
+        suites["fetch"] = fetch.run(args.symbols, [latency / 1000 for latency in args.latency], args.period,
+                                    args.min_time)
+    if "parsing" in args.suite:
+        suites["parsing"] = parsing.run()
+
+    results = {
+        "commit": git_commit(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "symbol_counts": args.symbols,
+        "suites": suites,
+    }
+
+    document = json.dumps(results, indent=2)
+    if args.output:
+        args.output.write_text(document + "\n")
+    else:
+        print(document)
+    if args.compare:
+        compare(results, json.loads(args.compare.read_text()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+"""
+Market-wide screener for Real-Time Stock Market Dashboard
+
+The screener scores the whole instrument universe in one pass. The recent
+closes of every symbol are laid out in a single 2-D array (symbols x bars,
+newest bar in the last column, short histories padded with NaN on the left)
+and moving averages, RSI and Bollinger Bands are computed for all rows at
+once with cumulative sums along the time axis, so a scan costs a few NumPy
+passes instead of one calculate_indicators() call per frame.
+
+Scans are incremental: every symbol's closes carry a cheap version (for
+stored history, the size and modification time of its files, which change
+with every new or revised bar), and only the rows whose version changed
+since the previous scan are read into the array and recomputed.
+"""
+
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from config import BREADTH_CONFIG, INDICATORS_CONFIG, INGESTION_CONFIG, SCREENER_CONFIG
+from market_data import create_sample_data
+
+# Signal -> score contribution; positive signals are bullish
+SIGNALS = {
+    "RSI oversold": 1,
+    "RSI overbought": -1,
+    "Golden cross": 1,
+    "Death cross": -1,
+    "Upper band break": 1,
+    "Lower band break": -1,
+}
+
+RESULT_COLUMNS = ["Close", "Change %", "RSI", "MA Trend", "%B", "Signals", "Score"]
+
+# Indices whose history is stored next to stocks; they are never part of a stock universe
+INDEX_SYMBOLS = frozenset(BREADTH_CONFIG["indices"]) | frozenset(INGESTION_CONFIG["symbols"])
+
+
+def _window_sums(values, window):
+    # Sum and count of finite values in each window ending at bars window-1 onwards
+    valid = np.isfinite(values)
+    pad = np.zeros((values.shape[0], 1))
+    sums = np.cumsum(np.hstack([pad, np.where(valid, values, 0.0)]), axis=1)
+    counts = np.cumsum(np.hstack([pad, valid]), axis=1)
+    return sums[:, window:] - sums[:, :-window], counts[:, window:] - counts[:, :-window]
+
+
+def rolling_mean(values, window):
+    """Rolling mean along the rows of a symbols x bars array, NaN until a window is complete"""
+    out = np.full(values.shape, np.nan)
+    sums, counts = _window_sums(values, window)
+    out[:, window - 1:] = np.where(counts == window, sums / window, np.nan)
+    return out
+
+
+def rolling_std(values, window):
+    """Rolling sample standard deviation (ddof=1, like pandas) along the rows"""
+    # Shifting each row by its newest close keeps the sum of squares from cancelling
+    centered = values - values[:, -1:]
+    out = np.full(values.shape, np.nan)
+    sums, counts = _window_sums(centered, window)
+    squares, _ = _window_sums(centered ** 2, window)
+    variance = np.maximum(squares - sums ** 2 / window, 0.0) / (window - 1)
+    out[:, window - 1:] = np.where(counts == window, np.sqrt(variance), np.nan)
+    return out
+
+
+def rolling_rsi(closes, period, smoothing="sma"):
+    """RSI along the rows of a symbols x bars close array
+
+    Matches calculate_indicators() on the same closes: like pandas, a row's
+    first close counts as a zero change. Wilder smoothing is seeded at each
+    row's first bar, so over a short scan window it approximates the
+    full-history value of the charts.
+    """
+    delta = np.diff(closes, axis=1, prepend=np.nan)
+    gains = np.where(delta > 0, delta, 0.0)
+    losses = np.where(delta < 0, -delta, 0.0)
+    gains[np.isnan(closes)] = np.nan
+    losses[np.isnan(closes)] = np.nan
+
+    if smoothing == "wilder":
+        # Recursive smoothing, one vectorized step per bar across all rows
+        alpha = 1 / period
+        avg_gains = np.full(delta.shape, np.nan)
+        avg_losses = np.full(delta.shape, np.nan)
+        average_gain, average_loss = np.full((2, closes.shape[0]), np.nan)
+        seen = np.zeros(closes.shape[0], dtype=np.int64)
+        for t in range(delta.shape[1]):
+            start = np.isnan(average_gain)
+            average_gain = np.where(start, gains[:, t], average_gain + alpha * (gains[:, t] - average_gain))
+            average_loss = np.where(start, losses[:, t], average_loss + alpha * (losses[:, t] - average_loss))
+            seen += np.isfinite(gains[:, t])
+            avg_gains[:, t] = np.where(seen >= period, average_gain, np.nan)
+            avg_losses[:, t] = np.where(seen >= period, average_loss, np.nan)
+    else:
+        avg_gains = rolling_mean(gains, period)
+        avg_losses = rolling_mean(losses, period)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return 100 - 100 / (1 + avg_gains / avg_losses)
+
+
+def screen(closes, symbols, config=None, indicators=None):
+    """Latest indicator values and signals for every row of a symbols x bars close array"""
+    config = config or SCREENER_CONFIG
+    indicators = indicators or INDICATORS_CONFIG
+
+    ma_short = rolling_mean(closes, indicators["ma_short"])
+    ma_long = rolling_mean(closes, indicators["ma_long"])
+    rsi = rolling_rsi(closes, indicators["rsi_period"], indicators["rsi_smoothing"])[:, -1]
+
+    # Bollinger Bands at the newest bar (reuse the short MA when the windows match)
+    if indicators["bb_period"] == indicators["ma_short"]:
+        bb_middle = ma_short[:, -1]
+    else:
+        bb_middle = rolling_mean(closes, indicators["bb_period"])[:, -1]
+    bb_width = rolling_std(closes, indicators["bb_period"])[:, -1] * indicators["bb_std"]
+    bb_upper, bb_lower = bb_middle + bb_width, bb_middle - bb_width
+
+    close, previous = closes[:, -1], closes[:, -2]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        change_pct = (close / previous - 1) * 100
+        percent_b = (close - bb_lower) / (bb_upper - bb_lower)
+
+    # A crossover counts while the short MA is still on the side it crossed to
+    spread = (ma_short - ma_long)[:, -(config["cross_lookback"] + 1):]
+    complete = np.isfinite(spread[:, 0])
+    above, below = spread > 0, spread < 0
+    masks = {
+        "RSI oversold": rsi < config["rsi_oversold"],
+        "RSI overbought": rsi > config["rsi_overbought"],
+        "Golden cross": complete & above[:, -1] & ~above[:, :-1].all(axis=1),
+        "Death cross": complete & below[:, -1] & ~below[:, :-1].all(axis=1),
+        "Upper band break": close > bb_upper,
+        "Lower band break": close < bb_lower,
+    }
+
+    score = sum(masks[name].astype(np.int64) * weight for name, weight in SIGNALS.items())
+    fired = np.column_stack(list(masks.values()))
+    names = list(masks)
+    signals = [", ".join(names[i] for i in np.flatnonzero(row)) for row in fired]
+    trend = np.where(above[:, -1], "Up", np.where(below[:, -1], "Down", ""))
+
+    return pd.DataFrame({
+        "Close": close,
+        "Change %": change_pct,
+        "RSI": rsi,
+        "MA Trend": trend,
+        "%B": percent_b,
+        "Signals": signals,
+        "Score": score,
+    }, index=pd.Index(symbols, name="Symbol"))
+
+
+def rank(table):
+    """Strongest signals first, then the most stretched RSI"""
+    stretch = (table["RSI"] - 50).abs().fillna(0).to_numpy()
+    order = np.lexsort((-stretch, -table["Score"].abs().to_numpy()))
+    return table.iloc[order]
+
+
+class HistorySource:
+    """Closes from a HistoryStore, versioned by the stamp of the close and timestamp files"""
+
+    def __init__(self, history):
+        self.history = history
+
+    def symbols(self):
+        """Stored stock symbols, without the indices ingestion also persists"""
+        return [symbol for symbol in self.history.symbols() if symbol not in INDEX_SYMBOLS]
+
+    def version(self, symbol):
+        return self.history.stamp(symbol)
+
+    def closes(self, symbol, bars):
+        arrays = self.history.read_tail(symbol, bars)
+        return arrays["close"] if arrays is not None else np.empty(0)
+
+
+class SampleSource:
+    """Sample closes, generated once per symbol per day"""
+
+    def version(self, symbol):
+        return pd.Timestamp.now().floor("1D")
+
+    def closes(self, symbol, bars):
+        return create_sample_data(symbol, bars=bars)['Close'].to_numpy()
+
+
+class Screener:
+    """Universe scan that only recomputes symbols whose closes changed since the last scan"""
+
+    def __init__(self, source, bars=None):
+        self.source = source
+        # The window must hold the long MA plus the crossover lookback
+        needed = INDICATORS_CONFIG["ma_long"] + SCREENER_CONFIG["cross_lookback"] + 1
+        self.bars = max(bars or SCREENER_CONFIG["bars"], needed)
+        self.last_scan = {"symbols": 0, "changed": 0, "seconds": 0.0}
+        self._lock = threading.Lock()
+        self._versions = {}
+        self._rows = pd.DataFrame(columns=RESULT_COLUMNS, index=pd.Index([], name="Symbol"))
+
+    def scan(self, symbols):
+        """Ranked screener table for symbols, indexed by symbol"""
+        started = time.perf_counter()
+        with self._lock:
+            versions = {}
+            for symbol in dict.fromkeys(symbols):
+                version = self.source.version(symbol)
+                if version is not None:
+                    versions[symbol] = version
+
+            # Only symbols with new or revised bars are read and recomputed
+            changed = [symbol for symbol, version in versions.items() if self._versions.get(symbol) != version]
+            if changed:
+                closes = np.full((len(changed), self.bars), np.nan)
+                for row, symbol in enumerate(changed):
+                    tail = self.source.closes(symbol, self.bars)[-self.bars:]
+                    closes[row, self.bars - len(tail):] = tail
+                fresh = screen(closes, changed)
+                kept = self._rows.drop(changed, errors="ignore")
+                self._rows = pd.concat([kept, fresh]) if len(kept) else fresh
+                self._versions.update((symbol, versions[symbol]) for symbol in changed)
+
+            table = self._rows.loc[list(versions)]
+            self.last_scan = {
+                "symbols": len(versions),
+                "changed": len(changed),
+                "seconds": time.perf_counter() - started,
+            }
+        return rank(table)
@@ -0,0 +1,59 @@
+"""
+Compact in-memory OHLCV series for Real-Time Stock Market Dashboard
+
+Published frames are kept as contiguous NumPy columns (prices in
+SERIES_CONFIG["price_dtype"], int64 timestamps and volumes) that are marked
+read-only and shared by every session. Readers get a DataFrame view over
+those arrays, a new frame object with no data copied, so a session no
+longer pays for a private copy of every frame it draws, and code that tries
+to modify shared data in place fails loudly instead of leaking into other
+sessions. Columns other than OHLCV are dropped.
+"""
+
+import numpy as np
+import pandas as pd
+
+from config import SERIES_CONFIG
+
+PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close']
+
+
+class CompactSeries:
+    """Immutable OHLCV columns for one symbol and period"""
+
+    __slots__ = ("timestamps", "columns")
+
+    def __init__(self, timestamps, columns):
+        self.timestamps = timestamps
+        self.columns = columns
+        for array in (timestamps, *columns.values()):
+            array.flags.writeable = False
+
+    @classmethod
+    def from_frame(cls, df, price_dtype=None):
+        """Pack the OHLCV columns of df (the one copy made at publish time)"""
+        price_dtype = np.dtype(price_dtype or SERIES_CONFIG["price_dtype"])
+        timestamps = np.array(pd.DatetimeIndex(df.index).as_unit("ns").asi8, dtype=np.int64)
+        columns = {name: np.array(df[name], dtype=price_dtype) for name in PRICE_COLUMNS}
+        if 'Volume' in df.columns:
+            columns['Volume'] = np.array(df['Volume'].fillna(0), dtype=np.int64)
+        else:
+            columns['Volume'] = np.zeros(len(df), dtype=np.int64)
+        return cls(timestamps, columns)
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    @property
+    def empty(self):
+        return len(self.timestamps) == 0
+
+    @property
+    def nbytes(self):
+        return self.timestamps.nbytes + sum(array.nbytes for array in self.columns.values())
+
+    def frame(self):
+        """Read-only DataFrame view over the shared columns (no data is copied)"""
+        index = pd.DatetimeIndex(self.timestamps.view("datetime64[ns]"))
+        # A dict of arrays with copy=False keeps one block per column, so nothing is consolidated
+        return pd.DataFrame(self.columns, index=index, copy=False)
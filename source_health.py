@@ -0,0 +1,135 @@
+"""
+Per-source circuit breakers and health tracking for the fallback chain
+
+Each upstream source (nsepy, MoneyControl, BSE) gets a breaker with the usual
+closed -> open -> half-open cycle plus a rolling window of outcomes and
+latencies. The fallback chain skips open sources immediately and orders the
+remaining ones by expected cost, so a dead endpoint costs one timeout per
+recovery period instead of one timeout per symbol per rerun.
+"""
+
+import threading
+import time
+from collections import deque
+
+from config import SOURCE_HEALTH_CONFIG
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+
+class CircuitBreaker:
+    """Circuit breaker with rolling success and latency statistics"""
+
+    def __init__(self, name, failure_threshold=None, recovery_timeout=None, window=None, clock=time.monotonic):
+        self.name = name
+        self.clock = clock
+        self.failure_threshold = failure_threshold or SOURCE_HEALTH_CONFIG["failure_threshold"]
+        self.recovery_timeout = recovery_timeout or SOURCE_HEALTH_CONFIG["recovery_timeout"]
+        self._lock = threading.Lock()
+        self._outcomes = deque(maxlen=window or SOURCE_HEALTH_CONFIG["window"])
+        self._consecutive_failures = 0
+        self._opened_at = None
+        self._probe_in_flight = False
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._state()
+
+    def _state(self):
+        if self._opened_at is None:
+            return CLOSED
+        if self.clock() - self._opened_at >= self.recovery_timeout:
+            return HALF_OPEN
+        return OPEN
+
+    def allow(self):
+        """Return True if a call may go through; half-open admits a single probe"""
+        with self._lock:
+            state = self._state()
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def record_success(self, latency):
+        with self._lock:
+            self._outcomes.append((True, latency))
+            self._consecutive_failures = 0
+            self._opened_at = None
+            self._probe_in_flight = False
+
+    def record_failure(self, latency):
+        with self._lock:
+            self._outcomes.append((False, latency))
+            self._consecutive_failures += 1
+            if self._probe_in_flight or self._consecutive_failures >= self.failure_threshold:
+                # A failed probe re-opens the breaker for another recovery period
+                self._opened_at = self.clock()
+            self._probe_in_flight = False
+
+    def stats(self):
+        """Rolling success rate and mean latency over the window"""
+        with self._lock:
+            outcomes = list(self._outcomes)
+            state = self._state()
+
+        calls = len(outcomes)
+        successes = [latency for ok, latency in outcomes if ok]
+        return {
+            "source": self.name,
+            "state": state,
+            "calls": calls,
+            "success_rate": len(successes) / calls if calls else None,
+            "mean_latency": sum(successes) / len(successes) if successes else None,
+        }
+
+    def expected_cost(self):
+        """Expected seconds spent on this source per useful result (lower is better)"""
+        stats = self.stats()
+        if not stats["calls"]:
+            # Untried sources keep their configured position
+            return 0.0
+        if not stats["success_rate"]:
+            return float("inf")
+        mean_latency = stats["mean_latency"] or 0.0
+        return mean_latency / stats["success_rate"]
+
+
+class SourceHealth:
+    """Registry of circuit breakers keyed by source name"""
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._breakers = {}
+
+    def breaker(self, name):
+        with self._lock:
+            if name not in self._breakers:
+                self._breakers[name] = CircuitBreaker(name, clock=self.clock)
+            return self._breakers[name]
+
+    def ranked(self, names):
+        """Order sources by breaker state, then expected cost, keeping ties in given order"""
+        state_rank = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+        breakers = [self.breaker(name) for name in names]
+        order = sorted(
+            range(len(names)),
+            key=lambda i: (state_rank[breakers[i].state], breakers[i].expected_cost(), i)
+        )
+        return [names[i] for i in order]
+
+    def snapshot(self):
+        """Stats for every known source, for display in the dashboard"""
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return [breaker.stats() for breaker in breakers]
+
+
+# Process-wide registry shared by the ingestion worker and every session
+source_health = SourceHealth()
@@ -0,0 +1,162 @@
+"""
+Streaming quote feed for Real-Time Stock Market Dashboard
+
+Instead of waiting for the next poll, the feed keeps one TCP connection to a
+tick server and reads newline-delimited JSON ticks
+({"symbol": ..., "price": ..., "volume": ..., "ts": epoch seconds}).
+Ticks are rolled into multi-timeframe bars by a TickAggregator, and the
+session bars that changed are handed to the ingestion worker a few times a
+second, so a burst of ticks costs one publish per symbol instead of one per
+tick. Completed intraday bars are flushed to disk on the same schedule.
+replay_server.py speaks the same protocol for offline development.
+"""
+
+import json
+import logging
+import socket
+import threading
+import time
+
+import http_client
+from aggregator import SESSION_TIMEFRAME, TickAggregator
+from config import STREAMING_CONFIG
+from market_data import merge_bars
+
+logger = logging.getLogger(__name__)
+
+# info["source"] of frames whose newest bar comes from the stream
+STREAM_SOURCE = "stream"
+
+
+def encode_tick(symbol, price, volume, timestamp):
+    """One tick as a protocol line"""
+    return (json.dumps({"symbol": symbol, "price": price, "volume": volume, "ts": timestamp}) + "\n").encode()
+
+
+def parse_tick(line):
+    """Decode a protocol line into (symbol, price, volume, timestamp)"""
+    tick = json.loads(line)
+    return tick["symbol"], float(tick["price"]), int(tick.get("volume", 0)), float(tick["ts"])
+
+
+def merge_session_bar(history, bar, period="1mo"):
+    """Merge a streamed session bar into history
+
+    The stream may have started mid-session, so when history already has that
+    session the polled open is kept and the extremes and volume are widened.
+    """
+    bar = bar.reindex(columns=history.columns)
+    last = history.index[-1]
+    if bar.index[0] == last:
+        polled = history.iloc[-1]
+        bar.loc[last, 'Open'] = polled['Open']
+        bar.loc[last, 'High'] = max(bar.loc[last, 'High'], polled['High'])
+        bar.loc[last, 'Low'] = min(bar.loc[last, 'Low'], polled['Low'])
+        bar.loc[last, 'Volume'] = max(bar.loc[last, 'Volume'], polled['Volume'])
+    return merge_bars(history, bar, period)
+
+
+class StreamingFeed(threading.Thread):
+    """Daemon thread reading a tick stream into a TickAggregator and passing changed session bars to on_bars"""
+
+    def __init__(self, on_bars, host=None, port=None, publish_interval=None, aggregator=None):
+        super().__init__(name="market-data-stream", daemon=True)
+        self.on_bars = on_bars
+        self.host = host or STREAMING_CONFIG["host"]
+        self.port = port or STREAMING_CONFIG["port"]
+        self.publish_interval = publish_interval or STREAMING_CONFIG["publish_interval"]
+        self.bars = aggregator or TickAggregator()
+        self.ticks = 0
+        self.connected = False
+        self._lock = threading.Lock()
+        self._symbols = set()
+        self._socket = None
+        self._stopped = threading.Event()
+
+    def subscribe(self, symbols):
+        """Ask the server for ticks of these symbols (in addition to earlier ones)"""
+        with self._lock:
+            new = set(symbols) - self._symbols
+            self._symbols |= new
+            sock = self._socket
+        if new and sock is not None:
+            self._send(sock, sorted(new))
+
+    def stop(self):
+        """Ask the feed loop to exit"""
+        self._stopped.set()
+
+    def run(self):
+        attempt = 0
+        while not self._stopped.is_set():
+            try:
+                with socket.create_connection((self.host, self.port),
+                                              timeout=STREAMING_CONFIG["connect_timeout"]) as sock:
+                    attempt = 0
+                    self._consume(sock)
+            except OSError as e:
+                logger.warning("Tick stream %s:%s unavailable: %s", self.host, self.port, e)
+            self._stopped.wait(http_client.backoff_delay(attempt))
+            attempt += 1
+
+    def _send(self, sock, symbols):
+        try:
+            sock.sendall((json.dumps({"subscribe": symbols}) + "\n").encode())
+        except OSError as e:
+            logger.warning("Could not subscribe to %s: %s", symbols, e)
+
+    def _consume(self, sock):
+        # recv() times out every publish interval so quiet streams still flush
+        sock.settimeout(self.publish_interval)
+        with self._lock:
+            self._socket = sock
+            symbols = sorted(self._symbols)
+        if symbols:
+            self._send(sock, symbols)
+        self.connected = True
+
+        buffer = b""
+        next_publish = time.monotonic() + self.publish_interval
+        try:
+            while not self._stopped.is_set():
+                try:
+                    chunk = sock.recv(65536)
+                    if not chunk:
+                        raise ConnectionError("tick server closed the connection")
+                    *lines, buffer = (buffer + chunk).split(b"\n")
+                    for line in lines:
+                        self._on_line(line)
+                except socket.timeout:
+                    pass
+
+                if time.monotonic() >= next_publish:
+                    self._publish()
+                    next_publish = time.monotonic() + self.publish_interval
+        finally:
+            self.connected = False
+            with self._lock:
+                self._socket = None
+            self._publish()
+
+    def _on_line(self, line):
+        if not line.strip():
+            return
+        try:
+            symbol, price, volume, timestamp = parse_tick(line)
+        except (KeyError, TypeError, ValueError) as e:
+            logger.warning("Skipping malformed tick %r: %s", line[:200], e)
+            return
+        self.bars.add(symbol, price, volume, timestamp)
+        self.ticks += 1
+
+    def _publish(self):
+        bars = self.bars.drain_changed(SESSION_TIMEFRAME)
+        if bars:
+            try:
+                self.on_bars(bars)
+            except Exception:
+                logger.exception("Publishing streamed bars failed")
+        try:
+            self.bars.flush()
+        except (OSError, ValueError) as e:
+            logger.warning("Could not persist completed bars: %s", e)
@@ -0,0 +1,226 @@
+"""
+Symbol registry for Real-Time Stock Market Dashboard
+
+Instruments are loaded from a local instrument master CSV, either this
+repo's `symbol,name,exchange` layout or an exchange download such as NSE's
+EQUITY_L.csv (`SYMBOL, NAME OF COMPANY, ...`). Two indexes make search
+instant at full-universe size:
+
+* a sorted token index (ticker and every word of the company name) for
+  prefix search, which answers a query with a binary search instead of a scan
+* a trigram index over tickers and names for typo-tolerant fuzzy matches
+
+The registry also owns the mapping between bare tickers and exchange
+suffixed symbols (`.NS` for NSE, `.BO` for BSE). BSE identifies scrips by a
+numeric code, so master rows with an `alias_of` column name another listing
+of the same company (e.g. 500325 -> RELIANCE): the code resolves to that
+listing and is what BSE symbols are built from, but it is not an instrument
+of its own.
+"""
+
+import csv
+import functools
+import logging
+import re
+from bisect import bisect_left
+from collections import defaultdict, namedtuple
+from pathlib import Path
+
+from config import SYMBOLS_CONFIG
+
+logger = logging.getLogger(__name__)
+
+Instrument = namedtuple("Instrument", ["symbol", "name", "exchange", "alias_of"], defaults=[None])
+
+# Exchange suffixes used by the data sources
+SUFFIXES = {"NSE": ".NS", "BSE": ".BO"}
+
+# Header spellings accepted for each field of the master file
+_HEADERS = {
+    "symbol": ("SYMBOL", "SECURITY ID", "TICKER"),
+    "name": ("NAME", "NAME OF COMPANY", "SECURITY NAME", "COMPANY NAME"),
+    "exchange": ("EXCHANGE",),
+    "alias_of": ("ALIAS_OF", "ALIAS OF"),
+}
+
+_WORD = re.compile(r"[A-Z0-9&]+")
+
+# Token kinds in the prefix index, in ranking order
+_TICKER, _NAME = 0, 1
+
+
+def _words(text):
+    return _WORD.findall(text.upper())
+
+
+def _trigrams(text):
+    padded = f"  {text.upper()} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def split_suffix(symbol):
+    """Split "RELIANCE.NS" into ("RELIANCE", "NSE"); unsuffixed symbols get exchange None"""
+    symbol = symbol.strip().upper()
+    for exchange, suffix in SUFFIXES.items():
+        if symbol.endswith(suffix.upper()):
+            return symbol[:-len(suffix)], exchange
+    return symbol, None
+
+
+def read_master(path, default_exchange="NSE"):
+    """Read instruments from a master CSV in any of the supported layouts"""
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.DictReader(f)
+        columns = {}
+        for field, spellings in _HEADERS.items():
+            for header in reader.fieldnames or []:
+                if header.strip().upper() in spellings:
+                    columns[field] = header
+                    break
+        if "symbol" not in columns:
+            raise ValueError(f"{path} has no symbol column")
+
+        instruments = []
+        for row in reader:
+            symbol = (row[columns["symbol"]] or "").strip().upper()
+            if not symbol:
+                continue
+            name = (row.get(columns.get("name"), "") or "").strip() or symbol
+            exchange = (row.get(columns.get("exchange"), "") or "").strip().upper() or default_exchange
+            alias_of = (row.get(columns.get("alias_of"), "") or "").strip().upper() or None
+            instruments.append(Instrument(symbol, name, exchange, alias_of))
+        return instruments
+
+
+class SymbolRegistry:
+    """Instrument lookup with prefix and fuzzy search over tickers and company names"""
+
+    def __init__(self, instruments):
+        # First listing of a (ticker, exchange) wins; aliases only map codes to listings
+        self.instruments = []
+        # scrip code -> listing ticker, and (listing ticker, exchange) -> scrip code
+        self._aliases = {}
+        self._codes = {}
+        seen = set()
+        for instrument in instruments:
+            if instrument.alias_of:
+                self._aliases.setdefault(instrument.symbol, instrument.alias_of)
+                self._codes.setdefault((instrument.alias_of, instrument.exchange), instrument.symbol)
+            elif (instrument.symbol, instrument.exchange) not in seen:
+                seen.add((instrument.symbol, instrument.exchange))
+                self.instruments.append(instrument)
+        self._by_key = {(i.symbol, i.exchange): n for n, i in enumerate(self.instruments)}
+        # Bare tickers resolve to their first listing, so list NSE rows first
+        self._by_symbol = {}
+        for n, instrument in enumerate(self.instruments):
+            self._by_symbol.setdefault(instrument.symbol, n)
+
+        tokens = []
+        self._trigram_index = defaultdict(list)
+        self._trigram_counts = []
+        codes = defaultdict(list)
+        for code, listing in self._aliases.items():
+            codes[listing].append(code)
+        for n, instrument in enumerate(self.instruments):
+            tokens.append((instrument.symbol, _TICKER, n))
+            # Scrip codes find the listing they belong to
+            tokens.extend((code, _TICKER, n) for code in codes.get(instrument.symbol, ()))
+            tokens.extend((word, _NAME, n) for word in set(_words(instrument.name)))
+            trigrams = _trigrams(instrument.symbol) | _trigrams(instrument.name)
+            for trigram in trigrams:
+                self._trigram_index[trigram].append(n)
+            self._trigram_counts.append(len(trigrams))
+        tokens.sort()
+        self._tokens = tokens
+        self._token_keys = [token for token, _, _ in tokens]
+
+    @classmethod
+    def from_config(cls):
+        return cls(read_master(Path(SYMBOLS_CONFIG["master_path"])))
+
+    def __len__(self):
+        return len(self.instruments)
+
+    def get(self, symbol):
+        """Instrument for a bare or suffixed symbol (or scrip code), or None"""
+        ticker, exchange = split_suffix(symbol)
+        if ticker in self._aliases:
+            ticker, exchange = self._aliases[ticker], None
+        n = self._by_key.get((ticker, exchange)) if exchange else self._by_symbol.get(ticker)
+        return self.instruments[n] if n is not None else None
+
+    def name(self, symbol):
+        """Company name for a symbol, or the symbol itself if it is not listed"""
+        instrument = self.get(symbol)
+        return instrument.name if instrument is not None else symbol
+
+    def exchange_symbol(self, symbol, exchange=None):
+        """Symbol as an exchange's data sources expect it ("RELIANCE" -> "RELIANCE.NS", BSE -> "500325.BO")"""
+        ticker, suffix_exchange = split_suffix(symbol)
+        ticker = self._aliases.get(ticker, ticker)
+        exchange = exchange or suffix_exchange
+        if exchange is None:
+            instrument = self.get(ticker)
+            exchange = instrument.exchange if instrument is not None else "NSE"
+        return self._codes.get((ticker, exchange), ticker) + SUFFIXES.get(exchange, "")
+
+    def _prefix_matches(self, word):
+        # word -> {instrument: best rank} for every token starting with word
+        matches = {}
+        tokens = self._tokens
+        for position in range(bisect_left(self._token_keys, word), len(tokens)):
+            token, kind, n = tokens[position]
+            if not token.startswith(word):
+                break
+            rank = kind * 2 + (token != word)
+            if rank < matches.get(n, 4):
+                matches[n] = rank
+        return matches
+
+    def search(self, query, limit=None):
+        """Instruments matching query by ticker or name prefix, then by fuzzy similarity"""
+        limit = limit or SYMBOLS_CONFIG["search_limit"]
+        words = _words(query)
+        if not words:
+            return []
+
+        # Prefix matches: every query word must start some token of the instrument
+        ranks = None
+        for word in words:
+            matches = self._prefix_matches(word)
+            if ranks is None:
+                ranks = matches
+            else:
+                ranks = {n: min(rank, matches[n]) for n, rank in ranks.items() if n in matches}
+        ordered = sorted(ranks, key=lambda n: (ranks[n], len(self.instruments[n].symbol), self.instruments[n].symbol))
+        results = ordered[:limit]
+
+        if len(results) < limit:
+            results += self._fuzzy(" ".join(words), limit - len(results), exclude=set(results))
+        return [self.instruments[n] for n in results]
+
+    def _fuzzy(self, text, limit, exclude):
+        query = _trigrams(text)
+        shared = defaultdict(int)
+        for trigram in query:
+            for n in self._trigram_index.get(trigram, ()):
+                shared[n] += 1
+
+        threshold = SYMBOLS_CONFIG["fuzzy_threshold"] * len(query)
+        scored = [
+            (-count, -count / (len(query) + self._trigram_counts[n] - count), n)
+            for n, count in shared.items()
+            if count >= threshold and n not in exclude
+        ]
+        scored.sort()
+        return [n for _, _, n in scored[:limit]]
+
+
+@functools.lru_cache(maxsize=None)
+def default_registry():
+    """Process-wide registry of the configured instrument master, loaded on first use"""
+    if not Path(SYMBOLS_CONFIG["master_path"]).exists():
+        # Fetchers still work, with bare tickers and no scrip codes
+        logger.warning("Instrument master %s not found", SYMBOLS_CONFIG["master_path"])
+        return SymbolRegistry([])
+    return SymbolRegistry.from_config()
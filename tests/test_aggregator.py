@@ -0,0 +1,83 @@
+"""Tests for tick-to-bar aggregation"""
+
+import pandas as pd
+import pytest
+
+from aggregator import TickAggregator
+
+TIMEFRAMES = {"1m": 60, "5m": 300, "1h": 3600, "1D": 86400}
+
+
+def epoch(local):
+    """UTC epoch seconds of a naive exchange-local (IST) time"""
+    return pd.Timestamp(local, tz="Asia/Kolkata").timestamp()
+
+
+def test_buckets_align_to_exchange_local_time():
+    bars = TickAggregator(TIMEFRAMES, ring_size=10)
+    bars.add("TCS", 100.0, 10, epoch("2026-10-16 09:16:10"))
+    bars.add("TCS", 101.0, 5, epoch("2026-10-16 09:19:59"))
+    bars.add("TCS", 99.0, 1, epoch("2026-10-16 09:18:00"))
+
+    assert bars.live_bar("TCS", "5m").index[0] == pd.Timestamp("2026-10-16 09:15")
+    # Hourly buckets start on the local hour, not at 08:30 as UTC alignment would give
+    assert bars.live_bar("TCS", "1h").index[0] == pd.Timestamp("2026-10-16 09:00")
+    session = bars.live_bar("TCS", "1D")
+    assert session.index[0] == pd.Timestamp("2026-10-16")
+    assert session.iloc[0].tolist() == [100.0, 101.0, 99.0, 99.0, 16]
+
+
+def test_ring_buffer_keeps_the_newest_bars():
+    bars = TickAggregator({"1m": 60}, ring_size=3)
+    for minute in range(6):
+        bars.add("TCS", 100.0 + minute, 1, epoch(f"2026-10-16 09:{15 + minute}:00"))
+
+    completed = bars.frame("TCS", "1m", include_live=False)
+    assert completed.index.strftime("%H:%M").tolist() == ["09:17", "09:18", "09:19"]
+    assert completed["Close"].tolist() == [102.0, 103.0, 104.0]
+    assert bars.frame("TCS", "1m").index[-1] == pd.Timestamp("2026-10-16 09:20")
+
+
+def test_late_ticks_for_completed_buckets_are_dropped():
+    bars = TickAggregator({"1m": 60}, ring_size=3)
+    bars.add("TCS", 100.0, 1, epoch("2026-10-16 09:15:00"))
+    bars.add("TCS", 101.0, 1, epoch("2026-10-16 09:16:00"))
+    bars.add("TCS", 500.0, 1, epoch("2026-10-16 09:15:30"))
+    assert bars.frame("TCS", "1m")["High"].max() == 101.0
+
+
+def test_flush_writes_completed_bars_once(tmp_path):
+    bars = TickAggregator(TIMEFRAMES, ring_size=10, history_root=tmp_path, flush_timeframes=["1m", "5m"])
+    for second in range(0, 420, 30):
+        bars.add("TCS", 100.0 + second, 1, epoch("2026-10-16 09:15:00") + second)
+
+    # Seven completed minutes and one completed five-minute bar; live bars stay in memory
+    assert bars.flush() == 6 + 1
+    assert bars.flush() == 0
+    stored = bars._stores["1m"].read("TCS")
+    assert len(stored) == 6
+    assert stored["Volume"].tolist() == [2] * 6
+
+
+def test_failed_flush_keeps_unwritten_bars(tmp_path, monkeypatch):
+    bars = TickAggregator({"1m": 60}, ring_size=10, history_root=tmp_path, flush_timeframes=["1m"])
+    for symbol in ("INFY", "TCS"):
+        for minute in range(3):
+            bars.add(symbol, 100.0, 1, epoch(f"2026-10-16 09:{15 + minute}:00"))
+
+    store = bars._stores["1m"]
+    append = store.append
+
+    def failing_append(symbol, df):
+        if symbol == "TCS":
+            raise OSError("disk full")
+        return append(symbol, df)
+
+    monkeypatch.setattr(store, "append", failing_append)
+    with pytest.raises(OSError):
+        bars.flush()
+    assert len(store.read("INFY")) == 2
+
+    monkeypatch.setattr(store, "append", append)
+    assert bars.flush() == 2
+    assert len(store.read("TCS")) == 2
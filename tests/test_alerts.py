@@ -0,0 +1,80 @@
+"""Tests for alert rule evaluation and delivery"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+from alerts import AlertEngine, Rule
+
+END = pd.Timestamp("2026-10-16")
+
+
+class ListSink:
+    """Collects delivered alerts in a list"""
+
+    def __init__(self):
+        self.alerts = []
+        self._received = threading.Condition()
+
+    def send(self, alert):
+        with self._received:
+            self.alerts.append(alert)
+            self._received.notify_all()
+
+    def wait_for(self, count, timeout=2.0):
+        with self._received:
+            self._received.wait_for(lambda: len(self.alerts) >= count, timeout)
+        return self.alerts
+
+
+def frame(close, bars=30):
+    """Flat OHLCV frame whose last close is close"""
+    closes = np.full(bars, 100.0)
+    closes[-1] = close
+    return pd.DataFrame({"Open": closes, "High": closes, "Low": closes, "Close": closes, "Volume": 1000.0},
+                        index=pd.date_range(end=END, periods=bars, freq="D"))
+
+
+def test_rule_fires_once_per_crossing_and_rearms():
+    sink = ListSink()
+    engine = AlertEngine([Rule("TCS", "price_above", 105.0), Rule("INFY", "price_below", 50.0)], [sink])
+
+    fired = [engine.update({"TCS": frame(close)}) for close in [100.0, 106.0, 110.0, 104.0, 107.0]]
+    # Stays quiet while the price stays above, fires again once it has dropped back under
+    assert [len(alerts) for alerts in fired] == [0, 1, 0, 0, 1]
+    assert [alert.observed for alert in fired[1] + fired[4]] == [106.0, 107.0]
+    assert [alert.sequence for alert in engine.recent()] == [1, 2]
+    assert [alert.sequence for alert in engine.recent(after=1)] == [2]
+
+    delivered = sink.wait_for(2)
+    assert [(alert.symbol, alert.condition, alert.observed) for alert in delivered] == [
+        ("TCS", "price_above", 106.0), ("TCS", "price_above", 107.0)]
+
+
+def test_symbols_without_rules_are_ignored():
+    engine = AlertEngine([Rule("TCS", "price_above", 105.0)])
+    assert engine.update({"WIPRO": frame(200.0), "TCS": None}) == []
+    assert engine.recent() == []
+
+
+def test_indicator_values_drive_rsi_rules():
+    engine = AlertEngine([Rule("TCS", "rsi_below", 30.0)])
+    values = {"RSI": 25.0, "BB_upper": 120.0, "BB_lower": 80.0}
+    assert len(engine.update({"TCS": frame(100.0)}, {"TCS": values})) == 1
+    # Unknown RSI (too few bars) leaves the rule's state unchanged instead of re-arming it
+    assert engine.update({"TCS": frame(100.0)}, {"TCS": dict(values, RSI=float("nan"))}) == []
+    assert engine.update({"TCS": frame(100.0)}, {"TCS": values}) == []
+    assert engine.update({"TCS": frame(100.0)}, {"TCS": dict(values, RSI=40.0)}) == []
+    assert len(engine.update({"TCS": frame(100.0)}, {"TCS": values})) == 1
+
+
+def test_added_rule_fires_if_its_condition_already_holds():
+    engine = AlertEngine([Rule("TCS", "price_above", 105.0)])
+    engine.update({"TCS": frame(110.0)})
+    engine.add_rule(Rule("TCS", "price_above", 90.0))
+    assert [alert.value for alert in engine.update({"TCS": frame(111.0)})] == [90.0]
+    engine.remove_rule(0)
+    assert engine.update({"TCS": frame(100.0)}) == []
+    assert engine.update({"TCS": frame(80.0)}) == []
+    assert [alert.value for alert in engine.update({"TCS": frame(95.0)})] == [90.0]
@@ -0,0 +1,28 @@
+"""Tests for the vectorized strategy backtester"""
+
+import numpy as np
+import pandas as pd
+
+from backtest import bars_per_year, run_backtests
+from config import BACKTEST_CONFIG
+
+
+def test_cagr_uses_the_calendar_span():
+    # Calendar-daily closes growing 89.9% in total over exactly five years
+    index = pd.date_range("2020-01-01", "2025-01-01", freq="D")
+    closes = pd.Series(100 * 1.899 ** np.linspace(0, 1, len(index)), index=index)
+
+    results = run_backtests({"TEST": closes}, ["buy_hold"], fee_bps=0)
+    row = results.iloc[0]
+    years = (index[-1] - index[0]).days / 365.25
+    assert np.isclose(row["Total Return %"], 89.9)
+    assert np.isclose(row["CAGR %"], (1.899 ** (1 / years) - 1) * 100)
+    assert np.isclose(row["CAGR %"], 13.68, atol=0.01)
+
+
+def test_bars_per_year():
+    trading_days = pd.bdate_range("2024-01-01", periods=253)
+    assert np.isclose(bars_per_year(pd.date_range("2020-01-01", periods=366, freq="D")), 365.25)
+    assert 255 < bars_per_year(trading_days) < 265
+    assert bars_per_year(None) == BACKTEST_CONFIG["trading_days"]
+    assert bars_per_year(pd.DatetimeIndex(["2024-01-01"])) == BACKTEST_CONFIG["trading_days"]
@@ -0,0 +1,112 @@
+"""Tests for market breadth and constituent-weighted index levels"""
+
+import numpy as np
+import pytest
+
+from breadth import MarketBreadth, read_constituents
+
+INDICES = {"^NSEI": ("NIFTY 50", 1000.0), "^BSESN": ("SENSEX", 500.0), "^CNXIT": ("NIFTY IT", 100.0)}
+
+
+class DictSource:
+    """Closes and versions held in dicts"""
+
+    def __init__(self, closes):
+        self.data = {symbol: np.array(values, dtype=np.float64) for symbol, values in closes.items()}
+        self.versions = dict.fromkeys(closes, 1)
+
+    def set(self, symbol, values):
+        self.data[symbol] = np.array(values, dtype=np.float64)
+        self.versions[symbol] = self.versions.get(symbol, 0) + 1
+
+    def version(self, symbol):
+        return self.versions.get(symbol)
+
+    def closes(self, symbol, bars):
+        return self.data.get(symbol, np.empty(0))[-bars:]
+
+
+@pytest.fixture
+def constituents(tmp_path):
+    path = tmp_path / "indices.csv"
+    path.write_text("index,symbol,weight\n"
+                    "^NSEI,AAA,3\n"
+                    "^NSEI,bbb ,1\n"
+                    "^BSESN,AAA,1\n"
+                    "^BSESN,MISSING,1\n")
+    return read_constituents(path)
+
+
+def make_source():
+    return DictSource({
+        # New 52-week high, above its MA
+        "AAA": [100.0, 101.0, 102.0, 103.0, 110.0],
+        # New 52-week low, below its MA
+        "BBB": [50.0, 48.0, 46.0, 45.0, 40.0],
+        "CCC": [10.0, 10.0, 10.0, 10.0, 10.0],
+        # Too short for the 52-week window and the MA
+        "DDD": [20.0, 21.0],
+    })
+
+
+def test_read_constituents(constituents):
+    assert constituents == {"^NSEI": {"AAA": 3.0, "BBB": 1.0}, "^BSESN": {"AAA": 1.0, "MISSING": 1.0}}
+
+
+def test_snapshot_counts_the_universe(constituents):
+    breadth = MarketBreadth(make_source(), constituents, INDICES, lookback=4, ma_period=3)
+    # Constituents are read along with the requested symbols; MISSING has no data
+    assert breadth.refresh(["CCC", "DDD"]) == 4
+    assert breadth.snapshot() == {
+        "symbols": 4,
+        "advances": 2,
+        "declines": 1,
+        "unchanged": 1,
+        "new_highs": 1,
+        "new_lows": 1,
+        "above_ma_pct": pytest.approx(100 / 3),
+    }
+
+
+def test_index_levels_weight_constituents(constituents):
+    breadth = MarketBreadth(make_source(), constituents, INDICES, lookback=4, ma_period=3)
+    breadth.refresh([])
+    levels = breadth.index_levels().set_index("Index")
+
+    # 1000 x (0.75 x 110/100 + 0.25 x 40/50), against 1000 x (0.75 x 103/100 + 0.25 x 45/50) a bar earlier
+    assert levels.loc["NIFTY 50", "Value"] == pytest.approx(1025.0)
+    assert levels.loc["NIFTY 50", "Change"] == pytest.approx(27.5)
+    assert levels.loc["NIFTY 50", "Change %"] == pytest.approx((1025.0 / 997.5 - 1) * 100)
+    # MISSING is left out and the remaining weight renormalized
+    assert levels.loc["SENSEX", "Value"] == pytest.approx(550.0)
+    # No constituent has data
+    assert "NIFTY IT" not in levels.index
+
+
+def test_refresh_rereads_changed_symbols_only(constituents):
+    source = make_source()
+    breadth = MarketBreadth(source, constituents, INDICES, lookback=4, ma_period=3)
+    breadth.refresh(["CCC", "DDD"])
+    assert breadth.refresh(["CCC", "DDD"]) == 0
+
+    source.set("CCC", [10.0, 10.0, 10.0, 10.0, 9.0])
+    assert breadth.refresh(["CCC", "DDD"]) == 1
+    assert breadth.snapshot()["declines"] == 2
+
+    # A live price only moves the latest close; unknown symbols are ignored
+    breadth.update_prices({"BBB": 46.0, "ZZZ": 1.0, "AAA": float("nan")})
+    snapshot = breadth.snapshot()
+    # BBB is no longer a new low; CCC now is
+    assert (snapshot["advances"], snapshot["declines"], snapshot["new_lows"]) == (3, 1, 1)
+    assert breadth.index_levels().set_index("Index").loc["NIFTY 50", "Value"] == pytest.approx(1055.0)
+
+
+def test_stored_index_closes_anchor_the_level(constituents):
+    source = make_source()
+    source.set("^NSEI", [2000.0, 2010.0, 2020.0, 2030.0, 2100.0])
+    breadth = MarketBreadth(source, constituents, INDICES, lookback=4, ma_period=3, anchor_levels=True)
+    breadth.refresh([])
+
+    levels = breadth.index_levels().set_index("Index")
+    assert levels.loc["NIFTY 50", "Value"] == pytest.approx(2050.0)
+    assert levels.loc["SENSEX", "Value"] == pytest.approx(550.0)
@@ -0,0 +1,71 @@
+"""Tests for the per-render data context"""
+
+import numpy as np
+import pandas as pd
+
+from data_access import RenderDataContext, slice_period
+from market_data import create_sample_data
+
+END = pd.Timestamp("2026-10-16")
+
+
+class RecordingLoader:
+    """Batch loader of sample frames that records every call"""
+
+    def __init__(self, empty=()):
+        self.calls = []
+        self.empty = set(empty)
+
+    def __call__(self, symbols, period):
+        self.calls.append((list(symbols), period))
+        return {
+            symbol: (None, {}) if symbol in self.empty else
+            (create_sample_data(symbol, period, end=END), {"period": period})
+            for symbol in symbols
+        }
+
+
+def test_slice_period_counts_back_from_the_newest_bar():
+    df = create_sample_data("TCS", "1y", end=END)
+    window = slice_period(df, "1M")
+    assert window.index[-1] == END
+    assert window.index[0] >= END - pd.Timedelta(days=30)
+    assert len(df.loc[END - pd.Timedelta(days=30):]) == len(window)
+    # A view of the longer frame, not a copy
+    assert np.shares_memory(window['Close'].to_numpy(), df['Close'].to_numpy())
+
+
+def test_each_symbol_and_period_is_loaded_once_per_render():
+    loader = RecordingLoader()
+    context = RenderDataContext(loader)
+
+    frames = context.get_batch(["TCS", "INFY", "TCS"], "1y")
+    assert list(frames) == ["TCS", "INFY"]
+    assert context.get("TCS", "1Y") is frames["TCS"]
+    context.get_batch(["INFY"], "1y")
+    assert loader.calls == [(["TCS", "INFY"], "1y")]
+
+
+def test_shorter_periods_are_sliced_from_loaded_ones():
+    loader = RecordingLoader()
+    context = RenderDataContext(loader)
+    context.get_batch(["TCS"], "3mo")
+    context.get_batch(["TCS"], "5y")
+    loader.calls.clear()
+
+    frames = context.get_batch(["TCS", "INFY"], "1mo")
+    # Only the symbol without a longer window goes to the loader
+    assert loader.calls == [(["INFY"], "1mo")]
+    data, info = frames["TCS"]
+    # Cut from the shortest window that covers the period
+    assert info == {"period": "3mo"}
+    assert data.index[0] >= END - pd.Timedelta(days=30)
+    assert data.equals(slice_period(context.get("TCS", "3mo")[0], "1mo"))
+
+
+def test_missing_frames_are_not_sliced():
+    loader = RecordingLoader(empty={"TCS"})
+    context = RenderDataContext(loader)
+    assert context.get("TCS", "1y") == (None, {})
+    context.get("TCS", "1mo")
+    assert loader.calls == [(["TCS"], "1y"), (["TCS"], "1mo")]
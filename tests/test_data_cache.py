@@ -0,0 +1,36 @@
+"""Tests for the two-tier market data cache"""
+
+from data_cache import SAMPLE_SOURCE, MarketDataCache, SQLiteCache
+from market_data import create_sample_data
+
+
+def test_live_results_are_cached():
+    cache = MarketDataCache()
+    df = create_sample_data("TCS", "1mo")
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return df, {"source": "NSE"}
+
+    cache.get_or_fetch("TCS", "1mo", "live", fetch)
+    data, info = cache.get_or_fetch("TCS", "1M", "live", fetch)
+    assert len(calls) == 1
+    assert info["source"] == "NSE"
+    assert cache.get("TCS", "1mo", "sample") is None
+
+
+def test_sample_fallbacks_are_not_cached(tmp_path):
+    cache = MarketDataCache(shared=SQLiteCache(tmp_path / "cache.sqlite"))
+    df = create_sample_data("TCS", "1mo")
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return df, {"source": SAMPLE_SOURCE}
+
+    cache.get_or_fetch("TCS", "1mo", "live", fetch)
+    cache.get_or_fetch("TCS", "1mo", "live", fetch)
+    assert len(calls) == 2
+    assert cache.get("TCS", "1mo", "live") is None
+    assert cache.shared.get(("TCS", "1mo", "live")) is None
@@ -0,0 +1,72 @@
+"""Tests for chart downsampling"""
+
+import numpy as np
+import pandas as pd
+
+from downsample import bucket_starts, lttb_indices, resample_ohlc
+from market_data import create_sample_data
+
+END = pd.Timestamp("2026-10-16")
+
+
+def test_buckets_align_to_the_newest_bar():
+    # 10 bars into 4 buckets of 3: the short bucket is the oldest one
+    assert bucket_starts(10, 4).tolist() == [0, 1, 4, 7]
+    assert bucket_starts(9, 3).tolist() == [0, 3, 6]
+    assert bucket_starts(5, 10).tolist() == [0, 1, 2, 3, 4]
+
+
+def test_resampled_bars_keep_the_ohlc_invariants():
+    df = create_sample_data("TCS", "5y", end=END)
+    bars = resample_ohlc(df, 200)
+
+    assert len(bars) <= 200
+    assert bars.index[0] == df.index[0]
+    assert bars['Open'].iloc[0] == df['Open'].iloc[0]
+    assert bars['Close'].iloc[-1] == df['Close'].iloc[-1]
+    assert (bars['High'] >= bars[['Open', 'Close']].max(axis=1)).all()
+    assert (bars['Low'] <= bars[['Open', 'Close']].min(axis=1)).all()
+    assert bars['High'].max() == df['High'].max()
+    assert bars['Low'].min() == df['Low'].min()
+    assert bars['Volume'].sum() == df['Volume'].sum()
+
+
+def test_resampled_buckets_aggregate_their_bars():
+    index = pd.date_range(end=END, periods=10, freq="D")
+    df = pd.DataFrame({
+        'Open': np.arange(10.0),
+        'High': np.arange(10.0) + 5,
+        'Low': np.arange(10.0) - 5,
+        'Close': np.arange(10.0) + 1,
+        'Volume': np.full(10, 100),
+    }, index=index)
+
+    bars = resample_ohlc(df, 4)
+    assert bars.index.tolist() == index[[0, 1, 4, 7]].tolist()
+    assert bars['Open'].tolist() == [0.0, 1.0, 4.0, 7.0]
+    assert bars['High'].tolist() == [5.0, 8.0, 11.0, 14.0]
+    assert bars['Low'].tolist() == [-5.0, -4.0, -1.0, 2.0]
+    assert bars['Close'].tolist() == [1.0, 4.0, 7.0, 10.0]
+    assert bars['Volume'].tolist() == [100, 300, 300, 300]
+    # Short frames are left alone
+    assert resample_ohlc(df, 10) is df
+
+
+def test_lttb_keeps_the_ends_and_the_shape():
+    rng = np.random.default_rng(7)
+    y = rng.normal(size=1000).cumsum()
+    y[:20] = np.nan
+    y[500] = 1000.0
+
+    kept = lttb_indices(y, 100)
+    assert len(kept) == 100
+    assert kept[0] == 20 and kept[-1] == 999
+    assert (np.diff(kept) > 0).all()
+    # A spike is the largest triangle of its bucket
+    assert 500 in kept
+
+
+def test_lttb_returns_short_series_whole():
+    y = np.array([np.nan, 1.0, 2.0, np.nan, 3.0])
+    assert lttb_indices(y, 10).tolist() == [1, 2, 4]
+    assert lttb_indices(np.arange(50.0), 2).tolist() == list(range(50))
@@ -0,0 +1,31 @@
+"""Tests for the columnar history store"""
+
+from history_store import HistoryStore
+from market_data import create_sample_data
+
+
+def test_append_writes_only_new_bars(tmp_path):
+    store = HistoryStore(tmp_path)
+    df = create_sample_data("TCS", "1mo")
+
+    assert store.append("TCS", df.iloc[:10]) == 10
+    assert store.append("TCS", df) == len(df) - 10
+    assert store.append("TCS", df) == 0
+    assert store.read("TCS").index.equals(df.index)
+
+
+def test_append_backfills_older_bars(tmp_path):
+    store = HistoryStore(tmp_path)
+    df = create_sample_data("TCS", "1y")
+
+    assert store.append("TCS", df.iloc[-2:]) == 2
+    assert not store.covers("TCS", "1y")
+
+    assert store.append("TCS", df) == len(df) - 2
+    assert store.covers("TCS", "1y")
+    assert store.symbols() == ["TCS"]
+
+    stored = store.read("TCS")
+    assert stored.index.equals(df.index)
+    assert (stored["Close"].to_numpy() == df["Close"].to_numpy()).all()
+    assert (stored["Volume"].to_numpy() == df["Volume"].to_numpy()).all()
@@ -0,0 +1,113 @@
+"""Tests for the pooled HTTP client's backoff, retries and per-host cap, using a stub session"""
+
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+import requests
+
+import http_client
+from config import API_CONFIG
+
+HOST = "stub.test"
+URL = f"https://{HOST}/quote"
+
+
+class StubSession:
+    """Answers GETs from a list of responses (or exceptions), recording concurrency"""
+
+    def __init__(self, responses=(), delay=0.0):
+        self.responses = list(responses)
+        self.delay = delay
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def get(self, url, **kwargs):
+        with self._lock:
+            self.calls += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            response = self.responses.pop(0) if self.responses else response_with(200)
+        time.sleep(self.delay)
+        with self._lock:
+            self.in_flight -= 1
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+def response_with(status, retry_after=None):
+    headers = {"Retry-After": str(retry_after)} if retry_after is not None else {}
+    return SimpleNamespace(status_code=status, headers=headers, close=lambda: None)
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    """Install a stub session for HOST and record backoff sleeps instead of sleeping"""
+    sleeps = []
+    session = StubSession()
+    monkeypatch.setitem(http_client._sessions, HOST, session)
+    monkeypatch.setitem(http_client._host_limits, HOST, threading.BoundedSemaphore(API_CONFIG["max_per_host"]))
+    monkeypatch.setattr(http_client, "time", SimpleNamespace(sleep=sleeps.append))
+    session.sleeps = sleeps
+    return session
+
+
+def test_backoff_jitter_stays_under_the_exponential_ceiling():
+    for attempt in range(4):
+        ceiling = API_CONFIG["backoff_base"] * 2 ** attempt
+        delays = [http_client.backoff_delay(attempt) for _ in range(200)]
+        assert all(0 <= delay <= ceiling for delay in delays)
+        # Full jitter spreads delays over the whole range
+        assert max(delays) > ceiling / 2
+
+
+def test_backoff_is_capped():
+    delays = [http_client.backoff_delay(20) for _ in range(200)]
+    assert all(delay <= API_CONFIG["backoff_max"] for delay in delays)
+
+
+def test_backoff_honours_retry_after_up_to_the_cap():
+    assert all(http_client.backoff_delay(0, retry_after=5) >= 5 for _ in range(50))
+    assert http_client.backoff_delay(0, retry_after=600) <= API_CONFIG["backoff_max"]
+
+
+def test_retries_retryable_statuses_then_returns(stub):
+    stub.responses = [response_with(503), response_with(429, retry_after=3), response_with(200)]
+    assert http_client.get(URL).status_code == 200
+    assert stub.calls == 3
+    assert len(stub.sleeps) == 2
+    assert stub.sleeps[1] >= 3
+
+
+def test_returns_the_last_response_after_max_retries(stub):
+    stub.responses = [response_with(500)] * (API_CONFIG["max_retries"] + 1)
+    assert http_client.get(URL).status_code == 500
+    assert stub.calls == API_CONFIG["max_retries"] + 1
+
+
+def test_non_retryable_status_is_returned_at_once(stub):
+    stub.responses = [response_with(404)]
+    assert http_client.get(URL).status_code == 404
+    assert stub.calls == 1 and not stub.sleeps
+
+
+def test_connection_errors_are_retried_then_raised(stub):
+    stub.responses = [requests.ConnectionError()] * (API_CONFIG["max_retries"] + 1)
+    with pytest.raises(requests.ConnectionError):
+        http_client.get(URL)
+    assert stub.calls == API_CONFIG["max_retries"] + 1
+
+
+def test_per_host_concurrency_is_capped(stub):
+    stub.delay = 0.02
+    threads = [threading.Thread(target=http_client.get, args=(URL,)) for _ in range(API_CONFIG["max_per_host"] * 3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert stub.calls == len(threads)
+    assert stub.max_in_flight == API_CONFIG["max_per_host"]
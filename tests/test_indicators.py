@@ -0,0 +1,39 @@
+"""Tests for the incremental indicator engine"""
+
+import numpy as np
+import pandas as pd
+
+from alerts import frame_metrics
+from indicators import INDICATOR_COLUMNS, IndicatorEngine, calculate_indicators
+from market_data import create_sample_data
+
+END = pd.Timestamp("2026-10-16")
+
+
+def test_engine_matches_batch_indicators():
+    df = create_sample_data("INFY", "1y", end=END)
+    engine = IndicatorEngine()
+    engine.update_frame("INFY", "1y", df.iloc[:-5])
+    latest = engine.update_frame("INFY", "1y", df)
+
+    expected = calculate_indicators(df.copy()).iloc[-1]
+    for column in INDICATOR_COLUMNS:
+        assert np.isclose(latest[column], expected[column])
+
+
+def test_engine_keeps_periods_apart():
+    engine = IndicatorEngine()
+    engine.update_frame("INFY", "1d", create_sample_data("INFY", "1d", end=END))
+    latest = engine.update_frame("INFY", "1y", create_sample_data("INFY", "1y", end=END))
+
+    assert not any(np.isnan(latest[column]) for column in INDICATOR_COLUMNS)
+    assert np.isnan(engine.latest("INFY", "1d")["RSI"])
+    assert engine.latest("INFY", "5d") is None
+
+
+def test_frame_metrics_use_engine_values():
+    frames = [create_sample_data(symbol, "1y", end=END) for symbol in ("INFY", "TCS")]
+    engine = IndicatorEngine()
+    latest = [engine.update_frame("INFY", "1y", frames[0]), None]
+
+    assert np.allclose(frame_metrics(frames, latest=latest), frame_metrics(frames), equal_nan=True)
@@ -0,0 +1,47 @@
+"""Tests for the background ingestion worker's schedule"""
+
+import time
+
+import pandas as pd
+
+from ingestion import IngestionWorker, MarketDataStore
+from market_data import create_sample_data
+
+
+def fetch(symbol, period, start=None):
+    return create_sample_data(symbol, period), {"source": "NSE"}
+
+
+def test_scheduled_keys_poll_slowly_until_a_session_reads_them():
+    worker = IngestionWorker(MarketDataStore(), poll_interval=30, fetch=fetch)
+    worker.schedule(["TCS"], "1y", 900)
+    worker.poll_once()
+
+    assert worker.peek(["TCS"], "1y")["TCS"][0] is not None
+    assert worker._next_poll[("TCS", "1y")] > time.monotonic() + 800
+
+    worker.track("TCS", "1y")
+    assert worker._next_poll[("TCS", "1y")] <= time.monotonic() + 30
+
+
+def test_peek_neither_tracks_nor_waits():
+    worker = IngestionWorker(MarketDataStore(), fetch=fetch)
+    started = time.monotonic()
+    assert worker.peek(["INFY"], "1y") == {"INFY": (None, {})}
+    assert time.monotonic() - started < 1
+    assert ("INFY", "1y") not in worker._last_read
+
+
+def test_stale_streamed_bar_is_dropped_after_a_newer_poll():
+    history = create_sample_data("TCS", "1mo", end=pd.Timestamp("2026-10-16"))
+    worker = IngestionWorker(MarketDataStore(), fetch=lambda symbol, period, start=None: (history, {"source": "NSE"}))
+    worker.track("TCS", "1mo")
+    # Yesterday's streamed session bar, far above anything polled
+    stale = pd.DataFrame({"Open": [1e6], "High": [1e6], "Low": [1e6], "Close": [1e6], "Volume": [1]},
+                         index=pd.DatetimeIndex([history.index[-2]]))
+    worker.apply_bars({"TCS": stale})
+    worker.poll_once()
+
+    data, _ = worker.peek(["TCS"], "1mo")["TCS"]
+    assert data["Close"].max() < 1e6
+    assert "TCS" not in worker._live_bars
@@ -0,0 +1,77 @@
+"""Tests for sample data generation and batch fetching"""
+
+import threading
+import time
+
+import pandas as pd
+
+from market_data import create_sample_data, fetch_batch
+
+END = pd.Timestamp("2026-10-16")
+
+
+def test_sample_periods_share_recent_bars():
+    longest = create_sample_data("RELIANCE", "5y", end=END)
+    for period in ("1d", "5d", "1mo", "1y"):
+        df = create_sample_data("RELIANCE", period, end=END)
+        assert df["Close"].iloc[-1] == longest["Close"].iloc[-1]
+        pd.testing.assert_frame_equal(df, longest.loc[df.index])
+
+
+def test_sample_bars_are_consistent():
+    df = create_sample_data("TCS", "1y", end=END)
+    assert (df["High"] >= df[["Open", "Close"]].max(axis=1)).all()
+    assert (df["Low"] <= df[["Open", "Close"]].min(axis=1)).all()
+    assert (df["Volume"] > 0).all()
+
+
+class SlowFetch:
+    """Fake fetch sleeping per symbol and recording how many calls overlap"""
+
+    def __init__(self, delays):
+        self.delays = delays
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self.release = threading.Event()
+
+    def __call__(self, symbol, period):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            delay = self.delays.get(symbol, 0.0)
+            if delay is None:
+                # A straggler that only finishes once the test lets it go
+                self.release.wait(5)
+            else:
+                time.sleep(delay)
+            if symbol == "BROKEN":
+                raise ValueError("upstream error")
+            return create_sample_data(symbol, period), {"source": "NSE"}
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+def test_fetch_batch_returns_stragglers_empty_at_the_deadline():
+    fetch = SlowFetch({"SLOW": None})
+    started = time.monotonic()
+    results = fetch_batch(["TCS", "SLOW", "BROKEN", "INFY"], "1mo", fetch=fetch, max_workers=4, timeout=0.3)
+    elapsed = time.monotonic() - started
+    fetch.release.set()
+
+    assert elapsed < 2
+    assert list(results) == ["TCS", "SLOW", "BROKEN", "INFY"]
+    assert results["SLOW"] == (None, {})
+    assert results["BROKEN"] == (None, {})
+    assert results["TCS"][1] == {"source": "NSE"} and not results["INFY"][0].empty
+
+
+def test_fetch_batch_respects_max_concurrency():
+    symbols = [f"SYM{i}" for i in range(12)]
+    fetch = SlowFetch({symbol: 0.03 for symbol in symbols})
+    results = fetch_batch(symbols, "1mo", fetch=fetch, max_workers=3, timeout=5)
+
+    assert all(data is not None for data, _ in results.values())
+    assert fetch.max_in_flight == 3
@@ -0,0 +1,83 @@
+"""Tests for stage timings, the performance summary and the Prometheus endpoint"""
+
+import urllib.error
+import urllib.request
+
+import pytest
+
+from metrics import Metrics
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = Metrics(buckets=[0.1, 0.01, 1], window=5)
+    for seconds in (0.005, 0.01, 0.05, 2.0):
+        registry.observe("fetch", seconds, source="nse")
+
+    lines = registry.prometheus().splitlines()
+    assert lines[:2] == ["# HELP dashboard_stage_seconds Duration of instrumented dashboard stages",
+                         "# TYPE dashboard_stage_seconds histogram"]
+    # A duration on a bound counts in that bound's bucket
+    assert lines[2:] == [
+        'dashboard_stage_seconds_bucket{stage="fetch",source="nse",le="0.01"} 2',
+        'dashboard_stage_seconds_bucket{stage="fetch",source="nse",le="0.1"} 3',
+        'dashboard_stage_seconds_bucket{stage="fetch",source="nse",le="1"} 3',
+        'dashboard_stage_seconds_bucket{stage="fetch",source="nse",le="+Inf"} 4',
+        'dashboard_stage_seconds_sum{stage="fetch",source="nse"} 2.065000',
+        'dashboard_stage_seconds_count{stage="fetch",source="nse"} 4',
+    ]
+
+
+def test_counters_and_label_escaping():
+    registry = Metrics(buckets=[1])
+    registry.increment("cache_hits", mode="live")
+    registry.increment("cache_hits", 2, mode="live")
+    registry.increment("cache_hits", mode="sample")
+    registry.observe("render", 0.5, tab='say "hi"\\')
+
+    text = registry.prometheus()
+    assert text.endswith("\n")
+    assert text.count("# TYPE dashboard_cache_hits_total counter") == 1
+    assert 'dashboard_cache_hits_total{mode="live"} 3\n' in text
+    assert 'dashboard_cache_hits_total{mode="sample"} 1\n' in text
+    assert 'dashboard_stage_seconds_count{stage="render",tab="say \\"hi\\"\\\\"} 1\n' in text
+    assert registry.counter("cache_hits") == 4
+    assert registry.counter("cache_hits", mode="live") == 3
+
+
+def test_summary_uses_the_latest_durations():
+    registry = Metrics(buckets=[1], window=5)
+    for ms in range(1, 11):
+        registry.observe("indicators", ms / 1000, symbol="TCS", path="incremental")
+    registry.observe("indicators", 0.002, symbol="INFY", path="incremental")
+    registry.observe("rerun", 0.1)
+
+    table = registry.summary().set_index(["Stage", "Detail"])
+    # Calls count every duration; percentiles only the window of 5 per series
+    assert table.loc[("indicators", "incremental"), "Calls"] == 11
+    assert table.loc[("rerun", ""), "p50 ms"] == pytest.approx(100.0)
+    assert table.index[0] == ("rerun", "")
+
+    per_symbol = registry.summary(per_symbol=True).set_index(["Stage", "Symbol"])
+    row = per_symbol.loc[("indicators", "TCS")]
+    assert row["Calls"] == 10
+    assert row["p50 ms"] == pytest.approx(8.0)
+    assert row["p95 ms"] == pytest.approx(9.8)
+    assert row["Max ms"] == pytest.approx(10.0)
+    assert ("rerun", None) not in per_symbol.index
+
+
+def test_endpoint_serves_the_text_format():
+    registry = Metrics(buckets=[0.1])
+    registry.observe("chart", 0.05, symbol="TCS")
+    server = registry.serve("127.0.0.1", 0)
+    host, port = server.server_address[:2]
+    try:
+        with urllib.request.urlopen(f"http://{host}:{port}/metrics", timeout=5) as response:
+            assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+            assert response.read().decode() == registry.prometheus()
+        with pytest.raises(urllib.error.HTTPError) as error:
+            urllib.request.urlopen(f"http://{host}:{port}/", timeout=5)
+        assert error.value.code == 404
+    finally:
+        server.shutdown()
+        server.server_close()
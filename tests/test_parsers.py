@@ -0,0 +1,42 @@
+"""Tests for the MoneyControl and BSE response parsers, against the recorded fixtures"""
+
+import pytest
+
+import parsers
+from bench.parsing import load_fixture
+
+# Values the fixtures are known to contain
+EXPECTED_BSE_QUOTE = {
+    "Close": 2512.35,
+    "Open": 2501.00,
+    "High": 2520.80,
+    "Low": 2495.55,
+    "PrevClose": 2498.10,
+    "Volume": 456789.0,
+}
+EXPECTED_HISTORY_BARS = 250
+
+
+def test_parse_udf_history():
+    history = parsers.parse_udf_history(load_fixture("moneycontrol_history.json"))
+    assert len(history) == EXPECTED_HISTORY_BARS
+    assert list(history.columns) == parsers.OHLCV_COLUMNS
+    assert history.index.is_monotonic_increasing
+    assert (history['High'] >= history[['Open', 'Close']].max(axis=1)).all()
+
+
+def test_parse_bse_quote():
+    assert parsers.parse_bse_quote(load_fixture("bse_quote.html")) == EXPECTED_BSE_QUOTE
+
+
+@pytest.mark.skipif(parsers.etree is None, reason="lxml is not installed")
+def test_parse_bse_quote_xpath_fallback(monkeypatch):
+    # Hide the quote ids from the regexes so the XPath path runs
+    monkeypatch.setattr(parsers, "_BSE_QUOTE_PATTERNS", {})
+    assert parsers.parse_bse_quote(load_fixture("bse_quote.html")) == EXPECTED_BSE_QUOTE
+
+
+def test_quote_to_bar():
+    bar = parsers.quote_to_bar(EXPECTED_BSE_QUOTE)
+    assert list(bar.columns) == parsers.OHLCV_COLUMNS
+    assert len(bar) == 1
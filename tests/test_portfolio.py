@@ -0,0 +1,110 @@
+"""Tests for trade replay, return alignment and portfolio risk"""
+
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from portfolio import Portfolio, Trade, aligned_returns, read_trades, replay_trades
+
+LEDGER = [
+    Trade(pd.Timestamp("2026-01-05"), "TCS", "BUY", 10.0, 100.0),
+    Trade(pd.Timestamp("2026-01-06"), "TCS", "BUY", 10.0, 120.0),
+    Trade(pd.Timestamp("2026-01-07"), "TCS", "SELL", 5.0, 130.0),
+    Trade(pd.Timestamp("2026-01-07"), "INFY", "BUY", 4.0, 50.0),
+    Trade(pd.Timestamp("2026-01-08"), "WIPRO", "BUY", 3.0, 40.0),
+    Trade(pd.Timestamp("2026-01-09"), "WIPRO", "SELL", 3.0, 30.0),
+]
+
+
+def test_replay_averages_buys_and_books_partial_sells():
+    book = replay_trades(LEDGER)
+    # Two buys average to 110; selling 5 at 130 books 5 x 20 and keeps the average cost
+    assert book["TCS"] == (15.0, 110.0, 100.0)
+    assert book["INFY"] == (4.0, 50.0, 0.0)
+    assert book["WIPRO"] == (0.0, 40.0, -30.0)
+
+
+def test_selling_more_than_held_is_rejected():
+    trades = LEDGER[:2] + [Trade(pd.Timestamp("2026-01-07"), "TCS", "SELL", 25.0, 130.0)]
+    with pytest.raises(ValueError, match="selling 25 TCS but only 20 held"):
+        replay_trades(trades)
+    # Nothing held at all is a short sale too
+    with pytest.raises(ValueError, match="only 0 held"):
+        replay_trades([Trade(pd.Timestamp("2026-01-05"), "INFY", "SELL", 1.0, 50.0)])
+
+
+def test_read_trades_sorts_by_date_and_reports_the_line(tmp_path):
+    path = tmp_path / "holdings.csv"
+    path.write_text("date,symbol,side,quantity,price\n"
+                    "2026-01-07,tcs,sell,5,130\n"
+                    "2026-01-05,TCS,BUY,10,100\n"
+                    "2026-01-06, TCS ,Buy,10,120\n")
+    trades = read_trades(path)
+    assert [trade.date for trade in trades] == list(pd.to_datetime(["2026-01-05", "2026-01-06", "2026-01-07"]))
+    assert {trade.symbol for trade in trades} == {"TCS"}
+    assert replay_trades(trades)["TCS"] == (15.0, 110.0, 100.0)
+
+    path.write_text("date,symbol,side,quantity,price\n2026-01-05,TCS,BUY,10,100\n2026-01-06,TCS,HOLD,1,1\n")
+    with pytest.raises(ValueError, match=r"holdings.csv:3: unknown side 'HOLD'"):
+        read_trades(path)
+
+
+def test_returns_are_aligned_on_the_benchmark_dates():
+    dates = pd.date_range("2026-01-05", periods=5)
+    # The benchmark has no first day; a symbol named like it must not be mistaken for it
+    benchmark = pd.Series([100.0, 110.0, 99.0, 99.0], index=dates[1:], name="TCS")
+    closes = {
+        # Traded before the benchmark starts and missing the fourth day
+        "TCS": pd.Series([1.0, 10.0, 11.0, 22.0], index=dates[[0, 1, 2, 4]]),
+        # Listed on the fourth day
+        "INFY": pd.Series([5.0, 10.0], index=dates[3:]),
+    }
+
+    returns, market = aligned_returns(closes, benchmark)
+    np.testing.assert_allclose(market, [0.1, -0.1, 0.0])
+    # The missing day carries the price forward; days before the first price count as zero
+    np.testing.assert_allclose(returns, [[0.1, 0.0], [0.0, 0.0], [1.0, 1.0]])
+
+
+def test_summary_moves_with_prices_of_open_positions():
+    portfolio = Portfolio(LEDGER)
+    assert portfolio.symbols == ["INFY", "TCS", "WIPRO"]
+    assert portfolio.open_symbols == ["INFY", "TCS"]
+
+    portfolio.update_prices({"TCS": 120.0, "INFY": 55.0, "WIPRO": 35.0, "HDFC": 1.0})
+    portfolio.update_prices({"TCS": 130.0, "INFY": float("nan")})
+    summary = portfolio.summary()
+    assert summary["market_value"] == pytest.approx(15 * 130 + 4 * 55)
+    assert summary["cost_basis"] == pytest.approx(15 * 110 + 4 * 50)
+    assert summary["unrealized"] == pytest.approx(15 * 20 + 4 * 5)
+    assert summary["realized"] == pytest.approx(70.0)
+    assert summary["total"] == pytest.approx(390.0)
+    np.testing.assert_allclose(portfolio.weights(), np.array([220.0, 1950.0, 0.0]) / 2170)
+
+
+def test_risk_uses_completed_bars_only():
+    dates = pd.date_range("2026-01-05", periods=6)
+    benchmark = pd.Series([100.0, 102.0, 99.0, 101.0, 104.0, 150.0], index=dates)
+    # TCS moves like the benchmark, INFY twice as much; the forming last bar is an outlier
+    market_returns = benchmark.pct_change().iloc[1:-1].to_numpy()
+    closes = {
+        "TCS": benchmark * 2,
+        "INFY": pd.Series(np.r_[50.0, 50.0 * np.cumprod(1 + 2 * market_returns), 1.0], index=dates),
+    }
+    portfolio = Portfolio(LEDGER)
+    portfolio.update_prices({"TCS": 100.0, "INFY": 375.0})
+
+    risk = portfolio.risk(closes, benchmark, confidence=0.95)
+    assert risk["observations"] == 4
+    np.testing.assert_allclose(risk["betas"], [2.0, 1.0, np.nan])
+    # Half the value is in each position, so the portfolio moves 1.5x the benchmark
+    assert risk["beta"] == pytest.approx(1.5)
+    daily_volatility = 1.5 * market_returns.std(ddof=1)
+    assert risk["volatility"] == pytest.approx(daily_volatility * np.sqrt(252))
+    assert risk["var_parametric"] == pytest.approx(NormalDist().inv_cdf(0.95) * daily_volatility * 3000)
+    assert risk["var_historical"] == pytest.approx(-np.quantile(1.5 * market_returns, 0.05) * 3000)
+
+    assert portfolio.risk({"HDFC": benchmark}, benchmark) is None
+    assert portfolio.risk(closes, benchmark.iloc[:2]) is None
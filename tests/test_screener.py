@@ -0,0 +1,46 @@
+"""Tests for the vectorized universe screener"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from config import INDICATORS_CONFIG
+from history_store import HistoryStore
+from indicators import MA_LONG, MA_SHORT, calculate_indicators
+from market_data import create_sample_data
+from screener import HistorySource, rolling_mean, rolling_rsi, rolling_std
+
+END = pd.Timestamp("2026-10-16")
+
+
+def test_history_universe_excludes_indices(tmp_path):
+    store = HistoryStore(tmp_path)
+    for symbol in ("TCS", "^NSEI", "^BSESN", "INFY"):
+        store.append(symbol, create_sample_data(symbol, "5d"))
+
+    assert HistorySource(store).symbols() == ["INFY", "TCS"]
+
+
+@pytest.mark.parametrize("smoothing", ["sma", "wilder"])
+def test_vectorized_indicators_match_calculate_indicators(smoothing):
+    config = dict(INDICATORS_CONFIG, rsi_smoothing=smoothing)
+    frames = {symbol: create_sample_data(symbol, "1y", end=END) for symbol in ("TCS", "INFY", "ITC")}
+    # A short history is padded with NaN on the left, as in a scan
+    frames["ITC"] = frames["ITC"].iloc[-120:]
+    bars = max(len(df) for df in frames.values())
+    closes = np.full((len(frames), bars), np.nan)
+    for row, df in enumerate(frames.values()):
+        closes[row, bars - len(df):] = df["Close"].to_numpy()
+
+    vectorized = {
+        MA_SHORT: rolling_mean(closes, config["ma_short"]),
+        MA_LONG: rolling_mean(closes, config["ma_long"]),
+        "RSI": rolling_rsi(closes, config["rsi_period"], smoothing),
+        "BB_std": rolling_std(closes, config["bb_period"]),
+    }
+    for row, df in enumerate(frames.values()):
+        expected = calculate_indicators(df.copy(), config)
+        expected["BB_std"] = (expected["BB_upper"] - expected["BB_middle"]) / config["bb_std"]
+        for column, values in vectorized.items():
+            np.testing.assert_allclose(values[row, bars - len(df):], expected[column].to_numpy(),
+                                       rtol=1e-9, atol=1e-9, err_msg=f"{column} ({smoothing})")
@@ -0,0 +1,98 @@
+"""Tests for the per-source circuit breakers, driven by an injected clock"""
+
+from source_health import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, SourceHealth
+
+
+class Clock:
+    """Monotonic clock that only moves when told to"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+def make_breaker(clock):
+    return CircuitBreaker("test", failure_threshold=3, recovery_timeout=60, window=10, clock=clock)
+
+
+def trip(breaker):
+    for _ in range(breaker.failure_threshold):
+        assert breaker.allow()
+        breaker.record_failure(1.0)
+
+
+def test_closed_open_half_open_closed():
+    clock = Clock()
+    breaker = make_breaker(clock)
+    assert breaker.state == CLOSED
+
+    breaker.record_failure(1.0)
+    breaker.record_failure(1.0)
+    assert breaker.state == CLOSED
+    breaker.record_failure(1.0)
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+
+    clock.advance(59.9)
+    assert breaker.state == OPEN
+    clock.advance(0.1)
+    assert breaker.state == HALF_OPEN
+
+    # Half-open admits a single trial call
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_success(0.2)
+    assert breaker.state == CLOSED
+    assert breaker.allow()
+
+
+def test_failed_trial_call_reopens_for_another_recovery_period():
+    clock = Clock()
+    breaker = make_breaker(clock)
+    trip(breaker)
+    clock.advance(60)
+    assert breaker.allow()
+
+    breaker.record_failure(1.0)
+    assert breaker.state == OPEN
+    clock.advance(59)
+    assert not breaker.allow()
+    clock.advance(1)
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow()
+
+
+def test_success_resets_the_failure_count():
+    breaker = make_breaker(Clock())
+    breaker.record_failure(1.0)
+    breaker.record_failure(1.0)
+    breaker.record_success(1.0)
+    breaker.record_failure(1.0)
+    breaker.record_failure(1.0)
+    assert breaker.state == CLOSED
+
+
+def test_ranked_orders_by_state_then_expected_cost():
+    clock = Clock()
+    health = SourceHealth(clock=clock)
+    names = ["slow", "fast", "dead", "untried", "flaky"]
+
+    health.breaker("slow").record_success(2.0)
+    health.breaker("fast").record_success(0.5)
+    trip(health.breaker("dead"))
+    flaky = health.breaker("flaky")
+    flaky.record_success(0.5)
+    flaky.record_failure(0.5)
+
+    # Untried sources cost 0; flaky costs 0.5 / 0.5 = 1.0; dead is open
+    assert health.ranked(names) == ["untried", "fast", "flaky", "slow", "dead"]
+
+    clock.advance(60)
+    trip(health.breaker("slow"))
+    # Half-open sources come after closed ones and before open ones
+    assert health.ranked(names) == ["untried", "fast", "flaky", "dead", "slow"]
@@ -0,0 +1,57 @@
+"""Tests for the symbol registry and the exchange symbols the fetchers use"""
+
+from types import SimpleNamespace
+
+import pytest
+
+import http_client
+import market_data
+from bench.parsing import load_fixture
+from symbols import Instrument, SymbolRegistry, default_registry
+
+REGISTRY = SymbolRegistry([
+    Instrument("RELIANCE", "Reliance Industries Limited", "NSE"),
+    Instrument("TCS", "Tata Consultancy Services Limited", "NSE"),
+    Instrument("500325", "Reliance Industries Limited", "BSE", "RELIANCE"),
+])
+
+
+def test_scrip_codes_are_aliases():
+    assert [i.symbol for i in REGISTRY.instruments] == ["RELIANCE", "TCS"]
+    assert REGISTRY.get("500325.BO").symbol == "RELIANCE"
+    assert [i.symbol for i in REGISTRY.search("500325")] == ["RELIANCE"]
+
+
+@pytest.mark.parametrize("symbol, exchange, expected", [
+    ("RELIANCE", None, "RELIANCE.NS"),
+    ("RELIANCE", "BSE", "500325.BO"),
+    ("RELIANCE.BO", None, "500325.BO"),
+    ("500325", None, "RELIANCE.NS"),
+    ("500325.BO", "NSE", "RELIANCE.NS"),
+    ("TCS", "BSE", "TCS.BO"),
+    ("UNLISTED", None, "UNLISTED.NS"),
+])
+def test_exchange_symbol(symbol, exchange, expected):
+    assert REGISTRY.exchange_symbol(symbol, exchange) == expected
+
+
+def test_master_aliases_stay_out_of_the_universe():
+    registry = default_registry()
+    assert all(instrument.exchange == "NSE" for instrument in registry.instruments)
+    assert registry.exchange_symbol("RELIANCE", "BSE") == "500325.BO"
+
+
+def test_fetch_bse_requests_the_scrip_code(monkeypatch):
+    urls = []
+
+    def get(url, **kwargs):
+        urls.append(url)
+        return SimpleNamespace(status_code=200, content=load_fixture("bse_quote.html"))
+
+    monkeypatch.setattr(http_client, "get", get)
+    data, info = market_data.fetch_bse("RELIANCE")
+    assert urls == ["https://www.bseindia.com/stock-share-price/500325"]
+    assert len(data) == 1
+
+    with pytest.raises(market_data.SymbolNotFoundError):
+        market_data.fetch_bse("UNLISTED")